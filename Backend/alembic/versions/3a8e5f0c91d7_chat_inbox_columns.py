@@ -0,0 +1,80 @@
+"""chat inbox columns
+
+Revision ID: 3a8e5f0c91d7
+Revises: 7c3f1a9d2b64
+Create Date: 2026-10-18 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3a8e5f0c91d7'
+down_revision: Union[str, None] = '7c3f1a9d2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('chats', sa.Column('last_message_id', sa.BIGINT(), nullable=True))
+    op.add_column('chats', sa.Column('last_message_at', sa.DateTime(), nullable=True))
+    op.add_column(
+        'chats', sa.Column('last_message_preview', sa.String(), nullable=True)
+    )
+    op.add_column('chats', sa.Column('last_sender_id', sa.BIGINT(), nullable=True))
+    op.add_column(
+        'participants',
+        sa.Column(
+            'last_read_message_id',
+            sa.BIGINT(),
+            server_default=sa.text('0'),
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        'participants',
+        sa.Column(
+            'unread_count',
+            sa.Integer(),
+            server_default=sa.text('0'),
+            nullable=False,
+        ),
+    )
+    op.execute(
+        """
+        UPDATE chats c
+        SET last_message_id = m.id,
+            last_message_at = m.send_date,
+            last_message_preview = left(m.content, 200),
+            last_sender_id = m.user_id
+        FROM (
+            SELECT DISTINCT ON (chat_id) id, chat_id, user_id, content, send_date
+            FROM chat_messages
+            ORDER BY chat_id, id DESC
+        ) m
+        WHERE m.chat_id = c.id
+        """
+    )
+    # Existing history counts as read.
+    op.execute(
+        """
+        UPDATE participants p
+        SET last_read_message_id = c.last_message_id
+        FROM chats c
+        WHERE c.id = p.chat_id AND c.last_message_id IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('participants', 'unread_count')
+    op.drop_column('participants', 'last_read_message_id')
+    op.drop_column('chats', 'last_sender_id')
+    op.drop_column('chats', 'last_message_preview')
+    op.drop_column('chats', 'last_message_at')
+    op.drop_column('chats', 'last_message_id')
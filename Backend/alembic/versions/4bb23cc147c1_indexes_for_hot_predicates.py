@@ -0,0 +1,118 @@
+"""indexes for hot predicates
+
+Revision ID: 4bb23cc147c1
+Revises: 5f1c8e3a7b20
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4bb23cc147c1'
+down_revision: Union[str, None] = '5f1c8e3a7b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Duplicated links would make the unique index build fail.
+    op.execute(
+        """
+        DELETE FROM user_relations a
+        USING user_relations b
+        WHERE a.professional_id = b.professional_id
+            AND a.user_id = b.user_id
+            AND a.id > b.id
+        """
+    )
+    # CONCURRENTLY keeps the tables writable while the indexes build; it
+    # cannot run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_trainings_user_actual',
+            'user_trainings',
+            ['user_id', 'is_actual', 'is_completed'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_user_diets_user_actual',
+            'user_diets',
+            ['user_id', 'is_actual', 'is_completed'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_chat_messages_chat_send_date',
+            'chat_messages',
+            ['chat_id', 'send_date'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_user_progress_posts_feed',
+            'user_progress_posts',
+            ['type_post', 'is_private', sa.text('create_date DESC')],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_user_points_points',
+            'user_points',
+            [sa.text('points DESC')],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            op.f('ix_health_goals_user_id'),
+            'health_goals',
+            ['user_id'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_diets_public',
+            'diets',
+            ['id'],
+            postgresql_where=sa.text('is_public AND NOT is_deleted'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_workout_plans_public',
+            'workout_plans',
+            ['id'],
+            postgresql_where=sa.text('is_public'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'uq_user_relations_professional_user',
+            'user_relations',
+            ['professional_id', 'user_id'],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+    op.execute(
+        'ALTER TABLE user_relations '
+        'ADD CONSTRAINT uq_user_relations_professional_user '
+        'UNIQUE USING INDEX uq_user_relations_professional_user'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(
+        'uq_user_relations_professional_user', 'user_relations', type_='unique'
+    )
+    with op.get_context().autocommit_block():
+        for index_name, table_name in (
+            ('ix_workout_plans_public', 'workout_plans'),
+            ('ix_diets_public', 'diets'),
+            ('ix_health_goals_user_id', 'health_goals'),
+            ('ix_user_points_points', 'user_points'),
+            ('ix_user_progress_posts_feed', 'user_progress_posts'),
+            ('ix_chat_messages_chat_send_date', 'chat_messages'),
+            ('ix_user_diets_user_actual', 'user_diets'),
+            ('ix_user_trainings_user_actual', 'user_trainings'),
+        ):
+            op.drop_index(
+                index_name, table_name=table_name, postgresql_concurrently=True
+            )
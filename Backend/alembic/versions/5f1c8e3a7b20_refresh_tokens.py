@@ -0,0 +1,68 @@
+"""refresh tokens
+
+Revision ID: 5f1c8e3a7b20
+Revises: ba2b72b9a404
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f1c8e3a7b20'
+down_revision: Union[str, None] = 'ba2b72b9a404'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'refresh_tokens',
+        sa.Column('id', sa.BIGINT(), nullable=False),
+        sa.Column('user_id', sa.BIGINT(), nullable=False),
+        sa.Column(
+            'token_hash',
+            sa.String(length=64),
+            nullable=False,
+            comment='SHA-256 of the opaque refresh token',
+        ),
+        sa.Column(
+            'family_id',
+            sa.String(length=32),
+            nullable=False,
+            comment='Shared by every rotation of one login',
+        ),
+        sa.Column(
+            'revoked', sa.Boolean(), server_default=sa.text('false'), nullable=False
+        ),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column(
+            'create_date',
+            sa.DateTime(),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('token_hash'),
+    )
+    op.create_index(
+        op.f('ix_refresh_tokens_family_id'),
+        'refresh_tokens',
+        ['family_id'],
+        unique=False,
+    )
+    op.create_index(
+        op.f('ix_refresh_tokens_user_id'), 'refresh_tokens', ['user_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_refresh_tokens_user_id'), table_name='refresh_tokens')
+    op.drop_index(op.f('ix_refresh_tokens_family_id'), table_name='refresh_tokens')
+    op.drop_table('refresh_tokens')
@@ -0,0 +1,39 @@
+"""chat messages by chat and id
+
+Revision ID: 7c3f1a9d2b64
+Revises: e6257ccf9bd2
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3f1a9d2b64'
+down_revision: Union[str, None] = 'e6257ccf9bd2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Resuming a chat socket reads each chat's messages after a given id.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_chat_messages_chat_id_id',
+            'chat_messages',
+            ['chat_id', 'id'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_chat_messages_chat_id_id',
+            table_name='chat_messages',
+            postgresql_concurrently=True,
+        )
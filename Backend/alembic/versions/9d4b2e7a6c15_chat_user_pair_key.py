@@ -0,0 +1,87 @@
+"""chat user pair key
+
+Revision ID: 9d4b2e7a6c15
+Revises: 3a8e5f0c91d7
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4b2e7a6c15'
+down_revision: Union[str, None] = '3a8e5f0c91d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 1:1 chats by their two participants; of duplicated chats the one with the
+# latest message (or the oldest, when none has messages) keeps the pair.
+RANKED_PAIRS = """
+    WITH pairs AS (
+        SELECT chat_id, min(user_id) AS low_id, max(user_id) AS high_id
+        FROM participants
+        GROUP BY chat_id
+        HAVING count(*) = 2 AND min(user_id) != max(user_id)
+    ),
+    ranked AS (
+        SELECT
+            p.chat_id,
+            p.low_id,
+            p.high_id,
+            row_number() OVER (
+                PARTITION BY p.low_id, p.high_id
+                ORDER BY c.last_message_id DESC NULLS LAST, c.id
+            ) AS pair_rank
+        FROM pairs p
+        JOIN chats c ON c.id = p.chat_id
+        WHERE c.title IS NULL
+    )
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('chats', sa.Column('user_low_id', sa.BIGINT(), nullable=True))
+    op.add_column('chats', sa.Column('user_high_id', sa.BIGINT(), nullable=True))
+    # Duplicates left by retried requests are empty; the ones with messages
+    # stay, without a pair key.
+    op.execute(
+        RANKED_PAIRS
+        + """
+        DELETE FROM chats c
+        USING ranked r
+        WHERE r.chat_id = c.id AND r.pair_rank > 1 AND c.last_message_id IS NULL
+        """
+    )
+    op.execute(
+        RANKED_PAIRS
+        + """
+        UPDATE chats c
+        SET user_low_id = r.low_id, user_high_id = r.high_id
+        FROM ranked r
+        WHERE r.chat_id = c.id AND r.pair_rank = 1
+        """
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_chats_user_pair',
+            'chats',
+            ['user_low_id', 'user_high_id'],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'uq_chats_user_pair',
+            table_name='chats',
+            postgresql_concurrently=True,
+        )
+    op.drop_column('chats', 'user_high_id')
+    op.drop_column('chats', 'user_low_id')
@@ -0,0 +1,37 @@
+"""user token version
+
+Revision ID: b7e2d4f91a36
+Revises: 9d4b2e7a6c15
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2d4f91a36'
+down_revision: Union[str, None] = '9d4b2e7a6c15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'users',
+        sa.Column(
+            'token_version',
+            sa.Integer(),
+            server_default=sa.text('0'),
+            nullable=False,
+            comment="Bumped to revoke the user's access tokens",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'token_version')
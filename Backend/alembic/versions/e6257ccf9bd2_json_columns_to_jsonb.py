@@ -0,0 +1,67 @@
+"""json columns to jsonb
+
+Revision ID: e6257ccf9bd2
+Revises: 4bb23cc147c1
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6257ccf9bd2'
+down_revision: Union[str, None] = '4bb23cc147c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSON_COLUMNS = (
+    ('diets', 'menu'),
+    ('workout_plans', 'plans'),
+    ('shopping_lists', 'options'),
+    ('user_progress_posts', 'image_urls'),
+    ('chat_messages', 'image_urls'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rewrites each table under an exclusive lock; run in a quiet window.
+    for table_name, column_name in JSON_COLUMNS:
+        op.alter_column(
+            table_name,
+            column_name,
+            type_=postgresql.JSONB(),
+            existing_type=sa.JSON(),
+            postgresql_using=f'{column_name}::jsonb',
+        )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_workout_plans_plans',
+            'workout_plans',
+            ['plans'],
+            postgresql_using='gin',
+            postgresql_ops={'plans': 'jsonb_path_ops'},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_workout_plans_plans',
+            table_name='workout_plans',
+            postgresql_concurrently=True,
+        )
+    for table_name, column_name in JSON_COLUMNS:
+        op.alter_column(
+            table_name,
+            column_name,
+            type_=sa.JSON(),
+            existing_type=postgresql.JSONB(),
+            postgresql_using=f'{column_name}::json',
+        )
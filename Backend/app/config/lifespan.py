@@ -1,16 +1,26 @@
 # -*- coding: utf-8 -*-
+import asyncio
+import signal
 from contextlib import asynccontextmanager
 from typing import Any, AsyncGenerator
 
 from fastapi import FastAPI
 
+from app.config.settings import reload_settings
 from app.dependency.database import Database
+from app.modules.notifications import notification_listener
+from app.modules.security import hashing_pool
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[Any, Any]:
+    if hasattr(signal, "SIGHUP"):
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, reload_settings)
     try:
         await Database().ping()
+        await notification_listener.start()
         yield
     finally:
+        await notification_listener.stop()
         await Database().close()
+        hashing_pool.shutdown()
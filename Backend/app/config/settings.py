@@ -1,6 +1,11 @@
 # -*- coding: utf-8 -*-
+import logging
+from typing import Callable
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+logger = logging.getLogger(__name__)
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
@@ -8,9 +13,73 @@ class Settings(BaseSettings):
         env_file_encoding="utf-8",
     )
     DATABASE_URL: str
+    DATABASE_REPLICA_URL: str | None = None
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    AUTH_STATELESS: bool = True
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    HASHING_MAX_CONCURRENCY: int = 4
+    LOGIN_MAX_QUEUED_HASHES: int = 16
+    LOGIN_IP_BURST: int = 10
+    LOGIN_IP_RATE_PER_MINUTE: float = 30.0
+    LOGIN_ACCOUNT_BURST: int = 5
+    LOGIN_ACCOUNT_RATE_PER_MINUTE: float = 10.0
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_AUTH_POOL_SIZE: int = 2
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 256
+    DB_STATEMENT_TIMEOUT_MS: int = 5000
+    DB_STATEMENT_TIMEOUTS: dict[str, int] = {}
+    DB_RETRY_AFTER_SECONDS: int = 5
+    REPLICA_STICKINESS_SECONDS: float = 5.0
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+    RELATION_CACHE_SIZE: int = 10000
+    RELATION_CACHE_TTL_SECONDS: float = 60.0
+    SQL_SLOW_QUERY_MS: float = 200.0
+    SQL_QUERY_BUDGET: int = 10
+    SQL_QUERY_BUDGETS: dict[str, int] = {}
+    SQL_QUERY_BUDGET_WARN: bool = False
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 5000
+    SERVER_WORKERS: int | None = None
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEP_ALIVE_SECONDS: int = 75
+    SERVER_LIMIT_CONCURRENCY: int | None = None
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS: int = 30
+    FORWARDED_ALLOW_IPS: str = "127.0.0.1"
 
 
 settings = Settings()  # type: ignore[call-arg]
+
+SettingsListener = Callable[[set[str]], None]
+_listeners: list[SettingsListener] = []
+
+
+def on_settings_reload(listener: SettingsListener) -> SettingsListener:
+    _listeners.append(listener)
+    return listener
+
+
+def reload_settings() -> set[str]:
+    """Re-reads the environment and ``.env`` into the shared ``settings``
+    object in place, then notifies listeners with the changed field names."""
+    fresh = Settings()  # type: ignore[call-arg]
+    changed = {
+        name
+        for name in Settings.model_fields
+        if getattr(fresh, name) != getattr(settings, name)
+    }
+    for name in changed:
+        setattr(settings, name, getattr(fresh, name))
+    logger.info("settings reloaded, changed: %s", sorted(changed))
+    for listener in _listeners:
+        listener(changed)
+    return changed
@@ -3,17 +3,18 @@ from datetime import datetime
 
 from sqlalchemy import (
     BIGINT,
-    JSON,
     Boolean,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     UniqueConstraint,
     func,
     text,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
@@ -34,6 +35,11 @@ class User(Base):
     user_profile: Mapped[int] = mapped_column(Integer)
     image_profile: Mapped[str | None] = mapped_column(String, nullable=True)
     birth_date: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    token_version: Mapped[int] = mapped_column(
+        Integer,
+        server_default=text("0"),
+        comment="Bumped to revoke the user's access tokens",
+    )
     last_update: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.now()
     )
@@ -45,7 +51,7 @@ class Diets(Base):
     id: Mapped[int] = mapped_column(BIGINT, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String)
     description: Mapped[str] = mapped_column(String)
-    menu: Mapped[JSON] = mapped_column(JSON, server_default=text("'{}'::jsonb"))
+    menu: Mapped[JSONB] = mapped_column(JSONB, server_default=text("'{}'::jsonb"))
     user_id: Mapped[int] = mapped_column(
         BIGINT, ForeignKey("users.id", ondelete="CASCADE"), index=True
     )
@@ -62,6 +68,13 @@ class Diets(Base):
     is_deleted: Mapped[bool] = mapped_column(
         Boolean, server_default=text("false"), comment="Is the plan deleted?"
     )
+    __table_args__ = (
+        Index(
+            "ix_diets_public",
+            "id",
+            postgresql_where=text("is_public AND NOT is_deleted"),
+        ),
+    )
 
 
 class WorkoutPlans(Base):
@@ -70,7 +83,7 @@ class WorkoutPlans(Base):
     id: Mapped[int] = mapped_column(BIGINT, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String)
     description: Mapped[str] = mapped_column(String)
-    plans: Mapped[JSON] = mapped_column(JSON, server_default=text("'[]'::jsonb"))
+    plans: Mapped[JSONB] = mapped_column(JSONB, server_default=text("'[]'::jsonb"))
     user_id: Mapped[int] = mapped_column(
         BIGINT, ForeignKey("users.id", ondelete="CASCADE"), index=True
     )
@@ -99,6 +112,15 @@ class WorkoutPlans(Base):
     is_deleted: Mapped[bool] = mapped_column(
         Boolean, server_default=text("false"), comment="Is the plan deleted?"
     )
+    __table_args__ = (
+        Index("ix_workout_plans_public", "id", postgresql_where=text("is_public")),
+        Index(
+            "ix_workout_plans_plans",
+            "plans",
+            postgresql_using="gin",
+            postgresql_ops={"plans": "jsonb_path_ops"},
+        ),
+    )
 
 
 class ShoppingList(Base):
@@ -108,7 +130,7 @@ class ShoppingList(Base):
     title: Mapped[str] = mapped_column(
         String, server_default=text("'Lista de compras'")
     )
-    options: Mapped[JSON] = mapped_column(JSON, server_default=text("'[]'::jsonb"))
+    options: Mapped[JSONB] = mapped_column(JSONB, server_default=text("'[]'::jsonb"))
     user_id: Mapped[int] = mapped_column(
         BIGINT, ForeignKey("users.id", ondelete="CASCADE"), index=True
     )
@@ -145,6 +167,9 @@ class UserDiet(Base):
     last_update: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.now()
     )
+    __table_args__ = (
+        Index("ix_user_diets_user_actual", "user_id", "is_actual", "is_completed"),
+    )
 
 
 class UserTraining(Base):
@@ -178,6 +203,14 @@ class UserTraining(Base):
     last_update: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.now()
     )
+    __table_args__ = (
+        Index(
+            "ix_user_trainings_user_actual",
+            "user_id",
+            "is_actual",
+            "is_completed",
+        ),
+    )
 
 
 class UserPost(Base):
@@ -191,7 +224,7 @@ class UserPost(Base):
         String, comment="Content of the progress post"
     )
     image_urls: Mapped[list[str]] = mapped_column(
-        JSON, server_default=text("'[]'::jsonb"), comment="List of image URLs"
+        JSONB, server_default=text("'[]'::jsonb"), comment="List of image URLs"
     )
     type_post: Mapped[int] = mapped_column(
         Integer,
@@ -210,6 +243,14 @@ class UserPost(Base):
         server_default=func.now(),
         comment="Date when the post was last updated",
     )
+    __table_args__ = (
+        Index(
+            "ix_user_progress_posts_feed",
+            "type_post",
+            "is_private",
+            text("create_date DESC"),
+        ),
+    )
 
 
 class Chat(Base):
@@ -227,6 +268,23 @@ class Chat(Base):
         server_default=func.now(),
         comment="Date when the chat was last updated",
     )
+    last_message_id: Mapped[int | None] = mapped_column(BIGINT, nullable=True)
+    last_message_at: Mapped[datetime | None] = mapped_column(
+        DateTime, nullable=True
+    )
+    last_message_preview: Mapped[str | None] = mapped_column(
+        String, nullable=True, comment="Start of the last message, for the inbox"
+    )
+    last_sender_id: Mapped[int | None] = mapped_column(BIGINT, nullable=True)
+    user_low_id: Mapped[int | None] = mapped_column(
+        BIGINT, nullable=True, comment="Smaller participant id of a 1:1 chat"
+    )
+    user_high_id: Mapped[int | None] = mapped_column(
+        BIGINT, nullable=True, comment="Larger participant id of a 1:1 chat"
+    )
+    __table_args__ = (
+        Index("uq_chats_user_pair", "user_low_id", "user_high_id", unique=True),
+    )
 
 
 class ChatMessage(Base):
@@ -243,7 +301,7 @@ class ChatMessage(Base):
         String, comment="Content of the message", nullable=True
     )
     image_urls: Mapped[list[str] | None] = mapped_column(
-        JSON,
+        JSONB,
         server_default=text("'[]'::jsonb"),
         comment="List of image URLs",
         nullable=True,
@@ -251,6 +309,10 @@ class ChatMessage(Base):
     send_date: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.now(), comment="Date when the message was sent"
     )
+    __table_args__ = (
+        Index("ix_chat_messages_chat_send_date", "chat_id", "send_date"),
+        Index("ix_chat_messages_chat_id_id", "chat_id", "id"),
+    )
 
 
 class Participant(Base):
@@ -268,6 +330,10 @@ class Participant(Base):
         server_default=func.now(),
         comment="Date when the user joined the chat",
     )
+    last_read_message_id: Mapped[int] = mapped_column(
+        BIGINT, server_default=text("0"), comment="Read cursor of the participant"
+    )
+    unread_count: Mapped[int] = mapped_column(Integer, server_default=text("0"))
     __table_args__ = (UniqueConstraint("user_id", "chat_id", name="uq_user_chat"),)
 
 
@@ -284,13 +350,20 @@ class UserRelations(Base):
     create_date: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.now()
     )
+    __table_args__ = (
+        UniqueConstraint(
+            "professional_id", "user_id", name="uq_user_relations_professional_user"
+        ),
+    )
 
 
 class HealthGold(Base):
     __tablename__ = "health_goals"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), index=True
+    )
     goal_type: Mapped[str] = mapped_column(String, comment="Type of goal")
     start_weight: Mapped[float] = mapped_column(Float, comment="Starting weight")
     goal_weight: Mapped[float] = mapped_column(Float, comment="Goal weight")
@@ -318,3 +391,24 @@ class UserPoints(Base):
     last_update: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.now(), onupdate=func.now()
     )
+    __table_args__ = (Index("ix_user_points_points", text("points DESC")),)
+
+
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+
+    id: Mapped[int] = mapped_column(BIGINT, primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        BIGINT, ForeignKey("users.id", ondelete="CASCADE"), index=True
+    )
+    token_hash: Mapped[str] = mapped_column(
+        String(64), unique=True, comment="SHA-256 of the opaque refresh token"
+    )
+    family_id: Mapped[str] = mapped_column(
+        String(32), index=True, comment="Shared by every rotation of one login"
+    )
+    revoked: Mapped[bool] = mapped_column(Boolean, server_default=text("false"))
+    expires_at: Mapped[datetime] = mapped_column(DateTime)
+    create_date: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now()
+    )
@@ -4,10 +4,10 @@ import json
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt import decode
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config.settings import Settings
-from app.dependency.database import SessionConnection
+from app.config.settings import settings
+from app.dependency.database import Database
+from app.modules.token_versions import token_versions
 from app.schemas.user import UserInfo
 from app.service.user import UserService
 
@@ -16,14 +16,10 @@ oauth_schema = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 class AuthManager:
     @staticmethod
-    async def has_authorization(
-        session: AsyncSession = Depends(SessionConnection.session),
-        token: str = Depends(oauth_schema),
-    ) -> UserInfo:
-        setting = Settings()  # type: ignore[call-arg]
+    async def has_authorization(token: str = Depends(oauth_schema)) -> UserInfo:
         try:
             payoad = decode(
-                token, setting.SECRET_KEY, algorithms=[setting.ALGORITHM]
+                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
             )
             user_payload = (
                 json.loads(payoad["sub"])
@@ -31,11 +27,22 @@ class AuthManager:
                 else payoad["sub"]
             )
 
-            user = (
-                await UserService(session).get_user_by_id(user_payload.get("id"))
-                if payoad["sub"]
-                else None
-            )
+            user: UserInfo | None = None
+            version = payoad.get("ver", 0)
+            # Disabling or changing the user bumps token_version, which every
+            # worker learns from its NOTIFY; older tokens are revoked.
+            if user_payload and token_versions.accepts(
+                user_payload.get("id"), version
+            ):
+                if settings.AUTH_STATELESS:
+                    user = UserInfo.model_validate(user_payload)
+                else:
+                    async with Database().auth_session as session:
+                        principal = await UserService(session).get_principal(
+                            user_payload.get("id")
+                        )
+                    if principal and principal.token_version == version:
+                        user = principal.user
             if not user:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
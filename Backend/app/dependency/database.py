@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
-
+import asyncio
+import logging
 from typing import AsyncGenerator
 
+from fastapi import HTTPException, Request, status
 from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -10,42 +14,242 @@ from sqlalchemy.ext.asyncio import (
 )
 from sqlalchemy.ext.asyncio.engine import AsyncEngine
 
-from app.config.settings import Settings
+from app.config.settings import on_settings_reload, settings
+from app.modules.cache import TTLCache
 from app.modules.common import Singleton
+from app.modules.security import token_manager
+from app.modules.sql_instrumentation import (
+    InstrumentedQueuePool,
+    instrument_engine,
+    pool_wait_stats,
+    route_name,
+)
+from app.schemas.metrics import DatabasePoolStats
+
+logger = logging.getLogger(__name__)
+
+ENGINE_SETTINGS = {
+    "DATABASE_URL",
+    "DATABASE_REPLICA_URL",
+    "DB_POOL_SIZE",
+    "DB_MAX_OVERFLOW",
+    "DB_AUTH_POOL_SIZE",
+    "DB_POOL_TIMEOUT",
+    "DB_POOL_RECYCLE",
+    "DB_POOL_PRE_PING",
+    "DB_PREPARED_STATEMENT_CACHE_SIZE",
+    "DB_STATEMENT_TIMEOUT_MS",
+}
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+# session.info key set on sessions bound to the replica.
+REPLICA_SESSION = "replica"
+QUERY_CANCELED = "57014"
+SET_STATEMENT_TIMEOUT = text(
+    "SELECT set_config('statement_timeout', :timeout, true)"
+)
+
+# Users who committed a write recently; their reads stay on the primary until
+# the replica has had time to catch up. Kept per worker: a read served by
+# another worker right after the write may still see the replica's lag.
+recent_writers: TTLCache[int, bool] = TTLCache(
+    "replica_stickiness", 100_000, settings.REPLICA_STICKINESS_SECONDS
+)
 
 
 class Database(metaclass=Singleton):
     def __init__(self) -> None:
-        self._engine: AsyncEngine = self._create_engine()  # type: ignore[assignment]
+        self._build()
+
+    def _build(self) -> None:
+        self._engine: AsyncEngine = self._create_engine(settings.DATABASE_URL)  # type: ignore[assignment]
+        self._replica_engine: AsyncEngine | None = (
+            self._create_engine(settings.DATABASE_REPLICA_URL)  # type: ignore[assignment]
+            if settings.DATABASE_REPLICA_URL
+            else None
+        )
+        # Auth lookups run before or next to the route's own session; from
+        # the shared pool, requests holding their connection would wait on a
+        # second one until pool_timeout. Engines connect on first use, so
+        # this pool costs nothing with AUTH_STATELESS.
+        self._auth_engine: AsyncEngine = self._create_engine(  # type: ignore[assignment]
+            settings.DATABASE_URL,
+            pool_size=settings.DB_AUTH_POOL_SIZE,
+            max_overflow=0,
+        )
         self._session_maker: async_sessionmaker[AsyncSession] = (
-            self._create_session_factory()
+            self._create_session_factory(self._engine)
+        )
+        self._auth_session_maker: async_sessionmaker[AsyncSession] = (
+            self._create_session_factory(self._auth_engine)
+        )
+        self._replica_session_maker: async_sessionmaker[AsyncSession] = (
+            self._create_session_factory(self._replica_engine or self._engine)
         )
 
     async def ping(self) -> None:
         async with self.session as session:
             await session.execute(text("SELECT 1;"))
+        logger.info("database pool: %s", self.pool_stats())
+
+    def pool_stats(self) -> DatabasePoolStats:
+        pool = self._engine.sync_engine.pool
+        return DatabasePoolStats(
+            size=pool.size(),  # type: ignore[attr-defined]
+            checked_out=pool.checkedout(),  # type: ignore[attr-defined]
+            idle=pool.checkedin(),  # type: ignore[attr-defined]
+            overflow=pool.overflow(),  # type: ignore[attr-defined]
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            **pool_wait_stats.stats(),
+        )
 
     @property
     def session(self) -> AsyncSession:
         return self._session_maker()  # type: ignore[no-any-return,operator, unused-ignore] # noqa
 
-    def _create_engine(self) -> async_sessionmaker[AsyncSession]:  # noqa: PLR6301
-        return create_async_engine(Settings().DATABASE_URL)  # type: ignore[return-value, call-arg]
+    @property
+    def auth_session(self) -> AsyncSession:
+        return self._auth_session_maker()
+
+    @property
+    def replica_session(self) -> AsyncSession:
+        session = self._replica_session_maker()
+        if self._replica_engine is not None:
+            session.info[REPLICA_SESSION] = True
+        return session
+
+    def _create_engine(  # noqa: PLR6301
+        self,
+        url: str,
+        pool_size: int | None = None,
+        max_overflow: int | None = None,
+    ) -> async_sessionmaker[AsyncSession]:
+        engine = create_async_engine(
+            url,
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.DB_POOL_SIZE if pool_size is None else pool_size,
+            max_overflow=(
+                settings.DB_MAX_OVERFLOW if max_overflow is None else max_overflow
+            ),
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+            connect_args={
+                "prepared_statement_cache_size": (
+                    settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+                ),
+                "server_settings": {
+                    "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)
+                },
+            },
+        )
+        instrument_engine(engine.sync_engine)
+        return engine  # type: ignore[return-value]
 
-    def _create_session_factory(self) -> async_sessionmaker[AsyncSession]:
+    def _create_session_factory(  # noqa: PLR6301
+        self, engine: AsyncEngine
+    ) -> async_sessionmaker[AsyncSession]:
         return async_sessionmaker(
-            bind=self._engine,
+            bind=engine,
             expire_on_commit=False,
             autoflush=False,
             autocommit=False,
         )
 
+    def reload(self) -> None:
+        old_engines = [self._engine, self._replica_engine, self._auth_engine]
+        self._build()
+        for engine in old_engines:
+            if engine is not None:
+                asyncio.get_running_loop().create_task(engine.dispose())
+
     async def close(self) -> None:
         await self._engine.dispose()
+        await self._auth_engine.dispose()
+        if self._replica_engine is not None:
+            await self._replica_engine.dispose()
+
+
+@on_settings_reload
+def _reload_engine(changed: set[str]) -> None:
+    if changed & ENGINE_SETTINGS:
+        Database().reload()
+    if "REPLICA_STICKINESS_SECONDS" in changed:
+        recent_writers.configure(100_000, settings.REPLICA_STICKINESS_SECONDS)
+
+
+def _database_timed_out(exc: BaseException | None) -> bool:
+    # Controllers re-raise database errors as HTTPException, so the original
+    # error is looked up along the exception chain.
+    while exc is not None:
+        if isinstance(exc, PoolTimeoutError):
+            return True
+        if (
+            isinstance(exc, DBAPIError)
+            and getattr(exc.orig, "sqlstate", None) == QUERY_CANCELED
+        ):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+def _service_unavailable() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Banco de dados sobrecarregado, tente novamente",
+        headers={"Retry-After": str(settings.DB_RETRY_AFTER_SECONDS)},
+    )
+
+
+async def _apply_statement_timeout(session: AsyncSession, request: Request) -> None:
+    # The engine-wide DB_STATEMENT_TIMEOUT_MS is set per connection; only
+    # routes with their own budget pay for the extra statement.
+    timeout = settings.DB_STATEMENT_TIMEOUTS.get(route_name(request.scope))
+    if timeout is not None:
+        await session.execute(SET_STATEMENT_TIMEOUT, {"timeout": f"{timeout}ms"})
+
+
+def _request_user_id(request: Request) -> int | None:
+    # Only matters with a replica; without one every read is on the primary.
+    if not settings.DATABASE_REPLICA_URL:
+        return None
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return token_manager.subject_id(token)
 
 
 class SessionConnection:
     @staticmethod
-    async def session() -> AsyncGenerator[AsyncSession, None]:
+    async def session(request: Request) -> AsyncGenerator[AsyncSession, None]:
         async with Database().session as session:
-            yield session
+            try:
+                await _apply_statement_timeout(session, request)
+                yield session
+                # Services only flush; the request's writes land in one commit.
+                if request.method not in SAFE_METHODS:
+                    await session.commit()
+                    user_id = _request_user_id(request)
+                    if user_id is not None:
+                        recent_writers.set(user_id, True)
+            except Exception as e:
+                await session.rollback()
+                if _database_timed_out(e):
+                    raise _service_unavailable() from e
+                raise
+
+    @staticmethod
+    async def read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+        user_id = _request_user_id(request)
+        database = Database()
+        async with (
+            database.session
+            if user_id is not None and recent_writers.get(user_id)
+            else database.replica_session
+        ) as session:
+            try:
+                await _apply_statement_timeout(session, request)
+                yield session
+            except Exception as e:
+                if _database_timed_out(e):
+                    raise _service_unavailable() from e
+                raise
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+import math
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordRequestForm
+
+from app.config.settings import on_settings_reload, settings
+from app.modules.forwarded import client_ip
+from app.modules.rate_limit import TokenBucketLimiter
+from app.modules.security import hashing_pool
+
+login_ip_limiter = TokenBucketLimiter(
+    settings.LOGIN_IP_BURST, settings.LOGIN_IP_RATE_PER_MINUTE / 60
+)
+login_account_limiter = TokenBucketLimiter(
+    settings.LOGIN_ACCOUNT_BURST, settings.LOGIN_ACCOUNT_RATE_PER_MINUTE / 60
+)
+
+
+@on_settings_reload
+def _reload_login_limits(changed: set[str]) -> None:
+    if not any(name.startswith("LOGIN_") for name in changed):
+        return
+    login_ip_limiter.configure(
+        settings.LOGIN_IP_BURST, settings.LOGIN_IP_RATE_PER_MINUTE / 60
+    )
+    login_account_limiter.configure(
+        settings.LOGIN_ACCOUNT_BURST, settings.LOGIN_ACCOUNT_RATE_PER_MINUTE / 60
+    )
+
+
+def _too_many_requests(retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Muitas tentativas de login, tente novamente em instantes",
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+class LoginAdmission:
+    @staticmethod
+    async def check(
+        request: Request,
+        form_data: OAuth2PasswordRequestForm = Depends(),
+    ) -> None:
+        if hashing_pool.queue_depth >= settings.LOGIN_MAX_QUEUED_HASHES:
+            raise _too_many_requests(1)
+        retry_after = login_ip_limiter.acquire(client_ip(request)) or (
+            login_account_limiter.acquire(form_data.username.strip().lower())
+        )
+        if retry_after:
+            raise _too_many_requests(retry_after)
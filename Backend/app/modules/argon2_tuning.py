@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+import statistics
+import time
+from typing import NamedTuple
+
+import argon2
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+# OWASP floor for argon2id: 19 MiB of memory.
+MIN_MEMORY_COST = 19456
+MAX_TIME_COST = 16
+_SAMPLE_PASSWORD = "calibration-Password-123"
+
+
+class Argon2Params(NamedTuple):
+    time_cost: int = argon2.DEFAULT_TIME_COST
+    memory_cost: int = argon2.DEFAULT_MEMORY_COST
+    parallelism: int = argon2.DEFAULT_PARALLELISM
+
+    def password_hash(self) -> PasswordHash:
+        return PasswordHash((
+            Argon2Hasher(
+                time_cost=self.time_cost,
+                memory_cost=self.memory_cost,
+                parallelism=self.parallelism,
+            ),
+        ))
+
+
+def measure_hash_ms(params: Argon2Params, samples: int = 3) -> float:
+    hasher = params.password_hash()
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.hash(_SAMPLE_PASSWORD)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate_argon2(
+    budget_ms: float,
+    parallelism: int = argon2.DEFAULT_PARALLELISM,
+    memory_cost: int = argon2.DEFAULT_MEMORY_COST,
+) -> Argon2Params:
+    """Picks the strongest argon2id parameters whose hash time stays within
+    ``budget_ms`` on this machine: memory is halved (down to the OWASP
+    floor) until a single pass fits, then passes are added while they fit."""
+    elapsed = measure_hash_ms(Argon2Params(1, memory_cost, parallelism))
+    while elapsed > budget_ms and memory_cost > MIN_MEMORY_COST:
+        memory_cost = max(memory_cost // 2, MIN_MEMORY_COST)
+        elapsed = measure_hash_ms(Argon2Params(1, memory_cost, parallelism))
+
+    time_cost = max(1, min(MAX_TIME_COST, int(budget_ms // max(elapsed, 0.001))))
+    while time_cost > 1 and (
+        measure_hash_ms(Argon2Params(time_cost, memory_cost, parallelism))
+        > budget_ms
+    ):
+        time_cost -= 1
+    return Argon2Params(time_cost, memory_cost, parallelism)
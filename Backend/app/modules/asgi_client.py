@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, NamedTuple
+from urllib.parse import urlencode
+
+from starlette.types import ASGIApp, Message
+
+
+class ASGIResponse(NamedTuple):
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class ASGIClient:
+    """Sends requests straight into an ASGI app, without sockets, so the
+    measured time is the application's own and not the HTTP stack's."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def request(  # noqa: PLR0913
+        self,
+        method: str,
+        path: str,
+        *,
+        token: str | None = None,
+        form: dict[str, str] | None = None,
+        json_body: Any = None,
+        client: tuple[str, int] = ("127.0.0.1", 50000),
+    ) -> ASGIResponse:
+        path, _, query = path.partition("?")
+        headers = [(b"host", b"testserver")]
+        body = b""
+        if token:
+            headers.append((b"authorization", f"Bearer {token}".encode()))
+        if form is not None:
+            body = urlencode(form).encode()
+            headers.append((b"content-type", b"application/x-www-form-urlencoded"))
+        elif json_body is not None:
+            body = json.dumps(json_body).encode()
+            headers.append((b"content-type", b"application/json"))
+        headers.append((b"content-length", str(len(body)).encode()))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": headers,
+            "client": client,
+            "server": ("testserver", 80),
+        }
+
+        request_sent = False
+        response_complete = asyncio.Event()
+        status = 0
+        response_headers: dict[str, str] = {}
+        chunks: list[bytes] = []
+
+        async def receive() -> Message:
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Like a client that keeps the connection open until it has read
+            # the whole response.
+            await response_complete.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers.update(
+                    (name.decode().lower(), value.decode())
+                    for name, value in message.get("headers", [])
+                )
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    response_complete.set()
+
+        await self.app(scope, receive, send)
+        return ASGIResponse(status, response_headers, b"".join(chunks))
+
+
+@asynccontextmanager
+async def lifespan(app: Any) -> AsyncIterator[ASGIClient]:
+    """Runs the FastAPI startup/shutdown around the client."""
+    async with app.router.lifespan_context(app):
+        yield ASGIClient(app)
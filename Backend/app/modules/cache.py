@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import time
+from collections import OrderedDict
+from typing import Any, Generic, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded in-process LRU cache whose entries also expire after ``ttl``
+    seconds. Every instance is registered so its counters can be reported.
+
+    Loaders read ``version`` before querying and pass it to ``set``: a value
+    loaded while an invalidation happened may predate the change, so it is
+    not stored."""
+
+    registry: list["TTLCache[Any, Any]"] = []
+
+    def __init__(self, name: str, maxsize: int, ttl: float) -> None:
+        self.name = name
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        TTLCache.registry.append(self)
+
+    @property
+    def version(self) -> int:
+        return self._invalidations
+
+    def get(self, key: K) -> V | None:
+        entry = self._data.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self._misses += 1
+            return None
+        self._data.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def set(
+        self, key: K, value: V, version: int | None = None, ttl: float | None = None
+    ) -> None:
+        if version is not None and version != self._invalidations:
+            return
+        expires_in = self._ttl if ttl is None else min(ttl, self._ttl)
+        self._data[key] = (time.monotonic() + expires_in, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+            self._evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        self._invalidations += 1
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._invalidations += 1
+        self._data.clear()
+
+    def configure(self, maxsize: int, ttl: float) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+            self._evictions += 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "size": len(self._data),
+            "maxsize": self._maxsize,
+            "ttl": self._ttl,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+        }
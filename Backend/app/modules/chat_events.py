@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from app.modules.notifications import notification_listener
+
+CHAT_CHANNEL = "chat_messages"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more.
+MAX_NOTIFY_PAYLOAD = 7900
+SUBSCRIPTION_QUEUE_SIZE = 256
+
+
+def notify_payload(recipients: list[int], message: dict[str, Any]) -> str:
+    """Serializes a new message for NOTIFY; messages too large to fit go out
+    without their body and the client fetches them over HTTP."""
+    payload = json.dumps({"recipients": recipients, "message": message}, default=str)
+    if len(payload.encode()) <= MAX_NOTIFY_PAYLOAD:
+        return payload
+    message = {**message, "content": None, "image_urls": None, "truncated": True}
+    return json.dumps({"recipients": recipients, "message": message}, default=str)
+
+
+class Subscription:
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(
+            SUBSCRIPTION_QUEUE_SIZE
+        )
+        self.overflowed = False
+
+    def push(self, message: dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # The socket is not keeping up; it is closed and the client
+            # resumes from its last seen id.
+            self.overflowed = True
+
+
+class ChatHub:
+    """Open chat sockets of this worker, by user."""
+
+    def __init__(self) -> None:
+        self._subscriptions: dict[int, set[Subscription]] = {}
+
+    @contextmanager
+    def subscribe(self, user_id: int) -> Iterator[Subscription]:
+        subscription = Subscription()
+        self._subscriptions.setdefault(user_id, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscriptions = self._subscriptions[user_id]
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[user_id]
+
+    def publish(self, recipients: list[int], message: dict[str, Any]) -> None:
+        for user_id in recipients:
+            for subscription in self._subscriptions.get(user_id, ()):
+                subscription.push(message)
+
+
+chat_hub = ChatHub()
+
+
+def _on_chat_notify(payload: str) -> None:
+    event = json.loads(payload)
+    chat_hub.publish(event["recipients"], event["message"])
+
+
+notification_listener.listen(CHAT_CHANNEL, _on_chat_notify)
@@ -1,12 +1,44 @@
 # -*- coding: utf-8 -*-
-from typing import Any
+from typing import Any, Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 
 class Singleton(type):
     _instances: dict["Singleton", Any] = {}
 
-    def _call_(cls: "Singleton") -> Any:  # noqa: PLW3201
+    def __call__(cls, *args: Any, **kwargs: Any) -> Any:
         if cls not in cls._instances:
-            cls.instances[cls] = super(Singleton, cls).call_()  # type: ignore[misc, attr-defined]
+            cls._instances[cls] = super().__call__(*args, **kwargs)
 
         return cls._instances[cls]
+
+
+def asyncpg_dsn(url: str) -> str:
+    """SQLAlchemy URL to the DSN asyncpg.connect expects."""
+    return url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """Runs ``callback`` once the session's transaction commits, and drops it
+    if the transaction rolls back. Cache invalidations go here: done before
+    the commit, a concurrent request could cache the old rows again."""
+    pending: list[Callable[[], None]] | None = session.info.get("after_commit")
+    if pending is None:
+        callbacks: list[Callable[[], None]] = []
+        pending = session.info["after_commit"] = callbacks
+
+        def run(_: Session) -> None:
+            ready = list(callbacks)
+            callbacks.clear()
+            for ready_callback in ready:
+                ready_callback()
+
+        def drop(_: Session) -> None:
+            callbacks.clear()
+
+        event.listen(session.sync_session, "after_commit", run)
+        event.listen(session.sync_session, "after_rollback", drop)
+    pending.append(callback)
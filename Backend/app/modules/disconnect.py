@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import logging
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class CancelOnDisconnectMiddleware:
+    """Cancels the request handler when the client goes away before the
+    response is complete. Cancelling an awaiting asyncpg query makes it send a
+    cancel request to the server, so the pool connection is freed instead of
+    waiting for a result nobody will read."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_complete = False
+        disconnected = False
+        # A single reader owns ``receive``: it forwards every message to the
+        # app and notices the disconnect even while the app is busy. The
+        # hand-off holds one message, so a request body is read only as fast
+        # as the app consumes it instead of being buffered whole.
+        messages: asyncio.Queue[Message] = asyncio.Queue(maxsize=1)
+
+        async def send_tracking(message: Message) -> None:
+            nonlocal response_complete
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                response_complete = True
+
+        async def receive_forwarded() -> Message:
+            return await messages.get()
+
+        async def run_app() -> None:
+            await self.app(scope, receive_forwarded, send_tracking)
+
+        handler: asyncio.Task[None] = asyncio.create_task(run_app())
+
+        async def watch_disconnect() -> None:
+            nonlocal disconnected
+            while True:
+                message: Message = await receive()
+                if message["type"] == "http.disconnect":
+                    if not response_complete and not handler.done():
+                        disconnected = True
+                        handler.cancel()
+                    await messages.put(message)
+                    return
+                await messages.put(message)
+
+        watcher = asyncio.create_task(watch_disconnect())
+        try:
+            await handler
+        except asyncio.CancelledError:
+            if not disconnected:
+                raise
+            logger.info(
+                "client disconnected, cancelled %s %s",
+                scope["method"],
+                scope["path"],
+            )
+        finally:
+            watcher.cancel()
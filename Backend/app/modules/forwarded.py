@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+import ipaddress
+
+from fastapi import Request
+
+from app.config.settings import on_settings_reload, settings
+
+
+class TrustedProxies:
+    """Peers allowed to report the client address in X-Forwarded-For, in
+    uvicorn's ``forwarded_allow_ips`` format: comma-separated addresses or
+    networks, or ``*`` for any."""
+
+    def __init__(self, value: str) -> None:
+        self.configure(value)
+
+    def configure(self, value: str) -> None:
+        items = [item.strip() for item in value.split(",") if item.strip()]
+        self._trust_all = "*" in items
+        self._networks: list[ipaddress.IPv4Network | ipaddress.IPv6Network] = []
+        for item in items:
+            try:
+                self._networks.append(ipaddress.ip_network(item, strict=False))
+            except ValueError:
+                # "*", unix socket paths and host names match no address.
+                continue
+
+    def __contains__(self, host: str) -> bool:
+        if self._trust_all:
+            return True
+        try:
+            address = ipaddress.ip_address(host)
+        except ValueError:
+            return False
+        return any(address in network for network in self._networks)
+
+    def client_host(self, peer: str, forwarded_for: str) -> str:
+        """The nearest address, from the right, that no trusted proxy added;
+        anyone can prepend fake hops, so the leftmost one is not reliable."""
+        if peer not in self:
+            return peer
+        hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+        for hop in reversed(hops):
+            if hop not in self:
+                return hop
+        return hops[0] if hops else peer
+
+
+trusted_proxies = TrustedProxies(settings.FORWARDED_ALLOW_IPS)
+
+
+@on_settings_reload
+def _reload_trusted_proxies(changed: set[str]) -> None:
+    if "FORWARDED_ALLOW_IPS" in changed:
+        trusted_proxies.configure(settings.FORWARDED_ALLOW_IPS)
+
+
+def client_ip(request: Request) -> str:
+    peer = request.client.host if request.client else "unknown"
+    return trusted_proxies.client_host(
+        peer, ",".join(request.headers.getlist("x-forwarded-for"))
+    )
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable
+
+import asyncpg
+
+from app.config.settings import settings
+from app.modules.common import asyncpg_dsn
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_SECONDS = 1.0
+
+NotificationHandler = Callable[[str], None]
+ConnectHandler = Callable[[Any], Awaitable[None]]
+
+
+class NotificationListener:
+    """Keeps one connection per worker LISTENing on every registered channel
+    and hands each payload to its handler, so a NOTIFY sent by any worker
+    reaches all of them.
+
+    Notifications sent while the connection is down are lost; ``on_connect``
+    callbacks run after every (re)connect, once the channels are listened
+    on, so state derived from them can be reloaded."""
+
+    def __init__(self) -> None:
+        self._handlers: dict[str, NotificationHandler] = {}
+        self._on_connect: list[ConnectHandler] = []
+        self._task: asyncio.Task[None] | None = None
+        self._ready = asyncio.Event()
+
+    def listen(self, channel: str, handler: NotificationHandler) -> None:
+        self._handlers[channel] = handler
+
+    def on_connect(self, callback: ConnectHandler) -> None:
+        self._on_connect.append(callback)
+
+    async def start(self) -> None:
+        """Starts listening and waits for the first connection, so the worker
+        does not serve requests before its ``on_connect`` state is loaded."""
+        self._ready = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        await self._ready.wait()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _on_notify(
+        self, connection: Any, pid: int, channel: str, payload: str
+    ) -> None:
+        try:
+            self._handlers[channel](payload)
+        except Exception:
+            logger.exception("bad notification on %s: %r", channel, payload)
+
+    async def _run(self) -> None:
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(
+                    asyncpg_dsn(settings.DATABASE_URL)
+                )
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                for channel in self._handlers:
+                    await connection.add_listener(channel, self._on_notify)
+                for callback in self._on_connect:
+                    await callback(connection)
+                logger.info("listening on %s", sorted(self._handlers))
+                self._ready.set()
+                await closed.wait()
+                logger.warning("notification connection lost, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("notification listener failed, reconnecting")
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(RECONNECT_SECONDS)
+
+
+notification_listener = NotificationListener()
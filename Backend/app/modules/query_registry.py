@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+import bisect
+import time
+from typing import Any, Iterator
+
+from sqlalchemy.engine import Result
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import text
+from sqlalchemy.sql.elements import TextClause
+
+LATENCY_BUCKETS_MS = (1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0)
+
+
+class QueryStats:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def record(self, elapsed_ms: float) -> None:
+        self.calls += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+
+
+class NamedQuery:
+    """A raw SQL statement built once at import time. Executing the same
+    ``TextClause`` with bound parameters lets SQLAlchemy reuse its compiled
+    form and asyncpg reuse the prepared statement on each connection."""
+
+    def __init__(self, name: str, sql: str) -> None:
+        self.name = name
+        self.statement: TextClause = text(sql)
+        self.stats = QueryStats()
+
+    async def execute(self, session: AsyncSession, **params: Any) -> Result[Any]:
+        start = time.perf_counter()
+        try:
+            return await session.execute(self.statement, params)
+        finally:
+            self.stats.record((time.perf_counter() - start) * 1000)
+
+
+class QueryRegistry:
+    def __init__(self) -> None:
+        self._queries: dict[str, NamedQuery] = {}
+
+    def register(self, name: str, sql: str) -> NamedQuery:
+        if name in self._queries:
+            raise ValueError(f"Query {name!r} is already registered")
+        query = NamedQuery(name, sql)
+        self._queries[name] = query
+        return query
+
+    def __iter__(self) -> Iterator[NamedQuery]:
+        return iter(self._queries.values())
+
+    def stats(self) -> list[dict[str, Any]]:
+        buckets = [f"le_{bound:g}ms" for bound in LATENCY_BUCKETS_MS] + ["inf"]
+        return [
+            {
+                "name": query.name,
+                "calls": query.stats.calls,
+                "total_ms": round(query.stats.total_ms, 3),
+                "mean_ms": round(query.stats.total_ms / query.stats.calls, 3)
+                if query.stats.calls
+                else 0.0,
+                "max_ms": round(query.stats.max_ms, 3),
+                "histogram": dict(zip(buckets, query.stats.buckets)),
+            }
+            for query in sorted(
+                self._queries.values(),
+                key=lambda query: query.stats.total_ms,
+                reverse=True,
+            )
+        ]
+
+
+queries = QueryRegistry()
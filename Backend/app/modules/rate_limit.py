@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+import time
+from collections import OrderedDict
+
+
+class TokenBucketLimiter:
+    """Per-key token buckets kept in a bounded LRU so a flood of distinct
+    keys cannot grow memory without limit."""
+
+    def __init__(
+        self, capacity: float, refill_per_second: float, max_keys: int = 100_000
+    ) -> None:
+        self._capacity = capacity
+        self._refill_per_second = refill_per_second
+        self._max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self.rejected = 0
+
+    def configure(self, capacity: float, refill_per_second: float) -> None:
+        self._capacity = capacity
+        self._refill_per_second = refill_per_second
+
+    def acquire(self, key: str) -> float:
+        """Takes one token for ``key``; returns 0 when allowed, otherwise the
+        number of seconds until a token becomes available."""
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.pop(key, (self._capacity, now))
+        tokens = min(
+            self._capacity, tokens + (now - updated_at) * self._refill_per_second
+        )
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / self._refill_per_second
+            self.rejected += 1
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self._max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
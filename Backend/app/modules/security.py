@@ -1,37 +1,169 @@
 # -*- coding: utf-8 -*-
+import asyncio
+import hashlib
+import secrets
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from json import dumps
+from json import dumps, loads
+from typing import Callable, TypeVar
 
 import jwt
 from pwdlib import PasswordHash
 
-from app.config.settings import Settings
-from app.schemas.user import UserInfo
+from app.config.settings import on_settings_reload, settings
+from app.modules.argon2_tuning import Argon2Params
+from app.schemas.user import Principal
+
+T = TypeVar("T")
+
+
+class HashingPool:
+    """Runs argon2 work on a bounded thread pool (argon2-cffi releases the
+    GIL) so hashing never blocks the event loop; callers beyond the
+    concurrency cap wait in an asyncio queue."""
+
+    def __init__(self, max_concurrency: int) -> None:
+        self._max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="argon2"
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._queued = 0
+        self._max_queued = 0
+        self._in_flight = 0
+        self._completed = 0
+
+    async def run(self, func: Callable[..., T], *args: object) -> T:
+        self._queued += 1
+        self._max_queued = max(self._max_queued, self._queued)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._queued -= 1
+        self._in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, func, *args
+            )
+        finally:
+            self._in_flight -= 1
+            self._completed += 1
+            self._semaphore.release()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queued
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "max_concurrency": self._max_concurrency,
+            "in_flight": self._in_flight,
+            "queued": self._queued,
+            "max_queued": self._max_queued,
+            "completed": self._completed,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+hashing_pool = HashingPool(settings.HASHING_MAX_CONCURRENCY)
+
+
+def _configured_argon2_params() -> Argon2Params:
+    return Argon2Params(
+        time_cost=settings.ARGON2_TIME_COST,
+        memory_cost=settings.ARGON2_MEMORY_COST,
+        parallelism=settings.ARGON2_PARALLELISM,
+    )
 
 
 class PasswordManager:
-    def __init__(self) -> None:
-        self.__pwd_context = PasswordHash.recommended()
+    # Pinned in settings (see app.tools.calibrate_argon2) so every worker
+    # hashes with the same parameters.
+    _pwd_context: PasswordHash = _configured_argon2_params().password_hash()
 
-    def password_hash(self, password: str) -> str:
-        return self.__pwd_context.hash(password)
+    @classmethod
+    def configure(cls, params: Argon2Params) -> None:
+        cls._pwd_context = params.password_hash()
 
-    def verify_password(self, password: str, hashed: str) -> bool:
-        return self.__pwd_context.verify(password, hashed)
+    async def password_hash(self, password: str) -> str:
+        return await hashing_pool.run(self._pwd_context.hash, password)
 
+    async def verify_password(self, password: str, hashed: str) -> bool:
+        return await hashing_pool.run(self._pwd_context.verify, password, hashed)
 
-class TokenManager:
-    def __init__(self) -> None:
-        self.__settings = Settings()  # type: ignore[call-arg]
-        self.__algorithm = self.__settings.ALGORITHM
-        self.__secret_key = self.__settings.SECRET_KEY
-        self.__access_token_expire_minutes = (
-            self.__settings.ACCESS_TOKEN_EXPIRE_MINUTES
+    async def verify_and_update(
+        self, password: str, hashed: str
+    ) -> tuple[bool, str | None]:
+        return await hashing_pool.run(
+            self._pwd_context.verify_and_update, password, hashed
         )
 
-    def create_access_token(self, data: UserInfo) -> str:
+
+# Shared by every service. Services and controllers are still built per
+# request; they only keep the request's session next to these.
+password_manager = PasswordManager()
+
+
+@on_settings_reload
+def _reload_argon2_params(changed: set[str]) -> None:
+    if changed & {"ARGON2_TIME_COST", "ARGON2_MEMORY_COST", "ARGON2_PARALLELISM"}:
+        PasswordManager.configure(_configured_argon2_params())
+
+
+class TokenManager:
+    def create_access_token(self, principal: Principal) -> str:  # noqa: PLR6301
         expire = datetime.now().astimezone() + timedelta(
-            minutes=self.__access_token_expire_minutes
+            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
+        )
+        to_encode = {
+            "sub": dumps(principal.user.model_dump()),
+            "ver": principal.token_version,
+            "exp": expire,
+        }
+        return jwt.encode(
+            to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
         )
-        to_encode = {"sub": dumps(data.model_dump()), "exp": expire}
-        return jwt.encode(to_encode, self.__secret_key, algorithm=self.__algorithm)
+
+    @staticmethod
+    def subject_id(token: str) -> int | None:
+        """User id of a validly signed, unexpired access token."""
+        try:
+            payload = jwt.decode(
+                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            )
+            subject = payload["sub"]
+            if isinstance(subject, str):
+                subject = loads(subject)
+            return int(subject["id"])
+        except (jwt.PyJWTError, KeyError, TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def expires_at(token: str) -> datetime | None:
+        """Expiry of a validly signed, unexpired access token."""
+        try:
+            payload = jwt.decode(
+                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            )
+            return datetime.fromtimestamp(payload["exp"]).astimezone()
+        except (jwt.PyJWTError, KeyError, TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def create_refresh_token() -> tuple[str, str]:
+        token = secrets.token_urlsafe(32)
+        return token, TokenManager.hash_refresh_token(token)
+
+    @staticmethod
+    def hash_refresh_token(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    @staticmethod
+    def create_token_family() -> str:
+        return uuid.uuid4().hex
+
+
+token_manager = TokenManager()
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, ExceptionContext
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import settings
+
+logger = logging.getLogger("app.sql")
+slow_query_logger = logging.getLogger("app.sql.slow")
+
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_name(scope: Scope) -> str:
+    # FastAPI stores the matched route in the scope once routing is done,
+    # so requests are named by the path template, not the raw URL. 404s
+    # share one name: scanners would otherwise add a key per URL.
+    route = scope.get("route")
+    path = getattr(route, "path", UNMATCHED_ROUTE)
+    return f"{scope['method']} {path}"
+
+
+class RequestQueries:
+    """Statements issued while serving one HTTP request."""
+
+    def __init__(self, scope: Scope) -> None:
+        self._scope = scope
+        self.count = 0
+        self.total_ms = 0.0
+
+    @property
+    def route(self) -> str:
+        return route_name(self._scope)
+
+    def record(self, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+
+
+class RouteQueryStats:
+    def __init__(self) -> None:
+        self._routes: dict[str, dict[str, Any]] = {}
+
+    def record(self, request: RequestQueries) -> None:
+        stats = self._routes.setdefault(
+            request.route,
+            {"requests": 0, "queries": 0, "max_queries": 0, "total_ms": 0.0},
+        )
+        stats["requests"] += 1
+        stats["queries"] += request.count
+        stats["max_queries"] = max(stats["max_queries"], request.count)
+        stats["total_ms"] += request.total_ms
+
+    def stats(self) -> list[dict[str, Any]]:
+        return sorted(
+            (
+                {
+                    "route": route,
+                    "requests": stats["requests"],
+                    "queries_per_request": round(
+                        stats["queries"] / stats["requests"], 2
+                    ),
+                    "max_queries": stats["max_queries"],
+                    "budget": query_budget(route),
+                    "mean_ms": round(stats["total_ms"] / stats["requests"], 3),
+                }
+                for route, stats in self._routes.items()
+            ),
+            key=lambda stats: stats["queries_per_request"],
+            reverse=True,
+        )
+
+
+class PoolWaitStats:
+    """Time spent getting a connection out of the pool, pre-ping included."""
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, elapsed_ms: float) -> None:
+        self.checkouts += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_total_ms": round(self.total_ms, 3),
+            "wait_mean_ms": round(self.total_ms / (self.checkouts or 1), 3),
+            "wait_max_ms": round(self.max_ms, 3),
+        }
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            pool_wait_stats.timeouts += 1
+            raise
+        pool_wait_stats.record((time.perf_counter() - start) * 1000)
+        return connection
+
+
+_request_queries: ContextVar[RequestQueries | None] = ContextVar(
+    "request_queries", default=None
+)
+route_query_stats = RouteQueryStats()
+pool_wait_stats = PoolWaitStats()
+
+
+def query_budget(route: str) -> int:
+    return settings.SQL_QUERY_BUDGETS.get(route, settings.SQL_QUERY_BUDGET)
+
+
+def redact(parameters: Any) -> Any:
+    """Keeps the shape of bound parameters but never their values."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _before_cursor_execute(  # noqa: PLR0913, PLR0917
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(  # noqa: PLR0913, PLR0917
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    elapsed_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+    request = _request_queries.get()
+    route = request.route if request else "-"
+    if request:
+        request.record(elapsed_ms)
+    logger.debug(
+        "%.1f ms, %d rows, route %s: %s",
+        elapsed_ms,
+        cursor.rowcount,
+        route,
+        statement,
+    )
+    if elapsed_ms >= settings.SQL_SLOW_QUERY_MS:
+        slow_query_logger.warning(
+            "%.1f ms, %d rows, route %s: %s params=%s",
+            elapsed_ms,
+            cursor.rowcount,
+            route,
+            " ".join(statement.split()),
+            redact(parameters),
+        )
+
+
+def _handle_error(context: ExceptionContext) -> None:
+    if context.connection is not None:
+        starts = context.connection.info.get("query_start")
+        if starts:
+            starts.pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class QueryCountMiddleware:
+    """Counts the statements of each request, reports them in the
+    ``X-Query-Count``/``X-Query-Time-Ms`` headers and warns when a route
+    goes over its query budget."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = RequestQueries(scope)
+        token = _request_queries.set(request)
+
+        async def send_with_query_count(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-Query-Count"] = str(request.count)
+                headers["X-Query-Time-Ms"] = f"{request.total_ms:.1f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_query_count)
+        finally:
+            _request_queries.reset(token)
+            route_query_stats.record(request)
+            budget = query_budget(request.route)
+            if settings.SQL_QUERY_BUDGET_WARN and request.count > budget:
+                logger.warning(
+                    "%s issued %d queries, over its budget of %d",
+                    request.route,
+                    request.count,
+                    budget,
+                )
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+import logging
+from typing import Any
+
+from app.modules.notifications import notification_listener
+
+logger = logging.getLogger(__name__)
+
+TOKEN_VERSION_CHANNEL = "token_versions"
+# Users who never had their tokens revoked are at version 0 and stay out of
+# the table.
+LOAD_TOKEN_VERSIONS = "SELECT id, token_version FROM users WHERE token_version > 0"
+
+
+def token_version_payload(user_id: int, token_version: int) -> str:
+    return f"{user_id}:{token_version}"
+
+
+class TokenVersions:
+    """Per-worker ``user_id -> token_version`` table for revocation without a
+    row read per request.
+
+    ``disable_user``/``update_user`` bump ``users.token_version`` and NOTIFY
+    the new value; every worker applies it as it arrives and reloads the whole
+    table when its listener reconnects. Versions only grow, so a notification
+    and a reload may arrive in any order."""
+
+    def __init__(self) -> None:
+        self._versions: dict[int, int] = {}
+
+    def current(self, user_id: int) -> int:
+        return self._versions.get(user_id, 0)
+
+    def accepts(self, user_id: int, token_version: int) -> bool:
+        # A token newer than the table is from a login that raced the
+        # notification of its own bump; it is not revoked.
+        return token_version >= self.current(user_id)
+
+    def bump(self, user_id: int, token_version: int) -> None:
+        if token_version > self.current(user_id):
+            self._versions[user_id] = token_version
+
+    def on_notify(self, payload: str) -> None:
+        user_id, token_version = payload.split(":")
+        self.bump(int(user_id), int(token_version))
+
+    async def load(self, connection: Any) -> None:
+        rows = await connection.fetch(LOAD_TOKEN_VERSIONS)
+        for row in rows:
+            self.bump(row["id"], row["token_version"])
+        logger.info("token versions loaded: %s revoked users", len(self._versions))
+
+
+token_versions = TokenVersions()
+notification_listener.listen(TOKEN_VERSION_CHANNEL, token_versions.on_notify)
+notification_listener.on_connect(token_versions.load)
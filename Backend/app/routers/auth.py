@@ -4,15 +4,24 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependency.database import SessionConnection
+from app.dependency.rate_limit import LoginAdmission
 from app.routers.controller.auth import AuthController
-from app.schemas.auth import Token
+from app.schemas.auth import RefreshTokenRequest, Token
 
 router_auth = APIRouter(tags=["auth"], prefix="/auth")
 
 
-@router_auth.post("/login")
+@router_auth.post("/login", dependencies=[Depends(LoginAdmission.check)])
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     session: AsyncSession = Depends(SessionConnection.session),
 ) -> Token:
     return await AuthController(session).login(form_data)
+
+
+@router_auth.post("/refresh")
+async def refresh(
+    form_data: RefreshTokenRequest,
+    session: AsyncSession = Depends(SessionConnection.session),
+) -> Token:
+    return await AuthController(session).refresh(form_data.refresh_token)
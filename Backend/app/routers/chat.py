@@ -1,17 +1,18 @@
 # -*- coding: utf-8 -*-
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, WebSocket
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependency.auth import AuthManager
 from app.dependency.database import SessionConnection
 from app.modules.basic_response import BasicResponse
-from app.routers.controller.chat import ChatController
+from app.routers.controller.chat import ChatController, ChatSocketController
 from app.schemas.chat import (
     ChatId,
-    ChatMessages,
+    ChatMessagePage,
     ChatOtherUserName,
     Chats,
+    ReadCursor,
     SendMessage,
     SugestionChat,
 )
@@ -39,12 +40,22 @@ async def create_message(
 
 @router_chat.get("/all-by-user")
 async def get_chats_by_user(
-    session: AsyncSession = Depends(SessionConnection.session),
+    session: AsyncSession = Depends(SessionConnection.read_session),
     user: UserInfo = Depends(AuthManager.has_authorization),
 ) -> BasicResponse[list[Chats]]:
     return await ChatController(session, user).get_chats_by_user()
 
 
+@router_chat.post("/{chat_id}/read")
+async def mark_chat_read(
+    chat_id: int,
+    read_cursor: ReadCursor,
+    session: AsyncSession = Depends(SessionConnection.session),
+    user: UserInfo = Depends(AuthManager.has_authorization),
+) -> BasicResponse[None]:
+    return await ChatController(session, user).mark_read(chat_id, read_cursor)
+
+
 @router_chat.delete("/{chat_id}")
 async def delete_chat(
     chat_id: int,
@@ -64,12 +75,19 @@ async def create_chat(
 
 
 @router_chat.get("/{chat_id}")
-async def get_all_chats(
+async def get_messages(  # noqa: PLR0913, PLR0917
     chat_id: int,
-    session: AsyncSession = Depends(SessionConnection.session),
+    before: int | None = None,
+    after: int | None = None,
+    limit: int = 50,
+    session: AsyncSession = Depends(SessionConnection.read_session),
     user: UserInfo = Depends(AuthManager.has_authorization),
-) -> BasicResponse[list[ChatMessages]]:
-    return await ChatController(session, user).get_all_messages(chat_id)
+) -> BasicResponse[ChatMessagePage]:
+    """Latest messages; ``before`` pages back through the history and
+    ``after`` fetches only messages newer than the last one the app has."""
+    return await ChatController(session, user).get_messages(
+        chat_id, before, after, limit
+    )
 
 
 @router_chat.get("/other-user-name/{chat_id}")
@@ -79,3 +97,17 @@ async def get_other_user_name(
     user: UserInfo = Depends(AuthManager.has_authorization),
 ) -> BasicResponse[ChatOtherUserName]:
     return await ChatController(session, user).get_other_user_name(chat_id)
+
+
+@router_chat.websocket("/ws")
+async def chat_socket(
+    websocket: WebSocket,
+    token: str | None = None,
+    last_seen_id: int | None = None,
+) -> None:
+    # Browsers and React Native cannot always set headers on a WebSocket, so
+    # the token may also come in the query string.
+    authorization = websocket.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+    await ChatSocketController(websocket).stream(token, last_seen_id)
@@ -22,3 +22,11 @@ class AuthController:
             raise e
         except Exception as e:
             raise e
+
+    async def refresh(self, refresh_token: str) -> Token:
+        try:
+            return await self._service.refresh(refresh_token)
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            raise e
@@ -1,19 +1,35 @@
 # coding: utf-8
+import asyncio
+from datetime import datetime
+from typing import Any
 
+from fastapi import HTTPException, WebSocket, WebSocketDisconnect, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config.settings import settings
+from app.dependency.auth import AuthManager
+from app.dependency.database import Database
 from app.modules.basic_response import BasicResponse
+from app.modules.chat_events import Subscription, chat_hub
+from app.modules.security import token_manager
 from app.schemas.chat import (
     ChatId,
-    ChatMessages,
+    ChatMessagePage,
     ChatOtherUserName,
     Chats,
+    ReadCursor,
     SendMessage,
     SugestionChat,
 )
 from app.schemas.user import UserInfo
 from app.service.chat import ChatService
 
+# Messages replayed on reconnect; past this the client is told to resync.
+RESUME_LIMIT = 500
+# Application close code (4000-4999) for an expired or revoked token, after
+# HTTP 401: the client refreshes its token and reconnects.
+WS_UNAUTHORIZED = 4401
+
 
 class ChatController:
     def __init__(self, session: AsyncSession, user: UserInfo) -> None:
@@ -21,18 +37,31 @@ class ChatController:
         self._service = ChatService(session)
         self._user = user
 
-    async def get_all_messages(
-        self, chat_id: int
-    ) -> BasicResponse[list[ChatMessages]]:
+    async def get_messages(
+        self, chat_id: int, before: int | None, after: int | None, limit: int
+    ) -> BasicResponse[ChatMessagePage]:
         try:
-            mensagens = await self._service.get_all_messages(self._user.id, chat_id)
-            return BasicResponse(data=mensagens)
+            page = await self._service.get_messages(
+                self._user.id, chat_id, before, after, limit
+            )
+            return BasicResponse(data=page)
         except Exception as e:
             raise e
 
     async def create_message(self, send_message: SendMessage) -> BasicResponse[None]:
         try:
-            await self._service.create_message(self._user.id, send_message)
+            await self._service.create_message(self._user, send_message)
+            return BasicResponse(data=None)
+        except Exception as e:
+            raise e
+
+    async def mark_read(
+        self, chat_id: int, read_cursor: ReadCursor
+    ) -> BasicResponse[None]:
+        try:
+            await self._service.mark_read(
+                self._user.id, chat_id, read_cursor.last_read_message_id
+            )
             return BasicResponse(data=None)
         except Exception as e:
             raise e
@@ -81,3 +110,102 @@ class ChatController:
             )
         except Exception as e:
             raise e
+
+
+class ChatSocketController:
+    def __init__(self, websocket: WebSocket) -> None:
+        self._websocket = websocket
+
+    async def stream(self, token: str | None, last_seen_id: int | None) -> None:
+        try:
+            user = await AuthManager.has_authorization(token or "")
+        except HTTPException:
+            await self._websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+        await self._websocket.accept()
+        try:
+            # Subscribed before reading the backlog, so a message committed
+            # in between arrives live instead of being lost.
+            with chat_hub.subscribe(user.id) as subscription:
+                replayed = (
+                    await self._resume(user.id, last_seen_id)
+                    if last_seen_id is not None
+                    else set()
+                )
+                await self._forward(subscription, replayed, token or "")
+        except WebSocketDisconnect:
+            return
+
+    async def _resume(self, user_id: int, last_seen_id: int) -> set[int]:
+        # A short session of its own: the socket must not hold a pooled
+        # connection while it stays open.
+        async with Database().session as session:
+            service = ChatService(session)
+            backlog = await service.get_messages_since(
+                user_id, last_seen_id, RESUME_LIMIT
+            )
+            # Participation or the relation may have ended since the client
+            # last connected; those chats are skipped, not replayed.
+            readable = await service.readable_chats(
+                user_id, {message.chat_id for message in backlog}
+            )
+        for message in backlog:
+            if message.chat_id in readable:
+                await self._send_message(message.model_dump(mode="json"))
+        if len(backlog) == RESUME_LIMIT:
+            await self._websocket.send_json({"type": "resync"})
+        return {message.id for message in backlog}
+
+    async def _forward(
+        self, subscription: Subscription, replayed: set[int], token: str
+    ) -> None:
+        receiver = asyncio.ensure_future(self._receive())
+        authorization = asyncio.ensure_future(self._watch_token(token))
+        try:
+            while not subscription.overflowed:
+                getter = asyncio.ensure_future(subscription.queue.get())
+                done, _ = await asyncio.wait(
+                    {receiver, authorization, getter},
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if authorization in done:
+                    getter.cancel()
+                    await self._websocket.close(code=WS_UNAUTHORIZED)
+                    return
+                if getter not in done:
+                    getter.cancel()
+                    return
+                message = getter.result()
+                if message["id"] not in replayed:
+                    await self._send_message(message)
+            await self._websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        finally:
+            receiver.cancel()
+            authorization.cancel()
+
+    @staticmethod
+    async def _watch_token(token: str) -> None:
+        """Returns once the token expires or stops being authorized (user
+        disabled or tokens revoked), checked as often as principals are
+        cached."""
+        expires_at = token_manager.expires_at(token)
+        while expires_at is not None:
+            remaining = (expires_at - datetime.now().astimezone()).total_seconds()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(min(remaining, settings.PRINCIPAL_CACHE_TTL_SECONDS))
+            try:
+                await AuthManager.has_authorization(token)
+            except HTTPException:
+                return
+
+    async def _receive(self) -> None:
+        # Clients only send keep-alives; this ends when they disconnect.
+        try:
+            while True:
+                await self._websocket.receive_text()
+        except WebSocketDisconnect:
+            return
+
+    async def _send_message(self, message: dict[str, Any]) -> None:
+        await self._websocket.send_json({"type": "message", "data": message})
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+from fastapi import HTTPException
+
+from app.core.user_profile import UserProfile
+from app.dependency.database import Database
+from app.modules.basic_response import BasicResponse
+from app.modules.cache import TTLCache
+from app.modules.query_registry import queries
+from app.modules.security import hashing_pool
+from app.modules.sql_instrumentation import route_query_stats
+from app.schemas.metrics import (
+    CacheStats,
+    DatabasePoolStats,
+    HashingPoolStats,
+    QueryStats,
+    RouteQueryStats,
+)
+from app.schemas.user import UserInfo
+
+
+class MetricsController:
+    def __init__(self, user: UserInfo) -> None:
+        self._user = user
+        if self._user.user_profile != UserProfile.ADMIN.value:
+            raise HTTPException(status_code=403, detail="Acesso negado")
+
+    async def get_hashing_stats(self) -> BasicResponse[HashingPoolStats]:  # noqa: PLR6301
+        try:
+            return BasicResponse(data=HashingPoolStats(**hashing_pool.stats()))
+        except Exception as e:
+            raise e
+
+    async def get_cache_stats(self) -> BasicResponse[list[CacheStats]]:  # noqa: PLR6301
+        try:
+            return BasicResponse(
+                data=[CacheStats(**cache.stats()) for cache in TTLCache.registry]
+            )
+        except Exception as e:
+            raise e
+
+    async def get_database_stats(self) -> BasicResponse[DatabasePoolStats]:  # noqa: PLR6301
+        try:
+            return BasicResponse(data=Database().pool_stats())
+        except Exception as e:
+            raise e
+
+    async def get_query_stats(self) -> BasicResponse[list[QueryStats]]:  # noqa: PLR6301
+        try:
+            return BasicResponse(
+                data=[QueryStats(**stats) for stats in queries.stats()]
+            )
+        except Exception as e:
+            raise e
+
+    async def get_route_stats(self) -> BasicResponse[list[RouteQueryStats]]:  # noqa: PLR6301
+        try:
+            return BasicResponse(
+                data=[
+                    RouteQueryStats(**stats) for stats in route_query_stats.stats()
+                ]
+            )
+        except Exception as e:
+            raise e
@@ -143,6 +143,19 @@ class WorkoutPlanController:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
             )
 
+    async def search_free_workout_plans(
+        self, exercise: str | None, muscle_group: str | None
+    ) -> BasicResponse[list[PreviousWorkoutPlan]]:
+        try:
+            workout_plans = await self._service.search_free_workout_plans(
+                exercise, muscle_group
+            )
+            return BasicResponse(data=workout_plans)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+            )
+
     async def get_all_free_workout_plans(
         self,
     ) -> BasicResponse[list[PreviousWorkoutPlan]]:
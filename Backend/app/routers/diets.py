@@ -59,7 +59,7 @@ async def get_all_finished_diets(
 @router_diets.get("/all-free-quantity")
 async def get_quantity_free_diets(
     user: UserInfo = Depends(AuthManager.has_authorization),
-    session: AsyncSession = Depends(SessionConnection.session),
+    session: AsyncSession = Depends(SessionConnection.read_session),
 ) -> BasicResponse[AllFreeDietQuantity]:
     return await DietController(session).get_quantity_of_free_diets()
 
@@ -83,21 +83,21 @@ async def get_actual_previous_diet(
 @router_diets.get("/by-profissional")
 async def get_diets_by_profissional(
     user: UserInfo = Depends(AuthManager.has_authorization),
-    session: AsyncSession = Depends(SessionConnection.session),
+    session: AsyncSession = Depends(SessionConnection.read_session),
 ) -> BasicResponse[list[DietsByProfissional]]:
     return await DietController(session).get_diets_by_profissional(user)
 
 
 @router_diets.get("/all-free")
 async def get_all_free_diets(
-    session: AsyncSession = Depends(SessionConnection.session),
+    session: AsyncSession = Depends(SessionConnection.read_session),
 ) -> BasicResponse[list[AllFreeDiets]]:
     return await DietController(session).get_all_free_diets()
 
 
 @router_diets.get("/period")
 async def get_period_calendar(
-    session: AsyncSession = Depends(SessionConnection.session),
+    session: AsyncSession = Depends(SessionConnection.read_session),
     user: UserInfo = Depends(AuthManager.has_authorization),
 ) -> BasicResponse[DietPeriodCalendar | None]:
     return await DietController(session).get_period_diet(user)
@@ -123,6 +123,6 @@ async def delete_diet(
 @router_diets.get("/{diet_id}")
 async def get_diet_by_id(
     diet_id: int,
-    session: AsyncSession = Depends(SessionConnection.session),
+    session: AsyncSession = Depends(SessionConnection.read_session),
 ) -> BasicResponse[list[DietData]]:
     return await DietController(session).get_diet_by_id(diet_id)
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+from fastapi import APIRouter, Depends
+
+from app.dependency.auth import AuthManager
+from app.modules.basic_response import BasicResponse
+from app.routers.controller.metrics import MetricsController
+from app.schemas.metrics import (
+    CacheStats,
+    DatabasePoolStats,
+    HashingPoolStats,
+    QueryStats,
+    RouteQueryStats,
+)
+from app.schemas.user import UserInfo
+
+router_metrics = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router_metrics.get("/hashing")
+async def get_hashing_stats(
+    user: UserInfo = Depends(AuthManager.has_authorization),
+) -> BasicResponse[HashingPoolStats]:
+    return await MetricsController(user).get_hashing_stats()
+
+
+@router_metrics.get("/caches")
+async def get_cache_stats(
+    user: UserInfo = Depends(AuthManager.has_authorization),
+) -> BasicResponse[list[CacheStats]]:
+    return await MetricsController(user).get_cache_stats()
+
+
+@router_metrics.get("/database")
+async def get_database_stats(
+    user: UserInfo = Depends(AuthManager.has_authorization),
+) -> BasicResponse[DatabasePoolStats]:
+    return await MetricsController(user).get_database_stats()
+
+
+@router_metrics.get("/queries")
+async def get_query_stats(
+    user: UserInfo = Depends(AuthManager.has_authorization),
+) -> BasicResponse[list[QueryStats]]:
+    return await MetricsController(user).get_query_stats()
+
+
+@router_metrics.get("/routes")
+async def get_route_stats(
+    user: UserInfo = Depends(AuthManager.has_authorization),
+) -> BasicResponse[list[RouteQueryStats]]:
+    return await MetricsController(user).get_route_stats()
@@ -94,7 +94,7 @@ async def get_user_detail_by_cpf(
 
 @router_user.get("/ranking-points")
 async def get_ranking_points(
-    session: AsyncSession = Depends(SessionConnection.session),
+    session: AsyncSession = Depends(SessionConnection.read_session),
     user: UserInfo = Depends(AuthManager.has_authorization),
 ) -> BasicResponse[list[RankingPoints]]:
     return await UserController(session, user).get_ranking_points()
@@ -121,7 +121,7 @@ async def create_user_publication(
 
 @router_user.get("/user-publication-progress/all")
 async def get_all_user_publications(
-    session: AsyncSession = Depends(SessionConnection.session),
+    session: AsyncSession = Depends(SessionConnection.read_session),
     user: UserInfo = Depends(AuthManager.has_authorization),
 ) -> BasicResponse[list[UserPublication]]:
     return await UserController(session, user).get_user_publications_progress()
@@ -139,7 +139,7 @@ async def create_user_publication_suggestion(
 
 @router_user.get("/user-publication-suggestion/all")
 async def get_all_user_publication_suggestions(
-    session: AsyncSession = Depends(SessionConnection.session),
+    session: AsyncSession = Depends(SessionConnection.read_session),
     user: UserInfo = Depends(AuthManager.has_authorization),
 ) -> BasicResponse[list[UserPublication]]:
     return await UserController(session, user).get_user_publications_suggestions()
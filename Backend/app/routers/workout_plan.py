@@ -70,7 +70,7 @@ async def get_all_finished_workout_plans(
 
 @router_workout_plan.get("/all-free-quantity")
 async def get_quantity_free_workout_plans(
-    session: AsyncSession = Depends(SessionConnection.session),
+    session: AsyncSession = Depends(SessionConnection.read_session),
 ) -> BasicResponse[AllFreeWorkoutPlanQuantity]:
     return await WorkoutPlanController(session).get_quantity_free_workout_plans()
 
@@ -78,15 +78,27 @@ async def get_quantity_free_workout_plans(
 @router_workout_plan.get("/all-free")
 async def get_all_free_workout_plans(
     user: UserInfo = Depends(AuthManager.has_authorization),
-    session: AsyncSession = Depends(SessionConnection.session),
+    session: AsyncSession = Depends(SessionConnection.read_session),
 ) -> BasicResponse[list[PreviousWorkoutPlan]]:
     return await WorkoutPlanController(session).get_all_free_workout_plans()
 
 
+@router_workout_plan.get("/all-free/search")
+async def search_free_workout_plans(
+    exercise: str | None = None,
+    muscle_group: str | None = None,
+    user: UserInfo = Depends(AuthManager.has_authorization),
+    session: AsyncSession = Depends(SessionConnection.read_session),
+) -> BasicResponse[list[PreviousWorkoutPlan]]:
+    return await WorkoutPlanController(session).search_free_workout_plans(
+        exercise, muscle_group
+    )
+
+
 @router_workout_plan.get("/all-free-by-professional")
 async def get_all_free_workout_plans_by_professional(
     user: UserInfo = Depends(AuthManager.has_authorization),
-    session: AsyncSession = Depends(SessionConnection.session),
+    session: AsyncSession = Depends(SessionConnection.read_session),
 ) -> BasicResponse[list[PreviousWorkoutPlan]]:
     return await WorkoutPlanController(
         session
@@ -105,7 +117,7 @@ async def get_workout_plan_actual_previous(
 @router_workout_plan.get("/period")
 async def get_period_workout_plan(
     user: UserInfo = Depends(AuthManager.has_authorization),
-    session: AsyncSession = Depends(SessionConnection.session),
+    session: AsyncSession = Depends(SessionConnection.read_session),
 )-> BasicResponse[WorkoutPlanCalendar| None]:
     return await WorkoutPlanController(session).get_period_workout_plan(user)
 
@@ -126,7 +138,7 @@ async def finish_daily_training(
 async def get_workout_plan_by_id(
     workout_plan_id: int,
     user: UserInfo = Depends(AuthManager.has_authorization),
-    session: AsyncSession = Depends(SessionConnection.session),
+    session: AsyncSession = Depends(SessionConnection.read_session),
 ) -> BasicResponse[WorkoutPlan | None]:
     return await WorkoutPlanController(session).get_workout_plan_by_id(
         workout_plan_id
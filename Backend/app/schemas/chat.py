@@ -4,15 +4,36 @@ from datetime import datetime
 from pydantic import BaseModel
 
 
-class ChatMessages(BaseModel):
-    chat_message: int
+class ChatHeader(BaseModel):
     chat_id: int
     create_date: datetime
-    content: str
-    send_date: datetime
+    other_user_id: int
+    other_person_name: str
+
+
+class ChatHistoryMessage(BaseModel):
+    chat_message: int
+    user_id: int
+    content: str | None = None
     image_urls: list[str] | None = None
+    send_date: datetime
+
+
+class ChatMessagePage(BaseModel):
+    header: ChatHeader
+    messages: list[ChatHistoryMessage]
+    has_more: bool
+
+
+class ChatMessageEvent(BaseModel):
+    id: int
+    chat_id: int
+    user_id: int
     sender_name: str
-    other_person_name: str
+    content: str | None = None
+    image_urls: list[str] | None = None
+    send_date: datetime
+    truncated: bool = False
 
 
 class SendMessage(BaseModel):
@@ -25,9 +46,15 @@ class Chats(BaseModel):
     chat_id: int
     other_person_name: str
     image_profile: str | None = None
+    last_message_id: int | None = None
     sender_id: int | None = None
     last_message: str | None = None
     send_date: datetime | None = None
+    unread_count: int = 0
+
+
+class ReadCursor(BaseModel):
+    last_read_message_id: int
 
 
 class SugestionChat(BaseModel):
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+from pydantic import BaseModel
+
+
+class HashingPoolStats(BaseModel):
+    max_concurrency: int
+    in_flight: int
+    queued: int
+    max_queued: int
+    completed: int
+
+
+class CacheStats(BaseModel):
+    name: str
+    size: int
+    maxsize: int
+    ttl: float
+    hits: int
+    misses: int
+    evictions: int
+
+
+class DatabasePoolStats(BaseModel):
+    size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    timeouts: int
+    wait_total_ms: float
+    wait_mean_ms: float
+    wait_max_ms: float
+
+
+class QueryStats(BaseModel):
+    name: str
+    calls: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    histogram: dict[str, int]
+
+
+class RouteQueryStats(BaseModel):
+    route: str
+    requests: int
+    queries_per_request: float
+    max_queries: int
+    budget: int
+    mean_ms: float
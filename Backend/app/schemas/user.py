@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 from datetime import datetime
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel
 
 from app.core.user_profile import UserPost, UserProfile
 
@@ -9,6 +9,11 @@ from app.core.user_profile import UserPost, UserProfile
 class UserLogin(BaseModel):
     id: int
     password: str
+    name: str
+    user_profile: int
+    email: str
+    is_active: bool = True
+    token_version: int = 0
 
 
 class CreateUser(BaseModel):
@@ -20,12 +25,6 @@ class CreateUser(BaseModel):
     birth_date: datetime
     professional_id: int | None = None
 
-    @field_validator("password", mode="before")
-    def set_password(cls, value: str) -> str:
-        from app.modules.security import PasswordManager  # noqa:PLC0415
-
-        return PasswordManager().password_hash(value)
-
 
 class UpdateUser(BaseModel):
     cpf: str | None = None
@@ -34,12 +33,6 @@ class UpdateUser(BaseModel):
     birth_date: datetime | None = None
     last_update: datetime | None = datetime.now()
 
-    @field_validator("password", mode="before")
-    def set_password(cls, value: str | None) -> str | None:
-        from app.modules.security import PasswordManager  # noqa:PLC0415
-
-        return PasswordManager().password_hash(value) if value else None
-
 
 class ClientInfo(BaseModel):
     id: int
@@ -62,6 +55,11 @@ class UserInfo(BaseModel):
     email: str
 
 
+class Principal(BaseModel):
+    user: UserInfo
+    token_version: int
+
+
 class RankingPoints(BaseModel):
     id: int
     name: str
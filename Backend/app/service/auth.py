@@ -1,28 +1,164 @@
 # -*- coding: utf-8 -*-
-from fastapi import HTTPException
+from datetime import timedelta
+
+from fastapi import HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import delete, func, update
 
-from app.modules.security import PasswordManager, TokenManager
+from app.config.settings import settings
+from app.core.db_model import RefreshToken
+from app.modules.query_registry import queries
+from app.modules.security import password_manager, token_manager
 from app.schemas.auth import Token
+from app.schemas.user import Principal, UserInfo
 from app.service.user import UserService
 
+ROTATE_TOKEN = queries.register(
+    "auth.rotate_token",
+    """
+    WITH rotated AS (
+            UPDATE refresh_tokens
+            SET revoked = true
+            WHERE token_hash = :token_hash
+                AND revoked = false
+                AND expires_at > now()
+            RETURNING user_id, family_id
+        )
+        SELECT
+            u.id,
+            u.email,
+            u.user_profile,
+            u."name",
+            u.token_version,
+            r.family_id
+        FROM rotated r
+        JOIN users u ON u.id = r.user_id
+        WHERE u.is_active = true
+    """,
+)
+
+
+GET_REVOKED_FAMILY = queries.register(
+    "auth.get_revoked_family",
+    """
+    SELECT family_id
+        FROM refresh_tokens
+        WHERE token_hash = :token_hash
+            AND revoked = true
+    """,
+)
+
 
 class AuthService:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
-        self.__pwd_manager = PasswordManager()
-        self.__token_manager = TokenManager()
+        self.__pwd_manager = password_manager
+        self.__token_manager = token_manager
         self.__user_service = UserService(session)
+        self.__refresh_querys = RefreshTokenQuerys(session)
 
     async def login(self, form_data: OAuth2PasswordRequestForm) -> Token:
         user = await self.__user_service.get_user_by_email(form_data.username)
-        if not user or not self.__pwd_manager.verify_password(
-            form_data.password, user.password
-        ):
+        is_valid, updated_hash = (
+            await self.__pwd_manager.verify_and_update(
+                form_data.password, user.password
+            )
+            if user
+            else (False, None)
+        )
+        # Disabled accounts get the same answer as a wrong password.
+        if not user or not is_valid or not user.is_active:
             raise HTTPException(
                 status_code=400, detail="Nome de usuário ou senha incorretos"
             )
-        user = await self.__user_service.get_user_by_id(user.id)
-        access_token = self.__token_manager.create_access_token(user)
-        return Token(access_token=access_token, token_type="bearer")
+        if updated_hash:
+            await self.__user_service.update_password_hash(user.id, updated_hash)
+        await self.__refresh_querys.delete_expired_tokens(user.id)
+        return await self._issue_tokens(
+            Principal(
+                user=UserInfo(**user.model_dump(include=set(UserInfo.model_fields))),
+                token_version=user.token_version,
+            ),
+            self.__token_manager.create_token_family(),
+        )
+
+    async def refresh(self, refresh_token: str) -> Token:
+        token_hash = self.__token_manager.hash_refresh_token(refresh_token)
+        rotated = await self.__refresh_querys.rotate_token(token_hash)
+        if rotated is None:
+            family_id = await self.__refresh_querys.get_revoked_family(token_hash)
+            if family_id:
+                # A rotated token was presented again: assume it leaked and
+                # end every session descended from the same login. Committed
+                # here because the 401 below rolls the request back.
+                await self.__refresh_querys.revoke_family(family_id)
+                await self._session.commit()
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Refresh token inválido",
+            )
+        principal, family_id = rotated
+        return await self._issue_tokens(principal, family_id)
+
+    async def _issue_tokens(self, principal: Principal, family_id: str) -> Token:
+        refresh_token, token_hash = self.__token_manager.create_refresh_token()
+        await self.__refresh_querys.create_token(
+            principal.user.id, token_hash, family_id
+        )
+        return Token(
+            access_token=self.__token_manager.create_access_token(principal),
+            token_type="bearer",
+            refresh_token=refresh_token,
+        )
+
+
+class RefreshTokenQuerys:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def create_token(
+        self, user_id: int, token_hash: str, family_id: str
+    ) -> None:
+        self._session.add(
+            RefreshToken(
+                user_id=user_id,
+                token_hash=token_hash,
+                family_id=family_id,
+                expires_at=func.now()
+                + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+            )
+        )
+        await self._session.flush()
+
+    async def rotate_token(self, token_hash: str) -> tuple[Principal, str] | None:
+        result = await ROTATE_TOKEN.execute(self._session, token_hash=token_hash)
+        row = result.fetchone()
+        if not row:
+            return None
+        data = row._asdict()
+        family_id = data.pop("family_id")
+        token_version = data.pop("token_version")
+        principal = Principal(user=UserInfo(**data), token_version=token_version)
+        return principal, family_id
+
+    async def get_revoked_family(self, token_hash: str) -> str | None:
+        result = await GET_REVOKED_FAMILY.execute(
+            self._session, token_hash=token_hash
+        )
+        return result.scalar_one_or_none()
+
+    async def revoke_family(self, family_id: str) -> None:
+        await self._session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id)
+            .values(revoked=True)
+        )
+
+    async def delete_expired_tokens(self, user_id: int) -> None:
+        await self._session.execute(
+            delete(RefreshToken).where(
+                RefreshToken.user_id == user_id,
+                RefreshToken.expires_at <= func.now(),
+            )
+        )
@@ -1,164 +1,415 @@
 # -*- coding: utf-8 -*-
+import json
+
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import bindparam, delete, text
+from sqlalchemy.sql import delete
 
-from app.core.db_model import Chat, ChatMessage, Participant
+from app.core.db_model import Chat
+from app.modules.chat_events import CHAT_CHANNEL, notify_payload
+from app.modules.query_registry import queries
 from app.schemas.chat import (
+    ChatHeader,
+    ChatHistoryMessage,
     ChatId,
-    ChatMessages,
+    ChatMessageEvent,
+    ChatMessagePage,
     ChatOtherUserName,
     Chats,
     SendMessage,
     SugestionChat,
 )
+from app.schemas.user import UserInfo
+from app.service.relations import relationship_cache
+
+PREVIEW_LENGTH = 200
+# Largest BIGINT: "before" the newest message there can be.
+LAST_MESSAGE_ID = 2**63 - 1
+MAX_PAGE_SIZE = 200
+
+
+GET_CHAT_HEADER = queries.register(
+    "chat.get_chat_header",
+    """
+    SELECT
+        c.id AS chat_id,
+        c.create_date,
+        u_other.id AS other_user_id,
+        u_other.name AS other_person_name
+    FROM chats c
+    JOIN users u_other ON u_other.id = :other_user_id
+    WHERE c.id = :chat_id
+    """,
+)
+
+
+# Keyset pages over the (chat_id, id) index; ids grow in send order, so a
+# page never re-reads or skips messages the way OFFSET would.
+GET_MESSAGES_BEFORE = queries.register(
+    "chat.get_messages_before",
+    """
+    SELECT
+        cm.id AS chat_message,
+        cm.user_id,
+        cm.content,
+        cm.image_urls,
+        cm.send_date
+    FROM chat_messages cm
+    WHERE cm.chat_id = :chat_id AND cm.id < :before
+    ORDER BY cm.id DESC
+    LIMIT :limit
+    """,
+)
+
+
+GET_MESSAGES_AFTER = queries.register(
+    "chat.get_messages_after",
+    """
+    SELECT
+        cm.id AS chat_message,
+        cm.user_id,
+        cm.content,
+        cm.image_urls,
+        cm.send_date
+    FROM chat_messages cm
+    WHERE cm.chat_id = :chat_id AND cm.id > :after
+    ORDER BY cm.id ASC
+    LIMIT :limit
+    """,
+)
+
+
+# chats carries its last message and participants their unread count, both
+# kept up to date by create_message, so the inbox reads no messages at all.
+GET_CHATS_BY_USER = queries.register(
+    "chat.get_chats_by_user",
+    """
+    SELECT
+        c.id AS chat_id,
+        u_other.name AS other_person_name,
+        u_other.image_profile,
+        c.last_message_id,
+        c.last_sender_id AS sender_id,
+        c.last_message_preview AS last_message,
+        c.last_message_at AS send_date,
+        p1.unread_count
+    FROM participants p1
+    JOIN chats c ON c.id = p1.chat_id
+    JOIN participants p2
+    ON p2.chat_id = c.id AND p2.user_id != :current_user_id
+    JOIN users u_other ON u_other.id = p2.user_id
+    WHERE p1.user_id = :current_user_id
+    ORDER BY coalesce(c.last_message_at, c.create_date) DESC, c.id DESC
+    """,
+)
+
+
+# One statement inserts the message, moves the chat's last message forward
+# (never back, when concurrent sends commit out of order) and bumps the
+# unread count of the other participants.
+INSERT_MESSAGE = queries.register(
+    "chat.insert_message",
+    """
+    WITH message AS (
+        INSERT INTO chat_messages (chat_id, user_id, content, image_urls)
+        VALUES (:chat_id, :user_id, :content, cast(:image_urls AS jsonb))
+        RETURNING id, chat_id, user_id, content, send_date
+    ),
+    chat AS (
+        UPDATE chats c
+        SET last_message_id = m.id,
+            last_message_at = m.send_date,
+            last_message_preview = left(m.content, :preview_length),
+            last_sender_id = m.user_id,
+            last_update = m.send_date
+        FROM message m
+        WHERE c.id = m.chat_id
+            AND (c.last_message_id IS NULL OR c.last_message_id < m.id)
+    ),
+    unread AS (
+        UPDATE participants p
+        SET unread_count = p.unread_count + 1
+        FROM message m
+        WHERE p.chat_id = m.chat_id AND p.user_id != m.user_id
+    )
+    SELECT id, send_date FROM message
+    """,
+)
+
+
+MARK_READ = queries.register(
+    "chat.mark_read",
+    """
+    UPDATE participants p
+    SET last_read_message_id = :message_id,
+        unread_count = (
+            SELECT count(*)
+            FROM chat_messages cm
+            WHERE cm.chat_id = p.chat_id
+                AND cm.id > :message_id
+                AND cm.user_id != p.user_id
+        )
+    WHERE p.chat_id = :chat_id
+        AND p.user_id = :user_id
+        AND p.last_read_message_id < :message_id
+    """,
+)
+
+
+# Delivered to the listeners only when the request's transaction commits.
+NOTIFY_MESSAGE = queries.register(
+    "chat.notify_message",
+    """
+    SELECT pg_notify(:channel, :payload)
+    """,
+)
+
+
+GET_MESSAGES_SINCE = queries.register(
+    "chat.get_messages_since",
+    """
+    SELECT
+        cm.id,
+        cm.chat_id,
+        cm.user_id,
+        u."name" AS sender_name,
+        cm.content,
+        cm.image_urls,
+        cm.send_date
+    FROM participants p
+    JOIN chat_messages cm
+        ON cm.chat_id = p.chat_id AND cm.id > :last_seen_id
+    JOIN users u ON u.id = cm.user_id
+    WHERE p.user_id = :user_id
+    ORDER BY cm.id
+    LIMIT :limit
+    """,
+)
+
+
+# Get-or-create in one statement. DO UPDATE, unlike DO NOTHING, returns the
+# row when it already exists, also when a concurrent request just created it;
+# xmax is 0 only on a freshly inserted row.
+GET_OR_CREATE_CHAT = queries.register(
+    "chat.get_or_create_chat",
+    """
+    WITH chat AS (
+        INSERT INTO chats (user_low_id, user_high_id)
+        VALUES (:user_low_id, :user_high_id)
+        ON CONFLICT (user_low_id, user_high_id)
+        DO UPDATE SET user_low_id = EXCLUDED.user_low_id
+        RETURNING id, xmax = 0 AS created
+    ),
+    members AS (
+        INSERT INTO participants (user_id, chat_id)
+        SELECT member.user_id, chat.id
+        FROM chat, (
+            VALUES (cast(:user_low_id AS bigint)), (cast(:user_high_id AS bigint))
+        ) AS member (user_id)
+        WHERE chat.created
+    )
+    SELECT id, created FROM chat
+    """,
+)
+
+
+GET_SUGESTIONS = queries.register(
+    "chat.get_sugestions",
+    """
+    SELECT u.id AS user_id,
+        u.name AS other_person_name,
+        u.image_profile  as image_url
+    FROM users u
+    WHERE u.id = ANY(:related_ids)
+    AND u.id NOT IN (
+        SELECT p2.user_id
+        FROM participants p1
+        JOIN participants p2 ON p1.chat_id = p2.chat_id
+        WHERE p1.user_id = :user_id AND p2.user_id != :user_id
+    )
+    """,
+)
+
+
+GET_NAME_OTHER_USER = queries.register(
+    "chat.get_name_other_user",
+    """
+    SELECT u.name AS other_person_name
+    FROM participants p
+    JOIN users u ON u.id = p.user_id
+    WHERE p.chat_id = :chat_id AND p.user_id != :user_id
+    """,
+)
 
 
 class ChatService:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
 
-    async def get_all_messages(
-        self, user_id: int, chat_id: int
-    ) -> list[ChatMessages]:
-        query = text(
-            """
-            SELECT
-                cm.id as chat_message,
-                c.id AS chat_id,
-                c.create_date,
-                cm.content,
-                cm.send_date,
-                cm.image_urls,
-                u_sender.name AS sender_name,
-                u_other.name AS other_person_name
-            FROM chats c
-            JOIN chat_messages cm ON cm.chat_id = c.id
-            JOIN users u_sender ON u_sender.id = cm.user_id
-            JOIN participants p ON p.chat_id = c.id
-            JOIN users u_other ON u_other.id = p.user_id
-            WHERE
-                c.id = :chat_id
-                AND EXISTS (
-                    SELECT 1
-                    FROM participants p_current
-                    WHERE p_current.chat_id = c.id
-                    AND p_current.user_id = :current_user_id
-                )
-                AND u_other.id != :current_user_id
-                AND EXISTS (
-                    SELECT 1
-                    FROM user_relations ur
-                    WHERE
-                        (ur.user_id = :current_user_id
-                        AND ur.professional_id = u_other.id)
-                        OR
-                        (ur.professional_id = :current_user_id
-                        AND ur.user_id = u_other.id)
-                )
-            ORDER BY cm.send_date ASC
-        """
-        ).bindparams(
-            bindparam("current_user_id", user_id), bindparam("chat_id", chat_id)
+    async def get_messages(
+        self,
+        user_id: int,
+        chat_id: int,
+        before: int | None,
+        after: int | None,
+        limit: int,
+    ) -> ChatMessagePage:
+        if before is not None and after is not None:
+            raise HTTPException(
+                status_code=400, detail="Use before ou after, não os dois"
+            )
+        other_user_id = await self._other_related_member(user_id, chat_id)
+        result = await GET_CHAT_HEADER.execute(
+            self._session, chat_id=chat_id, other_user_id=other_user_id
+        )
+        header = result.fetchone()
+        if not header:
+            raise HTTPException(status_code=404, detail="Chat not found")
+        limit = min(max(limit, 1), MAX_PAGE_SIZE)
+        # One extra row tells whether there is another page.
+        if after is not None:
+            result = await GET_MESSAGES_AFTER.execute(
+                self._session, chat_id=chat_id, after=after, limit=limit + 1
+            )
+            rows = result.fetchall()
+        else:
+            result = await GET_MESSAGES_BEFORE.execute(
+                self._session,
+                chat_id=chat_id,
+                before=before if before is not None else LAST_MESSAGE_ID,
+                limit=limit + 1,
+            )
+            rows = result.fetchall()[::-1]
+        has_more = len(rows) > limit
+        if has_more:
+            rows = rows[:limit] if after is not None else rows[1:]
+        return ChatMessagePage(
+            header=ChatHeader(**header._asdict()),
+            messages=[ChatHistoryMessage(**row._asdict()) for row in rows],
+            has_more=has_more,
         )
-        result = await self._session.execute(query)
-        return [ChatMessages(**row._asdict()) for row in result.fetchall()]
 
-    async def create_message(self, user_id: int, send_message: SendMessage) -> None:
-        chat = await self._get_chat_by_id(send_message.chat_id)
-        if not chat:
+    async def _other_related_member(self, user_id: int, chat_id: int) -> int:
+        other_user_id = await self._related_member(user_id, chat_id)
+        if other_user_id is None:
             raise HTTPException(status_code=404, detail="Chat not found")
-        message = ChatMessage(**send_message.model_dump(), user_id=user_id)
-        self._session.add(message)
-        await self._session.flush()
-        await self._session.commit()
+        return other_user_id
+
+    async def _related_member(self, user_id: int, chat_id: int) -> int | None:
+        """The other member of a chat ``user_id`` belongs to, as long as the
+        two are still related."""
+        members = await relationship_cache.members(self._session, chat_id)
+        other_user_id = next(iter(members - {user_id}), None)
+        if user_id not in members or other_user_id is None:
+            return None
+        relations = await relationship_cache.relations(self._session, user_id)
+        if other_user_id not in relations.related:
+            return None
+        return other_user_id
+
+    async def create_message(
+        self, user: UserInfo, send_message: SendMessage
+    ) -> None:
+        participants = await relationship_cache.members(
+            self._session, send_message.chat_id
+        )
+        if not participants:
+            raise HTTPException(status_code=404, detail="Chat not found")
+        if user.id not in participants:
+            raise HTTPException(status_code=403, detail="Acesso negado")
+        result = await INSERT_MESSAGE.execute(
+            self._session,
+            chat_id=send_message.chat_id,
+            user_id=user.id,
+            content=send_message.content,
+            preview_length=PREVIEW_LENGTH,
+            image_urls=(
+                json.dumps(send_message.image_urls)
+                if send_message.image_urls is not None
+                else None
+            ),
+        )
+        message = result.one()
+        event = ChatMessageEvent(
+            id=message.id,
+            chat_id=send_message.chat_id,
+            user_id=user.id,
+            sender_name=user.name,
+            content=send_message.content,
+            image_urls=send_message.image_urls,
+            send_date=message.send_date,
+        )
+        await NOTIFY_MESSAGE.execute(
+            self._session,
+            channel=CHAT_CHANNEL,
+            payload=notify_payload(
+                list(participants), event.model_dump(mode="json")
+            ),
+        )
+
+    async def mark_read(self, user_id: int, chat_id: int, message_id: int) -> None:
+        await MARK_READ.execute(
+            self._session, user_id=user_id, chat_id=chat_id, message_id=message_id
+        )
+
+    async def get_messages_since(
+        self, user_id: int, last_seen_id: int, limit: int
+    ) -> list[ChatMessageEvent]:
+        result = await GET_MESSAGES_SINCE.execute(
+            self._session, user_id=user_id, last_seen_id=last_seen_id, limit=limit
+        )
+        return [ChatMessageEvent(**row._asdict()) for row in result.fetchall()]
+
+    async def readable_chats(self, user_id: int, chat_ids: set[int]) -> set[int]:
+        """The chats ``user_id`` may still read, by the same rules as
+        ``get_messages``."""
+        return {
+            chat_id
+            for chat_id in chat_ids
+            if await self._related_member(user_id, chat_id) is not None
+        }
 
     async def get_chats_by_user(self, user_id: int) -> list[Chats]:
-        query = text(
-            """
-            SELECT
-                c.id AS chat_id,
-                u_other.name AS other_person_name,
-                u_other.image_profile,
-                cm.user_id AS sender_id,
-                cm.content AS last_message,
-                cm.send_date
-            FROM chats c
-            JOIN participants p1
-            ON p1.chat_id = c.id AND p1.user_id = :current_user_id
-            JOIN participants p2
-            ON p2.chat_id = c.id AND p2.user_id != :current_user_id
-            JOIN users u_other ON u_other.id = p2.user_id
-            LEFT JOIN chat_messages cm
-                ON cm.chat_id = c.id
-                AND cm.send_date = (
-                    SELECT MAX(send_date)
-                    FROM chat_messages
-                    WHERE chat_id = c.id
-                )
-            ORDER BY cm.send_date DESC
-        """
-        ).bindparams(bindparam("current_user_id", user_id))
-        result = await self._session.execute(query)
+        result = await GET_CHATS_BY_USER.execute(
+            self._session, current_user_id=user_id
+        )
         return [Chats(**chat._asdict()) for chat in result.fetchall()]
 
-    async def delete_chat(self, chat_id: int) -> None:
+    async def delete_chat(self, user_id: int, chat_id: int) -> None:
+        members = await relationship_cache.members(self._session, chat_id)
+        if user_id not in members:
+            raise HTTPException(status_code=404, detail="Chat not found")
         await self._session.execute(delete(Chat).where(Chat.id == chat_id))
-        await self._session.commit()
+        relationship_cache.invalidate_chat(self._session, chat_id)
 
     async def create_chat(self, user_id: int, other_user_id: int) -> ChatId:
-        chat = Chat()
-        self._session.add(chat)
-        await self._session.flush()
-        await self._session.commit()
-        participant_1 = Participant(user_id=user_id, chat_id=chat.id)
-        participant_2 = Participant(user_id=other_user_id, chat_id=chat.id)
-        self._session.add(participant_1)
-        self._session.add(participant_2)
-        await self._session.flush()
-        await self._session.commit()
+        if user_id == other_user_id:
+            raise HTTPException(
+                status_code=400, detail="Não é possível criar um chat consigo mesmo"
+            )
+        result = await GET_OR_CREATE_CHAT.execute(
+            self._session,
+            user_low_id=min(user_id, other_user_id),
+            user_high_id=max(user_id, other_user_id),
+        )
+        chat = result.one()
+        if chat.created:
+            relationship_cache.invalidate_chat(self._session, chat.id)
         return ChatId(chat_id=chat.id)
 
-    async def _get_chat_by_id(self, chat_id: int) -> Chat | None:
-        query = text(
-            """
-            SELECT * FROM chats WHERE id = :chat_id
-        """
-        ).bindparams(bindparam("chat_id", chat_id))
-        result = await self._session.execute(query)
-        return result.scalar_one_or_none()
-
     async def get_sugestions(self, user_id: int) -> list[SugestionChat]:
-        query = text(
-            """
-            SELECT u.id AS user_id,
-                u.name AS other_person_name,
-                u.image_profile  as image_url
-            FROM user_relations ur
-            JOIN users u ON
-                (u.id = ur.user_id AND ur.professional_id = :user_id)
-                OR (u.id = ur.professional_id AND ur.user_id = :user_id)
-            WHERE u.id NOT IN (
-                SELECT p2.user_id
-                FROM participants p1
-                JOIN participants p2 ON p1.chat_id = p2.chat_id
-                WHERE p1.user_id = :user_id AND p2.user_id != :user_id
-            )
-        """
-        ).bindparams(bindparam("user_id", user_id))
-        result = await self._session.execute(query)
+        relations = await relationship_cache.relations(self._session, user_id)
+        if not relations.related:
+            return []
+        result = await GET_SUGESTIONS.execute(
+            self._session, user_id=user_id, related_ids=list(relations.related)
+        )
         return [SugestionChat(**user._asdict()) for user in result.fetchall()]
 
     async def get_name_other_user(
         self, user_id: int, chat_id: int
     ) -> ChatOtherUserName:
-        query = text(
-            """
-            SELECT u.name AS other_person_name
-            FROM participants p
-            JOIN users u ON u.id = p.user_id
-            WHERE p.chat_id = :chat_id AND p.user_id != :user_id
-        """
-        ).bindparams(bindparam("user_id", user_id), bindparam("chat_id", chat_id))
-        result = await self._session.execute(query)
+        result = await GET_NAME_OTHER_USER.execute(
+            self._session, user_id=user_id, chat_id=chat_id
+        )
         return ChatOtherUserName(other_user_name=result.scalar())
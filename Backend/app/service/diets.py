@@ -3,9 +3,10 @@ from datetime import datetime
 
 from dateutil.relativedelta import relativedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import bindparam, text, update
+from sqlalchemy.sql import update
 
 from app.core.db_model import Diets, UserDiet
+from app.modules.query_registry import queries
 from app.schemas.diet import (
     AllExpiredDiets,
     AllFreeDietQuantity,
@@ -18,6 +19,195 @@ from app.schemas.diet import (
     UpdateDiet,
     DietPeriodCalendar,
 )
+from app.service.relations import relationship_cache
+
+
+GET_DIET_ACTUAL = queries.register(
+    "diets.get_diet_actual",
+    """
+    select
+        d.id,
+        d.menu,
+        d.title,
+        d.description,
+        ud.start_date,
+        ud.end_date
+    from diets d
+    join user_diets ud
+        on d.id = ud.diet_id
+    join users u
+        on u.id = ud.user_id
+    where u.id = :id
+        and ud.is_completed is false
+        and d.is_deleted = false
+        and ud.is_actual = true
+    """,
+)
+
+
+GET_DIET_ACTUAL_PREVIOUS = queries.register(
+    "diets.get_diet_actual_previous",
+    """
+    select
+        d.id,
+        ud.start_date,
+        ud.end_date
+    from diets d
+    join user_diets ud
+        on d.id = ud.diet_id
+    join users u
+        on u.id = ud.user_id
+    where u.id = :id
+        and ud.is_completed is false
+        and d.is_deleted = false
+        and ud.is_actual = true
+    """,
+)
+
+
+GET_DIET_BY_ID = queries.register(
+    "diets.get_diet_by_id",
+    """
+    select
+        d.id,
+        d.menu,
+        d.title,
+        d.description,
+        d.is_public,
+        d.months_valid,
+        d.user_id
+    from diets d
+    where d.id = :id
+        and d.is_deleted = false
+    """,
+)
+
+
+GET_QUANTITY_OF_FREE_DIETS = queries.register(
+    "diets.get_quantity_of_free_diets",
+    """
+    select count(id) as quantity
+    from diets
+    where is_public = true
+    and is_deleted = false
+    """,
+)
+
+
+GET_ALL_EXPIRING_DIETS = queries.register(
+    "diets.get_all_expiring_diets",
+    """
+    SELECT
+        d.id,
+        d.title,
+        d.description,
+        ud.user_id,
+        ud.diet_id,
+        (ud.end_date::DATE - CURRENT_DATE) AS days_remaining
+    FROM diets d
+    JOIN user_diets ud ON d.id = ud.diet_id
+    WHERE
+        d.user_id = :id
+        AND ud.user_id = ANY(:client_ids)
+        and d.is_deleted = false
+        AND ud.is_completed = false
+        AND ud.end_date::DATE BETWEEN CURRENT_DATE AND CURRENT_DATE + 7
+    """,
+)
+
+
+GET_NAME_LAST_DIET = queries.register(
+    "diets.get_name_last_diet",
+    """
+    select
+        d.id,
+        d.title,
+        ud.end_date
+    from diets d
+    join user_diets ud
+        on d.id = ud.diet_id
+    join users u
+        on u.id = ud.user_id
+    where u.id = :id
+          and ud.is_completed is true
+    order by ud.end_date desc
+    limit 1
+    """,
+)
+
+
+GET_ALL_FINISHED_DIETS = queries.register(
+    "diets.get_all_finished_diets",
+    """
+    select
+        d.id,
+        d.menu,
+        ud.start_date,
+        ud.end_date
+    from diets d
+    join user_diets ud
+        on d.id = ud.diet_id
+    join users u
+        on u.id = ud.user_id
+    where u.id = :id
+          and ud.is_completed is true
+    order by ud.end_date desc
+    """,
+)
+
+
+GET_DIETS_BY_PROFESSIONAL = queries.register(
+    "diets.get_diets_by_professional",
+    """
+    select
+        d.id,
+        d.title,
+        d.description
+    from diets d
+    join users u
+        on u.id = d.user_id
+    where d.is_public is true
+        and u.id = :id
+    """,
+)
+
+
+GET_ALL_FREE_DIETS = queries.register(
+    "diets.get_all_free_diets",
+    """
+    select
+        d.id,
+        d.title,
+        d.description
+    from diets d
+    where d.is_public = true
+        and d.is_deleted = false
+    """,
+)
+
+
+GET_PERIOD_DIET_BY_USER = queries.register(
+    "diets.get_period_diet_by_user",
+    """
+    select
+        d.id,
+        ud.start_date,
+        ud.end_date,
+        (
+            select jsonb_agg(elem->>'time_to_eat')
+            from jsonb_array_elements(d.menu) as elem
+        ) as horarios
+    from diets d
+    join user_diets ud
+        on d.id = ud.diet_id
+    join users u
+        on u.id = ud.user_id
+    where u.id = :id
+    and ud.is_completed is false
+    and d.is_deleted = false
+    and ud.is_actual = true
+    """,
+)
 
 
 class DietService:
@@ -25,74 +215,22 @@ class DietService:
         self._session = session
 
     async def get_diet_actual(self, user_id: int) -> list[DietData]:
-        query = text("""
-            select
-                d.id,
-                d.menu,
-                d.title,
-                d.description,
-                ud.start_date,
-                ud.end_date
-            from diets d
-            join user_diets ud
-                on d.id = ud.diet_id
-            join users u
-                on u.id = ud.user_id
-            where u.id = :id
-                and ud.is_completed is false
-                and d.is_deleted = false
-                and ud.is_actual = true
-        """).bindparams(bindparam("id", user_id))
-        result = await self._session.execute(query)
+        result = await GET_DIET_ACTUAL.execute(self._session, id=user_id)
         diets = result.fetchall()
         return [DietData(**diet._asdict()) for diet in diets]
 
     async def get_diet_actual_previous(self, user_id: int) -> list[ListDietActual]:
-        query = text("""
-            select
-                d.id,
-                ud.start_date,
-                ud.end_date
-            from diets d
-            join user_diets ud
-                on d.id = ud.diet_id
-            join users u
-                on u.id = ud.user_id
-            where u.id = :id
-                and ud.is_completed is false
-                and d.is_deleted = false
-                and ud.is_actual = true
-        """).bindparams(bindparam("id", user_id))
-        result = await self._session.execute(query)
+        result = await GET_DIET_ACTUAL_PREVIOUS.execute(self._session, id=user_id)
         diets = result.fetchall()
         return [ListDietActual(**diet._asdict()) for diet in diets]
 
     async def get_diet_by_id(self, diet_id: int) -> list[DietData]:
-        query = text("""
-            select
-                d.id,
-                d.menu,
-                d.title,
-                d.description,
-                d.is_public,
-                d.months_valid,
-                d.user_id
-            from diets d
-            where d.id = :id
-                and d.is_deleted = false
-        """).bindparams(bindparam("id", diet_id))
-        result = await self._session.execute(query)
+        result = await GET_DIET_BY_ID.execute(self._session, id=diet_id)
         diets = result.fetchall()
         return [DietData(**diet._asdict()) for diet in diets]
 
     async def get_quantity_of_free_diets(self) -> AllFreeDietQuantity:
-        query = text("""
-            select count(id) as quantity
-            from diets
-            where is_public = true
-            and is_deleted = false
-        """)
-        result = await self._session.execute(query)
+        result = await GET_QUANTITY_OF_FREE_DIETS.execute(self._session)
         quantity = result.fetchone()
         return (
             AllFreeDietQuantity(**quantity._asdict())
@@ -101,65 +239,22 @@ class DietService:
         )
 
     async def get_all_expiring_diets(self, user_id: int) -> list[AllExpiredDiets]:
-        query = text("""
-            SELECT
-                d.id,
-                d.title,
-                d.description,
-                ud.user_id,
-                ud.diet_id,
-                (ud.end_date::DATE - CURRENT_DATE) AS days_remaining
-            FROM diets d
-            JOIN user_diets ud ON d.id = ud.diet_id
-            JOIN user_relations ur ON ud.user_id = ur.user_id
-            WHERE
-                d.user_id = ur.professional_id
-                and d.is_deleted = false
-                AND ud.is_completed = false
-                AND ud.end_date::DATE BETWEEN CURRENT_DATE AND CURRENT_DATE + 7
-                AND ur.professional_id = :id
-        """).bindparams(bindparam("id", user_id))
-        result = await self._session.execute(query)
+        relations = await relationship_cache.relations(self._session, user_id)
+        if not relations.clients:
+            return []
+        result = await GET_ALL_EXPIRING_DIETS.execute(
+            self._session, id=user_id, client_ids=list(relations.clients)
+        )
         expiring_diets = result.fetchall()
         return [AllExpiredDiets(**diet._asdict()) for diet in expiring_diets]
 
     async def get_name_last_diet(self, user_id: int) -> list[LastFinishedDiet]:
-        query = text("""
-            select
-                d.id,
-                d.title,
-                ud.end_date
-            from diets d
-            join user_diets ud
-                on d.id = ud.diet_id
-            join users u
-                on u.id = ud.user_id
-            where u.id = :id
-                  and ud.is_completed is true
-            order by ud.end_date desc
-            limit 1
-        """).bindparams(bindparam("id", user_id))
-        result = await self._session.execute(query)
+        result = await GET_NAME_LAST_DIET.execute(self._session, id=user_id)
         diet = result.fetchall()
         return [LastFinishedDiet(**dict(diet)) for diet in diet]
 
     async def get_all_finished_diets(self, user_id: int) -> list[DietData]:
-        query = text("""
-            select
-                d.id,
-                d.menu,
-                ud.start_date,
-                ud.end_date
-            from diets d
-            join user_diets ud
-                on d.id = ud.diet_id
-            join users u
-                on u.id = ud.user_id
-            where u.id = :id
-                  and ud.is_completed is true
-            order by ud.end_date desc
-        """).bindparams(bindparam("id", user_id))
-        result = await self._session.execute(query)
+        result = await GET_ALL_FINISHED_DIETS.execute(self._session, id=user_id)
         diets = result.fetchall()
         return [DietData(**dict(diet)) for diet in diets]
 
@@ -168,7 +263,6 @@ class DietService:
         diet = Diets(**new_diet, user_id=user_id)
         self._session.add(diet)
         await self._session.flush()
-        await self._session.commit()
         if form_diet.start_date is not None and form_diet.user_id is not None:
             await self._create_user_diet(
                 form_diet.user_id,
@@ -186,42 +280,21 @@ class DietService:
         await self._session.execute(
             update(Diets).where(Diets.id == diet_id).values(**update_data)
         )
-        await self._session.commit()
 
     async def delete_diet(self, diet_id: int) -> None:
         await self._session.execute(
             update(Diets).where(Diets.id == diet_id).values(is_deleted=True)
         )
-        await self._session.commit()
 
     async def get_diets_by_professional(
         self, user_id: int
     ) -> list[DietsByProfissional]:
-        query = text("""
-            select
-                d.id,
-                d.title,
-                d.description
-            from diets d
-            join users u
-                on u.id = d.user_id
-            where d.is_public is true
-                and u.id = :id
-        """).bindparams(bindparam("id", user_id))
-        result = await self._session.execute(query)
+        result = await GET_DIETS_BY_PROFESSIONAL.execute(self._session, id=user_id)
         diets = result.fetchall()
         return [DietsByProfissional(**diet._asdict()) for diet in diets]
 
     async def get_all_free_diets(self) -> list[AllFreeDiets]:
-        query = text("""
-            select
-                d.id,
-                d.title,
-                d.description
-            from diets d
-            where d.is_public = true
-        """)
-        result = await self._session.execute(query)
+        result = await GET_ALL_FREE_DIETS.execute(self._session)
         diets = result.fetchall()
         return [AllFreeDiets(**diet._asdict()) for diet in diets]
 
@@ -236,36 +309,14 @@ class DietService:
         )
         self._session.add(user_diet)
         await self._session.flush()
-        await self._session.commit()
 
     async def get_period_diet_by_user(
         self, user_id: int
     ) -> DietPeriodCalendar | None:
-        query = text("""
-            select
-                d.id,
-                ud.start_date,
-                ud.end_date,
-                (
-                    select jsonb_agg(elem->>'time_to_eat')
-                    from jsonb_array_elements(d.menu::jsonb) as elem
-                ) as horarios
-            from diets d
-            join user_diets ud
-                on d.id = ud.diet_id
-            join users u
-                on u.id = ud.user_id
-            where u.id = :id
-            and ud.is_completed is false
-            and d.is_deleted = false
-            and ud.is_actual = true
-        """).bindparams(bindparam("id", user_id))
-        result = await self._session.execute(query)
+        result = await GET_PERIOD_DIET_BY_USER.execute(self._session, id=user_id)
         diet = result.fetchone()
         return DietPeriodCalendar(**diet._asdict()) if diet else None
 
     @staticmethod
     def __calcule_diet_end_date(start_date: datetime, months_valid: int) -> str:
         return start_date + relativedelta(months=months_valid)
-
-
@@ -1,13 +1,34 @@
 # -*- coding: utf-8 -*-
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import bindparam, delete, text, update
+from sqlalchemy.sql import delete, update
 
 from app.core.db_model import HealthGold
+from app.modules.query_registry import queries
 from app.schemas.healthGold import CreateHealthGold, UpdateHealthGold, HealthGoldSchema
 from app.schemas.user import UserInfo
 
 
+GET_HEALTH_GOLD_BY_ID = queries.register(
+    "healthGold.get_health_gold_by_id",
+    """
+    SELECT *
+    FROM health_goals
+    WHERE id = :gold_id
+    """,
+)
+
+
+GET_HEALTH_GOLD_BY_USER = queries.register(
+    "healthGold.get_health_gold_by_user",
+    """
+    SELECT *
+    FROM health_goals
+    WHERE user_id = :user_id
+    """,
+)
+
+
 class HealthGoldService:
     def __init__(self, session: AsyncSession, user: UserInfo) -> None:
         self._session = session
@@ -18,7 +39,6 @@ class HealthGoldService:
         new_health_gold = HealthGold(**form_data.model_dump(), user_id=self._user.id)
         self._session.add(new_health_gold)
         await self._session.flush()
-        await self._session.commit()
 
     async def update_health_gold(
         self, form_data: UpdateHealthGold, gold_id: int
@@ -41,13 +61,11 @@ class HealthGoldService:
         await self._session.execute(
             update(HealthGold).where(HealthGold.id == gold_id).values(**data_updated)
         )
-        await self._session.commit()
 
     async def delete_health_gold(self, gold_id: int) -> None:
         await self._session.execute(
             delete(HealthGold).where(HealthGold.id == gold_id)
         )
-        await self._session.commit()
 
     async def get_health_gold_by_user(self) -> list[HealthGoldSchema]:
         health_gold = await self._querys.get_health_gold_by_user(self._user.id)
@@ -65,23 +83,15 @@ class HealthGoldQuerys:
         self._session = session
 
     async def get_health_gold_by_id(self, gold_id: int) -> HealthGoldSchema | None:
-        query = text("""
-            SELECT *
-            FROM health_goals
-            WHERE id = :gold_id
-        """).bindparams(bindparam("gold_id", gold_id))
-        result = await self._session.execute(query)
+        result = await GET_HEALTH_GOLD_BY_ID.execute(self._session, gold_id=gold_id)
         health_gold = result.fetchone()
         if not health_gold:
             raise HTTPException(status_code=404, detail="Health Gold não encontrado")
         return HealthGoldSchema(**health_gold._asdict())
 
     async def get_health_gold_by_user(self, user_id: int) -> list[HealthGoldSchema]:
-        query = text("""
-            SELECT *
-            FROM health_goals
-            WHERE user_id = :user_id
-        """).bindparams(bindparam("user_id", user_id))
-        result = await self._session.execute(query)
+        result = await GET_HEALTH_GOLD_BY_USER.execute(
+            self._session, user_id=user_id
+        )
         health_gold = result.fetchall()
         return [HealthGoldSchema(**gold._asdict()) for gold in health_gold]
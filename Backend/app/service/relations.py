@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+from typing import NamedTuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import on_settings_reload, settings
+from app.dependency.database import REPLICA_SESSION
+from app.modules.cache import TTLCache
+from app.modules.common import after_commit
+from app.modules.query_registry import queries
+
+GET_USER_RELATIONS = queries.register(
+    "relations.get_user_relations",
+    """
+    SELECT user_id, professional_id
+    FROM user_relations
+    WHERE user_id = :user_id OR professional_id = :user_id
+    """,
+)
+
+
+GET_CHAT_MEMBERS = queries.register(
+    "relations.get_chat_members",
+    """
+    SELECT user_id FROM participants WHERE chat_id = :chat_id
+    """,
+)
+
+
+def _ttl(session: AsyncSession) -> float | None:
+    return (
+        settings.REPLICA_STICKINESS_SECONDS
+        if session.info.get(REPLICA_SESSION)
+        else None
+    )
+
+
+class Relations(NamedTuple):
+    clients: frozenset[int]
+    professionals: frozenset[int]
+
+    @property
+    def related(self) -> frozenset[int]:
+        return self.clients | self.professionals
+
+
+class RelationshipCache:
+    """Professional/client adjacency per user and participants per chat.
+
+    Misses load on the caller's session, so they never take a second pooled
+    connection. Entries read from the replica expire after
+    REPLICA_STICKINESS_SECONDS, the lag replica reads already accept. Writes
+    invalidate them once their transaction commits, and only in the worker
+    that made them: other workers see the change when their entries expire,
+    after at most RELATION_CACHE_TTL_SECONDS.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._relations: TTLCache[int, Relations] = TTLCache(
+            "relations", maxsize, ttl
+        )
+        self._members: TTLCache[int, frozenset[int]] = TTLCache(
+            "chat_members", maxsize, ttl
+        )
+
+    async def relations(self, session: AsyncSession, user_id: int) -> Relations:
+        relations = self._relations.get(user_id)
+        if relations is None:
+            version = self._relations.version
+            result = await GET_USER_RELATIONS.execute(session, user_id=user_id)
+            rows = result.fetchall()
+            relations = Relations(
+                clients=frozenset(
+                    row.user_id for row in rows if row.professional_id == user_id
+                ),
+                professionals=frozenset(
+                    row.professional_id for row in rows if row.user_id == user_id
+                ),
+            )
+            self._relations.set(user_id, relations, version, _ttl(session))
+        return relations
+
+    async def members(self, session: AsyncSession, chat_id: int) -> frozenset[int]:
+        members = self._members.get(chat_id)
+        if members is None:
+            version = self._members.version
+            result = await GET_CHAT_MEMBERS.execute(session, chat_id=chat_id)
+            members = frozenset(result.scalars())
+            # Unknown chats are not cached: the id may be created next.
+            if members:
+                self._members.set(chat_id, members, version, _ttl(session))
+        return members
+
+    def invalidate_relation(
+        self, session: AsyncSession, user_id: int, professional_id: int
+    ) -> None:
+        def invalidate() -> None:
+            self._relations.invalidate(user_id)
+            self._relations.invalidate(professional_id)
+
+        after_commit(session, invalidate)
+
+    def invalidate_chat(self, session: AsyncSession, chat_id: int) -> None:
+        after_commit(session, lambda: self._members.invalidate(chat_id))
+
+    def configure(self, maxsize: int, ttl: float) -> None:
+        self._relations.configure(maxsize, ttl)
+        self._members.configure(maxsize, ttl)
+
+
+relationship_cache = RelationshipCache(
+    settings.RELATION_CACHE_SIZE, settings.RELATION_CACHE_TTL_SECONDS
+)
+
+
+@on_settings_reload
+def _reload_relationship_cache(changed: set[str]) -> None:
+    if changed & {"RELATION_CACHE_SIZE", "RELATION_CACHE_TTL_SECONDS"}:
+        relationship_cache.configure(
+            settings.RELATION_CACHE_SIZE, settings.RELATION_CACHE_TTL_SECONDS
+        )
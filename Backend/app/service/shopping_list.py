@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import bindparam, delete, text
+from sqlalchemy.sql import delete
 
 from app.core.db_model import ShoppingList
+from app.modules.query_registry import queries
 from app.schemas.shopping_list import (
     CreateShoppingList,
     ListShoppingPreviouns,
@@ -11,6 +12,66 @@ from app.schemas.shopping_list import (
 )
 from app.schemas.user import UserInfo
 
+GET_SHOPPING_LIST_ACTUAL_PREVIOUS = queries.register(
+    "shopping_list.get_shopping_list_actual_previous",
+    """
+    SELECT
+            id,
+            title,
+            last_update
+        FROM shopping_lists
+        WHERE user_id = :user_id
+        ORDER BY create_date DESC
+        LIMIT 1
+    """,
+)
+
+
+GET_SHOPPING_LIST_ACTUAL = queries.register(
+    "shopping_list.get_shopping_list_actual",
+    """
+    SELECT
+            id,
+            diet_id,
+            title,
+            last_update,
+            list as options
+        FROM shopping_lists
+        WHERE user_id = :user_id
+        ORDER BY create_date DESC
+        LIMIT 1
+    """,
+)
+
+
+GET_ALL_SHOPPING_LISTS = queries.register(
+    "shopping_list.get_all_shopping_lists",
+    """
+    SELECT
+            id,
+            title,
+            last_update
+        FROM shopping_lists
+        WHERE user_id = :user_id
+        ORDER BY last_update DESC
+    """,
+)
+
+
+GET_SHOPPING_LIST_BY_ID = queries.register(
+    "shopping_list.get_shopping_list_by_id",
+    """
+    SELECT
+            id,
+            diet_id,
+            title,
+            last_update,
+            options
+        FROM shopping_lists
+        WHERE id = :shopping_list_id
+    """,
+)
+
 
 class ShoppingListService:
     def __init__(self, session: AsyncSession, user: UserInfo) -> None:
@@ -29,21 +90,11 @@ class ShoppingListService:
         print(shopping_list)
         self._session.add(shopping_list)
         await self._session.flush()
-        await self._session.commit()
 
     async def get_shopping_list_actual_previous(self) -> list[ListShoppingPreviouns]:
-        query = text(
-            """SELECT
-                id,
-                title,
-                last_update
-            FROM shopping_lists
-            WHERE user_id = :user_id
-            ORDER BY create_date DESC
-            LIMIT 1
-            """
-        ).bindparams(bindparam("user_id", self._user.id))
-        result = await self._session.execute(query)
+        result = await GET_SHOPPING_LIST_ACTUAL_PREVIOUS.execute(
+            self._session, user_id=self._user.id
+        )
         shopping_list = result.fetchall()
         return [
             ListShoppingPreviouns(**shopping_list._asdict())
@@ -51,20 +102,9 @@ class ShoppingListService:
         ]
 
     async def get_shopping_list_actual(self) -> list[ShoppingListData]:
-        query = text(
-            """SELECT
-                id,
-                diet_id,
-                title,
-                last_update,
-                list as options
-            FROM shopping_lists
-            WHERE user_id = :user_id
-            ORDER BY create_date DESC
-            LIMIT 1
-            """
-        ).bindparams(bindparam("user_id", self._user.id))
-        result = await self._session.execute(query)
+        result = await GET_SHOPPING_LIST_ACTUAL.execute(
+            self._session, user_id=self._user.id
+        )
         shopping_list = result.fetchall()
         return [
             ShoppingListData(**shopping_list._asdict())
@@ -72,17 +112,9 @@ class ShoppingListService:
         ]
 
     async def get_all_shopping_lists(self) -> list[ListShoppingPreviouns]:
-        query = text(
-            """SELECT
-                id,
-                title,
-                last_update
-            FROM shopping_lists
-            WHERE user_id = :user_id
-            ORDER BY last_update DESC
-            """
-        ).bindparams(bindparam("user_id", self._user.id))
-        result = await self._session.execute(query)
+        result = await GET_ALL_SHOPPING_LISTS.execute(
+            self._session, user_id=self._user.id
+        )
         shopping_list = result.fetchall()
         return [
             ListShoppingPreviouns(**shopping_list._asdict())
@@ -93,23 +125,13 @@ class ShoppingListService:
         await self._session.execute(
             delete(ShoppingList).where(ShoppingList.id == shopping_list_id)
         )
-        await self._session.commit()
 
     async def get_shopping_list_by_id(
         self, shopping_list_id: int
     ) -> ShoppingListData:
-        query = text(
-            """SELECT
-                id,
-                diet_id,
-                title,
-                last_update,
-                options
-            FROM shopping_lists
-            WHERE id = :shopping_list_id
-            """
-        ).bindparams(bindparam("shopping_list_id", shopping_list_id))
-        result = await self._session.execute(query)
+        result = await GET_SHOPPING_LIST_BY_ID.execute(
+            self._session, shopping_list_id=shopping_list_id
+        )
 
         shopping_list = result.fetchone()
         if not shopping_list:
@@ -2,109 +2,263 @@
 from datetime import datetime
 
 from fastapi import HTTPException, UploadFile
-from sqlalchemy.engine import CursorResult
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import bindparam, delete, text, update
+from sqlalchemy.sql import delete, update
 
-from app.core.db_model import User, UserPoints, UserPost, UserRelations
+from app.config.settings import on_settings_reload, settings
+from app.core.db_model import (
+    RefreshToken,
+    User,
+    UserPoints,
+    UserPost,
+    UserRelations,
+)
+from app.modules.cache import TTLCache
+from app.modules.common import after_commit
+from app.modules.query_registry import queries
+from app.modules.security import password_manager
+from app.modules.token_versions import (
+    TOKEN_VERSION_CHANNEL,
+    token_version_payload,
+    token_versions,
+)
 from app.schemas.user import (
     ClientInfo,
     CreateUser,
     CreateUserPostSuggestion,
     CreateUserPublication,
+    Principal,
     RankingPoints,
     UpdateUser,
     UserDetail,
     UserInfo,
     UserLogin,
-    UserPublication
+    UserPublication,
+)
+from app.service.relations import relationship_cache
+from app.service.utils import image_saver
+
+principal_cache: TTLCache[int, Principal] = TTLCache(
+    "principal",
+    settings.PRINCIPAL_CACHE_SIZE,
+    settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+@on_settings_reload
+def _reload_principal_cache(changed: set[str]) -> None:
+    if changed & {"PRINCIPAL_CACHE_SIZE", "PRINCIPAL_CACHE_TTL_SECONDS"}:
+        principal_cache.configure(
+            settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL_SECONDS
+        )
+
+
+# Delivered to the listeners only when the request's transaction commits.
+NOTIFY_TOKEN_VERSION = queries.register(
+    "user.notify_token_version",
+    """
+    SELECT pg_notify(:channel, :payload)
+    """,
+)
+
+
+GET_USER_BY_CPF = queries.register(
+    "user.get_user_by_cpf",
+    """
+    SELECT
+            id,
+            email,
+            user_profile,
+            "name"
+        FROM users
+        WHERE cpf = :cpf
+    """,
+)
+
+
+GET_USER_BY_EMAIL = queries.register(
+    "user.get_user_by_email",
+    """
+    SELECT
+            id,
+            password,
+            "name",
+            user_profile,
+            email,
+            is_active,
+            token_version
+        FROM users
+        WHERE email = :email
+    """,
+)
+
+
+GET_USER_BY_ID = queries.register(
+    "user.get_user_by_id",
+    """
+    SELECT
+            id,
+            email,
+            user_profile,
+            "name"
+        FROM users
+        WHERE id = :id
+    """,
 )
-from app.service.utils import ImageSaver
 
 
-class UserService:
+GET_PRINCIPAL = queries.register(
+    "user.get_principal",
+    """
+    SELECT
+            id,
+            email,
+            user_profile,
+            "name",
+            token_version
+        FROM users
+        WHERE id = :id AND is_active = true
+    """,
+)
+
+
+GET_CLIENTS_FOR_PROFESSIONAL = queries.register(
+    "user.get_clients_for_professional",
+    """
+    select
+            u.id,
+            u."name",
+            u.cpf,
+            u.email
+        from users u
+        where u.id = ANY(:client_ids)
+    """,
+)
+
+
+GET_USER_DETAILS = queries.register(
+    "user.get_user_details",
+    """
+    SELECT
+            u.id AS user_id,
+            u."name",
+            ut.id AS user_training_id,
+            ud.id AS user_diets_id
+        FROM users u
+        LEFT JOIN user_diets ud
+            ON u.id = ud.user_id
+            AND ud.is_completed = TRUE
+        LEFT JOIN user_trainings ut
+            ON u.id = ut.user_id
+            AND ut.is_completed = TRUE
+        WHERE u.id = :id
+        ORDER BY ud.end_date DESC NULLS LAST, ut.end_date DESC NULLS LAST
+    """,
+)
+
+
+GET_RANKING_POINTS = queries.register(
+    "user.get_ranking_points",
+    """
+    SELECT
+            u.id,
+            u."name",
+            up.points
+        FROM users u
+        JOIN user_points up
+        ON u.id = up.user_id
+        ORDER BY up.points DESC
+    """,
+)
+
+
+GET_PUBLICATIONS_PROGRESS = queries.register(
+    "user.get_publications_progress",
+    """
+    select
+            up.id,
+            up.user_id,
+            up."content",
+            up.image_urls,
+            up.create_date,
+            u."name" AS user_name
+        FROM user_progress_posts  up
+        JOIN users u ON up.user_id = u.id
+        WHERE up.is_private  = false
+            and type_post = 1
+        ORDER BY up.create_date  DESC
+    """,
+)
+
+
+GET_PUBLICATIONS_SUGGESTIONS = queries.register(
+    "user.get_publications_suggestions",
+    """
+    select
+            up.id,
+            up.user_id,
+            up."content",
+            up.image_urls,
+            up.create_date,
+            u."name" AS user_name
+        FROM user_progress_posts  up
+        JOIN users u ON up.user_id = u.id
+        WHERE up.is_private  = false
+            and type_post = 2
+        ORDER BY up.create_date  DESC
+    """,
+)
+
+
+# Backs every /user endpoint plus the auth lookups; the writes that must drop
+# cached principals stay together with the reads that fill the cache.
+class UserService:  # noqa: PLR0904
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
-        self._image_saver = ImageSaver()
+        self._image_saver = image_saver
+        self._pwd_manager = password_manager
 
     async def get_user_by_cpf(self, cpf: str) -> UserInfo | None:
-        query = text(
-            """SELECT
-                id,
-                email,
-                user_profile,
-                "name"
-            FROM users
-            WHERE cpf = :cpf
-        """
-        ).bindparams(bindparam("cpf", cpf))
-        result: CursorResult = await self._session.execute(query)  # type: ignore[type-arg, assignment]
+        result = await GET_USER_BY_CPF.execute(self._session, cpf=cpf)
         user = result.fetchone()
         return UserInfo(**user._asdict()) if user else None
 
     async def get_user_by_email(self, email: str) -> UserLogin | None:
-        query = text(
-            """SELECT
-                id,
-                password
-            FROM users
-            WHERE email = :email"""
-        ).bindparams(bindparam("email", email))
-        result: CursorResult = await self._session.execute(query)  # type: ignore[type-arg, assignment]
+        result = await GET_USER_BY_EMAIL.execute(self._session, email=email)
         user = result.fetchone()
         return UserLogin(**user._asdict()) if user else None
 
     async def get_user_by_id(self, user_id: int) -> UserInfo | None:
-        query = text(
-            """SELECT
-                id,
-                email,
-                user_profile,
-                "name"
-            FROM users
-            WHERE id = :id
-        """
-        ).bindparams(bindparam("id", user_id))
-        result: CursorResult = await self._session.execute(query)  # type: ignore[type-arg, assignment]
+        result = await GET_USER_BY_ID.execute(self._session, id=user_id)
         user = result.fetchone()
         return UserInfo(**user._asdict()) if user else None
 
+    async def get_principal(self, user_id: int) -> Principal | None:
+        principal = principal_cache.get(user_id)
+        if principal is None:
+            version = principal_cache.version
+            result = await GET_PRINCIPAL.execute(self._session, id=user_id)
+            row = result.fetchone()
+            if not row:
+                return None
+            data = row._asdict()
+            token_version = data.pop("token_version")
+            principal = Principal(user=UserInfo(**data), token_version=token_version)
+            principal_cache.set(user_id, principal, version)
+        return principal
+
     async def get_clients_for_professional(self, user_id: int) -> list[ClientInfo]:
-        query = text(
-            """select
-                    u.id,
-                    u."name",
-                    u.cpf,
-                    u.email
-                from users u
-                join user_relations ur
-                on ur.user_id = u.id
-                where ur.professional_id = :professional_id
-            """
-        ).bindparams(bindparam("professional_id", user_id))
-        result: CursorResult = await self._session.execute(query)
+        relations = await relationship_cache.relations(self._session, user_id)
+        if not relations.clients:
+            return []
+        result = await GET_CLIENTS_FOR_PROFESSIONAL.execute(
+            self._session, client_ids=list(relations.clients)
+        )
         clients = result.fetchall()
         return [ClientInfo(**client._asdict()) for client in clients]
 
     async def get_user_details(self, user_id: int) -> UserDetail:
-        query = text(
-            """SELECT
-                    u.id AS user_id,
-                    u."name",
-                    ut.id AS user_training_id,
-                    ud.id AS user_diets_id
-                FROM users u
-                LEFT JOIN user_diets ud
-                    ON u.id = ud.user_id
-                    AND ud.is_completed = TRUE
-                LEFT JOIN user_trainings ut
-                    ON u.id = ut.user_id
-                    AND ut.is_completed = TRUE
-                WHERE u.id = :id
-                ORDER BY ud.end_date DESC NULLS LAST, ut.end_date DESC NULLS LAST
-"""
-        ).bindparams(bindparam("id", user_id))
-        result: CursorResult = await self._session.execute(query)
+        result = await GET_USER_DETAILS.execute(self._session, id=user_id)
         user = result.fetchone()
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -127,14 +281,15 @@ class UserService:
         user_points = UserPoints(user_id=user_id)
         self._session.add(user_points)
         await self._session.flush()
-        await self._session.commit()
 
     async def _create_user_record(self, form_user: CreateUser) -> User:
         user_data = form_user.model_dump(exclude={"professional_id"})
+        user_data["password"] = await self._pwd_manager.password_hash(
+            form_user.password
+        )
         user = User(**user_data)
         self._session.add(user)
         await self._session.flush()
-        await self._session.commit()
         return user
 
     async def _create_user_relation(
@@ -145,15 +300,23 @@ class UserService:
         )
         self._session.add(user_relation)
         await self._session.flush()
-        await self._session.commit()
+        relationship_cache.invalidate_relation(
+            self._session, user_id, professional_id
+        )
 
     async def disable_user(self, user_id: int) -> None:
-        await self._session.execute(
+        result = await self._session.execute(
             update(User)
             .where(User.id == user_id)
-            .values(is_active=False, last_update=datetime.now())
+            .values(
+                is_active=False,
+                last_update=datetime.now(),
+                token_version=User.token_version + 1,
+            )
+            .returning(User.token_version)
         )
-        await self._session.commit()
+        await self._revoke_access_tokens(user_id, result.scalar_one())
+        await self._revoke_refresh_tokens(user_id)
 
     async def update_user(self, user_id: int, form_user: UpdateUser) -> None:
         user = await self.get_user_by_cpf(form_user.cpf) if form_user.cpf else None
@@ -164,19 +327,57 @@ class UserService:
             for key, value in form_user.model_dump().items()
             if value is not None
         }
+        if form_user.password:
+            update_data["password"] = await self._pwd_manager.password_hash(
+                form_user.password
+            )
+        # Tokens carry the user's data, so any change revokes them.
+        result = await self._session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(**update_data, token_version=User.token_version + 1)
+            .returning(User.token_version)
+        )
+        await self._revoke_access_tokens(user_id, result.scalar_one())
+        if form_user.password:
+            await self._revoke_refresh_tokens(user_id)
+
+    async def _revoke_access_tokens(self, user_id: int, token_version: int) -> None:
+        await NOTIFY_TOKEN_VERSION.execute(
+            self._session,
+            channel=TOKEN_VERSION_CHANNEL,
+            payload=token_version_payload(user_id, token_version),
+        )
+
+        def revoke() -> None:
+            # This worker's own NOTIFY arrives later; no need to wait for it.
+            token_versions.bump(user_id, token_version)
+            principal_cache.invalidate(user_id)
+
+        after_commit(self._session, revoke)
+
+    async def _revoke_refresh_tokens(self, user_id: int) -> None:
         await self._session.execute(
-            update(User).where(User.id == user_id).values(**update_data)
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user_id)
+            .values(revoked=True)
+        )
+
+    async def update_password_hash(self, user_id: int, hashed: str) -> None:
+        await self._session.execute(
+            update(User).where(User.id == user_id).values(password=hashed)
         )
-        await self._session.commit()
 
     async def delete_relation(self, user_id: int, professional_id: int) -> None:
         await self._session.execute(
             delete(UserRelations).where(
-                UserRelations.user_id == user_id
-                and UserRelations.professional_id == professional_id
+                UserRelations.user_id == user_id,
+                UserRelations.professional_id == professional_id,
             )
         )
-        await self._session.commit()
+        relationship_cache.invalidate_relation(
+            self._session, user_id, professional_id
+        )
 
     async def _validate_user_uniqueness(self, form_user: CreateUser) -> None:
         if await self.get_user_by_email(form_user.email):
@@ -185,18 +386,7 @@ class UserService:
             raise HTTPException(status_code=400, detail="CPF already in use")
 
     async def get_ranking_points(self) -> list[RankingPoints]:
-        query = text(
-            """SELECT
-                    u.id,
-                    u."name",
-                    up.points
-                FROM users u
-                JOIN user_points up
-                ON u.id = up.user_id
-                ORDER BY up.points DESC
-            """
-        )
-        result: CursorResult = await self._session.execute(query)
+        result = await GET_RANKING_POINTS.execute(self._session)
         ranking = result.fetchall()
         return [RankingPoints(**user._asdict()) for user in ranking]
 
@@ -218,7 +408,6 @@ class UserService:
         )
         self._session.add(user_publication)
         await self._session.flush()
-        await self._session.commit()
 
     async def create_user_publication_suggestions(
         self, user_id: int, publication: CreateUserPostSuggestion
@@ -229,45 +418,14 @@ class UserService:
         )
         self._session.add(user_publication)
         await self._session.flush()
-        await self._session.commit()
 
     async def get_publications_progress(self)-> list[UserPublication]:
-        query = text(
-            """select
-                    up.id,
-                    up.user_id,
-                    up."content",
-                    up.image_urls,
-                    up.create_date,
-                    u."name" AS user_name
-                FROM user_progress_posts  up
-                JOIN users u ON up.user_id = u.id
-                WHERE up.is_private  = false
-                    and type_post = 1
-                ORDER BY up.create_date  DESC
-            """
-        )
-        result: CursorResult = await self._session.execute(query)
+        result = await GET_PUBLICATIONS_PROGRESS.execute(self._session)
         publications = result.fetchall()
         return [UserPublication(**pub._asdict()) for pub in publications]
     
     async def get_publications_suggestions(self) -> list[UserPublication]:
-        query = text(
-            """select
-                    up.id,
-                    up.user_id,
-                    up."content",
-                    up.image_urls,
-                    up.create_date,
-                    u."name" AS user_name
-                FROM user_progress_posts  up
-                JOIN users u ON up.user_id = u.id
-                WHERE up.is_private  = false
-                    and type_post = 2
-                ORDER BY up.create_date  DESC
-            """
-        )
-        result: CursorResult = await self._session.execute(query)
+        result = await GET_PUBLICATIONS_SUGGESTIONS.execute(self._session)
         publications = result.fetchall()
         return [UserPublication(**pub._asdict()) for pub in publications]
 
@@ -275,10 +433,8 @@ class UserService:
         await self._session.execute(
             delete(UserPost).where(UserPost.id == publication_id)
         )
-        await self._session.commit()
     
     async def delete_publication_suggestion(self, publication_id: int) -> None:
         await self._session.execute(
             delete(UserPost).where(UserPost.id == publication_id)
         )
-        await self._session.commit()
\ No newline at end of file
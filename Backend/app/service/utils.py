@@ -5,10 +5,12 @@ from fastapi import UploadFile
 class ImageSaver:
     def __init__(self, folder: str = "app/static/uploads"):
         self.folder = folder
-        os.makedirs(self.folder, exist_ok=True)
         self._base_url = "http://10.0.2.2:8000/user/image/"
     
     async def save_image(self, image: UploadFile) -> str:
+        # Criada só quando há upload, não a cada serviço instanciado
+        os.makedirs(self.folder, exist_ok=True)
+
         # Gera um nome único para evitar sobrescrever arquivos existentes
         unique_filename = f"{uuid.uuid4().hex}_{image.filename}"
         
@@ -19,4 +21,7 @@ class ImageSaver:
             f.write(contents)
             
         # Retorna a URL completa que o Expo pode acessar
-        return f"{self._base_url}{unique_filename}"
\ No newline at end of file
+        return f"{self._base_url}{unique_filename}"
+
+
+image_saver = ImageSaver()
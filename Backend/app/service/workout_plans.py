@@ -1,11 +1,13 @@
 # -*- coding: utf-8 -*-
+import json
 from datetime import datetime
 
 from dateutil.relativedelta import relativedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import bindparam, delete, select, text, update
+from sqlalchemy.sql import delete, select, update
 
 from app.core.db_model import UserTraining, WorkoutPlans
+from app.modules.query_registry import queries
 from app.schemas.workout_plans import (
     ActualWorkoutPlanPrevious,
     AllFreeWorkoutPlanQuantity,
@@ -18,6 +20,147 @@ from app.schemas.workout_plans import (
     WorkoutPlanData,
     WorkoutPlanCalendar,
 )
+from app.service.relations import relationship_cache
+
+
+GET_WORKOUT_PLAN_ACTUAL = queries.register(
+    "workout_plans.get_workout_plan_actual",
+    """
+    select
+        wp.id,
+        wp.plans,
+        wp.title,
+        wp.description,
+        ut.start_date,
+        ut.end_date,
+        ut.time_to_workout,
+        ut.daily_training,
+        ut.completed_days,
+        ut.last_update,
+        wp.type
+    from workout_plans wp
+    join user_trainings ut
+        on ut.workout_plan_id = wp.id
+    join users u
+        on u.id = ut.user_id
+    where u.id = :id
+    and ut.is_completed = false
+    and ut.is_actual = true
+    """,
+)
+
+
+GET_ALL_EXPIRING_WORKOUT_PLANS = queries.register(
+    "workout_plans.get_all_expiring_workout_plans",
+    """
+    select
+        wp.id,
+        wp.title,
+        ut.user_id,
+        wp.id as workout_id
+    from workout_plans wp
+    join user_trainings ut
+        on ut.workout_plan_id = wp.id
+    where wp.user_id = :id
+    and ut.user_id = ANY(:client_ids)
+    and ut.is_completed = false
+    and ut.end_date::DATE BETWEEN CURRENT_DATE AND CURRENT_DATE + 7
+    """,
+)
+
+
+GET_NAME_OF_LAST_FINISHED_WORKOUT_PLAN = queries.register(
+    "workout_plans.get_name_of_last_finished_workout_plan",
+    """
+    select
+        wp.id,
+        wp.title,
+        ut.end_date
+    from workout_plans wp
+    join user_trainings ut
+        on ut.workout_plan_id = wp.id
+    where ut.user_id = :id
+    and ut.end_date < now()
+    order by ut.end_date desc
+    limit 1
+    """,
+)
+
+
+GET_ALL_FREE_WORKOUT_PLANS = queries.register(
+    "workout_plans.get_all_free_workout_plans",
+    """
+    select
+        wp.id,
+        wp.title,
+        wp.description,
+        u."name" as professional_name
+    from workout_plans wp
+    join users u on u.id = wp.user_id
+    where wp.is_public = true
+    """,
+)
+
+
+SEARCH_FREE_WORKOUT_PLANS = queries.register(
+    "workout_plans.search_free_workout_plans",
+    """
+    select
+        wp.id,
+        wp.title,
+        wp.description,
+        u."name" as professional_name
+    from workout_plans wp
+    join users u on u.id = wp.user_id
+    where wp.is_public = true
+        and wp.plans @> cast(:contains as jsonb)
+    """,
+)
+
+
+GET_WORKOUT_PLAN_BY_PROFESSIONAL = queries.register(
+    "workout_plans.get_workout_plan_by_professional",
+    """
+    select
+        wp.id,
+        wp.title,
+        wp.description
+    from workout_plans wp
+    where wp.user_id = :id
+    and wp.is_public = true
+    """,
+)
+
+
+GET_PERIOD_WORKOUT_PLAN_BY_USER_ID = queries.register(
+    "workout_plans.get_period_workout_plan_by_user_id",
+    """
+    select
+        wp.id,
+        ut.start_date,
+        ut.end_date,
+        ut.time_to_workout,
+        wp.days_per_week
+    from workout_plans wp
+    join user_trainings ut
+        on ut.workout_plan_id = wp.id
+    join users u
+        on u.id = ut.user_id
+    where u.id = :id
+    and ut.is_completed = false
+    and ut.is_actual = true
+    """,
+)
+
+
+COUNT_FREE_WORKOUT_PLANS = queries.register(
+    "workout_plans.count_free_workout_plans",
+    """
+    select count(*)
+    from workout_plans wp
+    where wp.is_public = true
+    """,
+)
 
 
 class WorkoutPlanService:
@@ -26,29 +169,7 @@ class WorkoutPlanService:
         self._query = WorkoutPlanQuerys(session)
 
     async def get_workout_plan_actual(self, user_id: int) -> WorkoutPlanData | None:
-        query = text("""
-            select
-                wp.id,
-                wp.plans,
-                wp.title,
-                wp.description,
-                ut.start_date,
-                ut.end_date,
-                ut.time_to_workout,
-                ut.daily_training,
-                ut.completed_days,
-                ut.last_update,
-                wp.type
-            from workout_plans wp
-            join user_trainings ut
-                on ut.workout_plan_id = wp.id
-            join users u
-                on u.id = ut.user_id
-            where u.id = :id
-            and ut.is_completed = false
-            and ut.is_actual = true
-        """).bindparams(bindparam("id", user_id))
-        result = await self._session.execute(query)
+        result = await GET_WORKOUT_PLAN_ACTUAL.execute(self._session, id=user_id)
         workout_plans = result.fetchone()
         return WorkoutPlanData(**workout_plans._asdict()) if workout_plans else None
 
@@ -78,23 +199,12 @@ class WorkoutPlanService:
     async def get_all_expiring_workout_plans(
         self, user_id: int
     ) -> list[ExpiringWorkoutPlans]:
-        query = text("""
-            select
-                wp.id,
-                wp.title,
-                ut.user_id,
-                wp.id as workout_id
-            from workout_plans wp
-            join user_trainings ut
-                on ut.workout_plan_id = wp.id
-            join user_relations ur
-                on ur.user_id = ut.user_id
-            where wp.user_id = ur.professional_id
-            and ut.is_completed = false
-            and ut.end_date::DATE BETWEEN CURRENT_DATE AND CURRENT_DATE + 7
-            and ur.professional_id = :id
-        """).bindparams(bindparam("id", user_id))
-        result = await self._session.execute(query)
+        relations = await relationship_cache.relations(self._session, user_id)
+        if not relations.clients:
+            return []
+        result = await GET_ALL_EXPIRING_WORKOUT_PLANS.execute(
+            self._session, id=user_id, client_ids=list(relations.clients)
+        )
         workout_plans = result.fetchall()
         return [
             ExpiringWorkoutPlans(**workout_plan._asdict())
@@ -104,20 +214,9 @@ class WorkoutPlanService:
     async def get_name_of_last_finished_workout_plan(
         self, user_id: int
     ) -> list[LastFinishedWorkoutPlan]:
-        query = text("""
-            select
-                wp.id,
-                wp.title,
-                ut.end_date
-            from workout_plans wp
-            join user_trainings ut
-                on ut.workout_plan_id = wp.id
-            where ut.user_id = :id
-            and ut.end_date < now()
-            order by ut.end_date desc
-            limit 1
-        """).bindparams(bindparam("id", user_id))
-        result = await self._session.execute(query)
+        result = await GET_NAME_OF_LAST_FINISHED_WORKOUT_PLAN.execute(
+            self._session, id=user_id
+        )
         workout_plan = result.fetchall()
         return [
             LastFinishedWorkoutPlan(**dict(workout_plan))
@@ -125,36 +224,39 @@ class WorkoutPlanService:
         ]
 
     async def get_all_free_workout_plans(self) -> list[PreviousWorkoutPlan]:
-        query = text("""
-            select
-                wp.id,
-                wp.title,
-                wp.description,
-                u."name" as professional_name
-            from workout_plans wp
-            join users u on u.id = wp.user_id
-            where wp.is_public = true
-        """)
-        result = await self._session.execute(query)
+        result = await GET_ALL_FREE_WORKOUT_PLANS.execute(self._session)
         workout_plans = result.fetchall()
         return [
             PreviousWorkoutPlan(**workout_plan._asdict())
             for workout_plan in workout_plans
         ]
 
+    async def search_free_workout_plans(
+        self, exercise: str | None, muscle_group: str | None
+    ) -> list[PreviousWorkoutPlan]:
+        criteria = {
+            key: value
+            for key, value in (("name", exercise), ("muscle_group", muscle_group))
+            if value
+        }
+        if not criteria:
+            return await self.get_all_free_workout_plans()
+        # Both criteria must match the same exercise of some plan; the
+        # containment is answered by the GIN index on plans.
+        result = await SEARCH_FREE_WORKOUT_PLANS.execute(
+            self._session, contains=json.dumps([{"exercises": [criteria]}])
+        )
+        return [
+            PreviousWorkoutPlan(**workout_plan._asdict())
+            for workout_plan in result.fetchall()
+        ]
+
     async def get_workout_plan_by_professional(
         self, user_id: int
     ) -> list[PreviousWorkoutPlan]:
-        query = text("""
-            select
-                wp.id,
-                wp.title,
-                wp.description
-            from workout_plans wp
-            where wp.user_id = :id
-            and wp.is_public = true
-        """).bindparams(bindparam("id", user_id))
-        result = await self._session.execute(query)
+        result = await GET_WORKOUT_PLAN_BY_PROFESSIONAL.execute(
+            self._session, id=user_id
+        )
         workout_plans = result.fetchall()
         return [
             PreviousWorkoutPlan(**workout_plan._asdict())
@@ -170,7 +272,6 @@ class WorkoutPlanService:
         new_workout_plan = WorkoutPlans(**workout_plan_data, user_id=user_id)
         self._session.add(new_workout_plan)
         await self._session.flush()
-        await self._session.commit()
         print(new_workout_plan.id)
         print(workout_plan.start_date)
         print(workout_plan.time_to_workout)
@@ -200,13 +301,11 @@ class WorkoutPlanService:
             .where(WorkoutPlans.id == workout_plan_id)
             .values(**update_data)
         )
-        await self._session.commit()
 
     async def delete_workout_plan(self, workout_plan_id: int) -> None:
         await self._session.execute(
             delete(WorkoutPlans).where(WorkoutPlans.id == workout_plan_id)
         )
-        await self._session.commit()
 
     async def _create_user_training(
         self,
@@ -232,7 +331,6 @@ class WorkoutPlanService:
         )
         self._session.add(new_user_training)
         await self._session.flush()
-        await self._session.commit()
 
     async def finish_daily_training(self, user_id: int, daily_training: int) -> None:
         workout_plan = await self._query.get_actual_workout_plan_by_user_id(user_id)
@@ -261,7 +359,6 @@ class WorkoutPlanService:
                 is_actual=progress < 100.0,
             )
         )
-        await self._session.commit()
     
     async def get_period_workout_plan(
         self, user_id: int
@@ -341,13 +438,7 @@ class WorkoutPlanQuerys:
         return result.scalar_one_or_none()
 
     async def get_quantity_of_free_workout_plans(self) -> int:
-        result = await self._session.execute(
-            text("""
-            select count(*)
-            from workout_plans wp
-            where wp.is_public = true
-        """)
-        )
+        result = await COUNT_FREE_WORKOUT_PLANS.execute(self._session)
         return result.scalar() if result else 0
 
     async def get_actual_workout_plan_previous(
@@ -368,22 +459,8 @@ class WorkoutPlanQuerys:
     async def get_period_workout_plan_by_user_id(
         self, user_id: int
     ) -> WorkoutPlanCalendar:
-        query = text("""
-            select
-                wp.id,
-                ut.start_date,
-                ut.end_date,
-                ut.time_to_workout,
-                wp.days_per_week
-            from workout_plans wp
-            join user_trainings ut
-                on ut.workout_plan_id = wp.id
-            join users u
-                on u.id = ut.user_id
-            where u.id = :id
-            and ut.is_completed = false
-            and ut.is_actual = true
-        """).bindparams(bindparam("id", user_id))
-        result = await self._session.execute(query)
+        result = await GET_PERIOD_WORKOUT_PLAN_BY_USER_ID.execute(
+            self._session, id=user_id
+        )
         workout_plan = result.fetchone()
         return WorkoutPlanCalendar(**workout_plan._asdict()) if workout_plan else None
@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks every API route in-process against a seeded database.
+
+    python -m app.tools.benchmark_endpoints --output baseline.json
+    python -m app.tools.benchmark_endpoints --baseline baseline.json --threshold 0.2
+    python -m app.tools.benchmark_endpoints --only /chat --requests 500
+
+Load the database with ``app.tools.seed_dataset`` first. Requests go straight
+into the ASGI app, so the numbers cover routing, validation, services and
+Postgres, not the HTTP server. With ``--baseline`` the run exits non-zero when
+a route got slower than the threshold or issues more queries than before.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from sqlalchemy import text
+
+from app.core.user_profile import UserProfile
+from app.dependency.database import Database
+from app.modules.asgi_client import ASGIClient, ASGIResponse, lifespan
+from app.tools.seed_dataset import EXERCISES, SEED_PASSWORD
+from main import app
+
+# One common user with a current plan, diet, shopping list, goal and chat,
+# and the physical educator who follows them.
+FIXTURES = text("""
+    SELECT u.id AS user_id, u.email,
+           r.professional_id, p.email AS professional_email,
+           t.workout_plan_id, d.diet_id, s.id AS shopping_list_id,
+           g.id AS gold_id, pa.chat_id
+    FROM users u
+    JOIN user_relations r ON r.user_id = u.id
+    JOIN users p ON p.id = r.professional_id AND p.user_profile = :educator
+    JOIN user_trainings t ON t.user_id = u.id AND t.is_actual
+    JOIN user_diets d ON d.user_id = u.id AND d.is_actual
+    JOIN shopping_lists s ON s.user_id = u.id
+    JOIN health_goals g ON g.user_id = u.id
+    JOIN participants pa ON pa.user_id = u.id
+    WHERE u.user_profile = :common AND u.is_active
+    ORDER BY u.id DESC
+    LIMIT 1
+""")
+LOGIN_ACCOUNTS = text("""
+    SELECT email FROM users
+    WHERE user_profile = :common AND is_active
+    ORDER BY id
+    LIMIT :limit
+""")
+METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+class Endpoint(NamedTuple):
+    method: str
+    path: str
+    auth: str | None = "user"
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.path.partition('?')[0]}"
+
+
+ENDPOINTS = (
+    Endpoint("POST", "/auth/login", auth=None),
+    Endpoint("GET", "/diets/actual?user_id={user_id}", auth=None),
+    Endpoint("GET", "/diets/actual-previous"),
+    Endpoint("GET", "/diets/period"),
+    Endpoint("GET", "/diets/last-finished"),
+    Endpoint("GET", "/diets/all-finished"),
+    Endpoint("GET", "/diets/all-free", auth=None),
+    Endpoint("GET", "/diets/all-free-quantity"),
+    Endpoint("GET", "/diets/{diet_id}"),
+    Endpoint("GET", "/diets/expiring", auth="professional"),
+    Endpoint("GET", "/diets/by-profissional", auth="professional"),
+    Endpoint("GET", "/workout-plans/actual"),
+    Endpoint("GET", "/workout-plans/actual-previous"),
+    Endpoint("GET", "/workout-plans/period"),
+    Endpoint("GET", "/workout-plans/last-finished"),
+    Endpoint("GET", "/workout-plans/all-finished"),
+    Endpoint("GET", "/workout-plans/all-free"),
+    Endpoint("GET", "/workout-plans/all-free-quantity"),
+    Endpoint("GET", "/workout-plans/all-free/search?exercise={exercise}"),
+    Endpoint("GET", "/workout-plans/{workout_plan_id}"),
+    Endpoint("GET", "/workout-plans/expiring", auth="professional"),
+    Endpoint("GET", "/workout-plans/all-free-by-professional", auth="professional"),
+    Endpoint("GET", "/user/"),
+    Endpoint("GET", "/user/ranking-points"),
+    Endpoint("GET", "/user/user-publication-progress/all"),
+    Endpoint("GET", "/user/user-publication-suggestion/all"),
+    Endpoint("GET", "/user/clients-for-professional", auth="professional"),
+    Endpoint("GET", "/shopping_list/actual"),
+    Endpoint("GET", "/shopping_list/all-shopping-list"),
+    Endpoint("GET", "/shopping_list/{shopping_list_id}"),
+    Endpoint("GET", "/health_gold/"),
+    Endpoint("GET", "/health_gold/{gold_id}"),
+    Endpoint("GET", "/chat/all-by-user"),
+    Endpoint("GET", "/chat/sugestions"),
+    Endpoint("GET", "/chat/{chat_id}"),
+    Endpoint("GET", "/chat/other-user-name/{chat_id}"),
+)
+
+
+class Session(NamedTuple):
+    client: ASGIClient
+    fixtures: dict[str, Any]
+    tokens: dict[str, str]
+    accounts: list[str]
+
+
+def login_client(index: int) -> tuple[str, int]:
+    # A different address per login keeps the per-IP limiter out of the
+    # measurement; accounts rotate for the per-account one.
+    return (f"10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}", 50000)
+
+
+async def login(client: ASGIClient, email: str, index: int) -> ASGIResponse:
+    return await client.request(
+        "POST",
+        "/auth/login",
+        form={"username": email, "password": SEED_PASSWORD},
+        client=login_client(index),
+    )
+
+
+async def call(session: Session, endpoint: Endpoint, index: int) -> ASGIResponse:
+    if endpoint.path == "/auth/login":
+        email = session.accounts[index % len(session.accounts)]
+        return await login(session.client, email, index)
+    return await session.client.request(
+        endpoint.method,
+        endpoint.path.format(**session.fixtures),
+        token=session.tokens.get(endpoint.auth or ""),
+    )
+
+
+async def load_fixtures(accounts: int) -> tuple[dict[str, Any], list[str]]:
+    async with Database().replica_session as db:
+        row = (
+            await db.execute(
+                FIXTURES,
+                {
+                    "common": UserProfile.COMMON_USER.value,
+                    "educator": UserProfile.PHYSICAL_EDUCATOR.value,
+                },
+            )
+        ).first()
+        emails = (
+            await db.execute(
+                LOGIN_ACCOUNTS,
+                {"common": UserProfile.COMMON_USER.value, "limit": accounts},
+            )
+        ).scalars()
+        accounts_emails = list(emails)
+    if row is None:
+        sys.exit("no fixture user found, load app.tools.seed_dataset first")
+    fixtures = dict(row._mapping)
+    fixtures["exercise"] = EXERCISES[0][0]
+    return fixtures, accounts_emails
+
+
+def summarize(
+    latencies: list[float], queries: list[int], errors: int, elapsed: float
+) -> dict[str, Any]:
+    # 99 cut points; the method matches numpy's default percentile.
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(cuts[49], 3),
+        "p95_ms": round(cuts[94], 3),
+        "p99_ms": round(cuts[98], 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "queries_per_request": round(statistics.fmean(queries), 2),
+    }
+
+
+async def measure(
+    session: Session, endpoint: Endpoint, requests: int, concurrency: int
+) -> dict[str, Any]:
+    latencies: list[float] = []
+    queries: list[int] = []
+    errors = 0
+    pending = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for index in pending:
+            start = time.perf_counter()
+            response = await call(session, endpoint, index)
+            latencies.append((time.perf_counter() - start) * 1000)
+            queries.append(int(response.headers.get("x-query-count", 0)))
+            if response.status >= 400:  # noqa: PLR2004
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, queries, errors, time.perf_counter() - start)
+
+
+async def run(
+    endpoints: list[Endpoint], requests: int, concurrency: int, warmup: int
+) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    async with lifespan(app) as client:
+        fixtures, accounts = await load_fixtures(max(requests, 1000))
+        tokens = {}
+        logins = (
+            ("user", fixtures["email"]),
+            ("professional", fixtures["professional_email"]),
+        )
+        for index, (auth, email) in enumerate(logins):
+            response = await login(client, email, -1 - index)
+            if response.status != 200:  # noqa: PLR2004
+                sys.exit(f"login as {email} failed: {response.status}")
+            tokens[auth] = response.json()["access_token"]
+        session = Session(client, fixtures, tokens, accounts)
+
+        for endpoint in endpoints:
+            for index in range(warmup):
+                await call(session, endpoint, requests + index)
+            results[endpoint.name] = await measure(
+                session, endpoint, requests, concurrency
+            )
+            print(format_row(endpoint.name, results[endpoint.name]), flush=True)
+
+    return {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "requests": requests,
+        "concurrency": concurrency,
+        "endpoints": results,
+    }
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], metric: str, threshold: float
+) -> list[str]:
+    regressions = []
+    for name, result in current["endpoints"].items():
+        if result["errors"]:
+            regressions.append(f"{name}: {result['errors']} failed requests")
+        before = baseline["endpoints"].get(name)
+        if before is None:
+            continue
+        if result[metric] > before[metric] * (1 + threshold):
+            regressions.append(
+                f"{name}: {metric} {before[metric]} -> {result[metric]} "
+                f"(+{(result[metric] / before[metric] - 1) * 100:.0f}%)"
+            )
+        # Query counts do not depend on machine load, so any growth counts.
+        if result["queries_per_request"] > before["queries_per_request"]:
+            regressions.append(
+                f"{name}: queries per request {before['queries_per_request']} "
+                f"-> {result['queries_per_request']}"
+            )
+    return regressions
+
+
+def format_row(name: str, result: dict[str, Any]) -> str:
+    return (
+        f"{name:<48} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} "
+        f"{result['p99_ms']:>8.1f} {result['throughput_rps']:>8.1f} "
+        f"{result['queries_per_request']:>7.2f} {result['errors']:>6}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="per route")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=10, help="per route")
+    parser.add_argument("--only", help="route prefix, e.g. /chat")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON file of a previous run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="allowed slowdown over the baseline (default: 0.2 = 20%%)",
+    )
+    parser.add_argument("--metric", choices=METRICS, default="p95_ms")
+    args = parser.parse_args()
+
+    endpoints = [
+        endpoint
+        for endpoint in ENDPOINTS
+        if args.only is None or endpoint.path.startswith(args.only)
+    ]
+    print(
+        f"{'route':<48} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+        f"{'req/s':>8} {'queries':>7} {'errors':>6}"
+    )
+    current = asyncio.run(
+        run(endpoints, args.requests, args.concurrency, args.warmup)
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(current, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(baseline, current, args.metric, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regressions against {args.baseline}:")
+            print("\n".join(f"  {regression}" for regression in regressions))
+            sys.exit(1)
+        print(f"\nno regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
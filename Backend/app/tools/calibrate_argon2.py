@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""Calibrates argon2id cost for this machine and benchmarks hash throughput.
+
+python -m app.tools.calibrate_argon2 --budget-ms 100
+python -m app.tools.calibrate_argon2 --budget-ms 100 --benchmark --threads 4
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.modules.argon2_tuning import Argon2Params, calibrate_argon2
+
+BENCHMARK_MEMORY_COSTS = (19456, 32768, 65536, 131072)
+BENCHMARK_TIME_COSTS = (1, 2, 3, 4)
+
+
+def hashes_per_second(params: Argon2Params, threads: int, hashes: int) -> float:
+    hasher = params.password_hash()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(hasher.hash, ["benchmark-Password-123"] * hashes))
+    return hashes / (time.perf_counter() - start)
+
+
+def run_benchmark(
+    calibrated: Argon2Params, threads: int, hashes: int
+) -> list[tuple[Argon2Params, float]]:
+    settings = [
+        Argon2Params(time_cost, memory_cost, calibrated.parallelism)
+        for memory_cost in BENCHMARK_MEMORY_COSTS
+        for time_cost in BENCHMARK_TIME_COSTS
+    ]
+    if calibrated not in settings:
+        settings.append(calibrated)
+    return [
+        (params, hashes_per_second(params, threads, hashes)) for params in settings
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=100.0)
+    parser.add_argument(
+        "--parallelism", type=int, default=Argon2Params().parallelism
+    )
+    parser.add_argument("--benchmark", action="store_true")
+    parser.add_argument("--threads", type=int, default=4, help="hashing threads")
+    parser.add_argument("--hashes", type=int, default=20)
+    args = parser.parse_args()
+
+    params = calibrate_argon2(args.budget_ms, args.parallelism)
+    print(f"ARGON2_TIME_COST={params.time_cost}")
+    print(f"ARGON2_MEMORY_COST={params.memory_cost}")
+    print(f"ARGON2_PARALLELISM={params.parallelism}")
+
+    if not args.benchmark:
+        return
+    print(f"\n{'time':>5} {'memory_kib':>11} {'hashes/s':>10}")
+    for bench_params, rate in run_benchmark(params, args.threads, args.hashes):
+        marker = " <- calibrated" if bench_params == params else ""
+        print(
+            f"{bench_params.time_cost:>5} {bench_params.memory_cost:>11} "
+            f"{rate:>10.1f}{marker}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""Prints the EXPLAIN plan of every registered service query.
+
+    python -m app.tools.explain_queries
+    python -m app.tools.explain_queries --analyze --only diets.
+    python -m app.tools.explain_queries --param id=42 --param email=a@b.com
+
+Run it against a database seeded to production size: the planner picks
+sequential scans on small tables no matter which indexes exist.
+"""
+
+import argparse
+import asyncio
+import importlib
+import pkgutil
+import re
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.service
+from app.dependency.database import Database
+from app.modules.query_registry import NamedQuery, queries
+
+# Representative values for each bind parameter, picked from the data so the
+# plans reflect rows that actually exist.
+PARAM_SAMPLES = {
+    "id": "SELECT max(user_id) FROM user_trainings",
+    "user_id": "SELECT max(user_id) FROM user_trainings",
+    "current_user_id": "SELECT max(user_id) FROM participants",
+    "professional_id": "SELECT max(professional_id) FROM user_relations",
+    "chat_id": "SELECT max(chat_id) FROM chat_messages",
+    "gold_id": "SELECT max(id) FROM health_goals",
+    "shopping_list_id": "SELECT max(id) FROM shopping_lists",
+    "cpf": "SELECT cpf FROM users ORDER BY id DESC LIMIT 1",
+    "email": "SELECT email FROM users ORDER BY id DESC LIMIT 1",
+    "token_hash": "SELECT token_hash FROM refresh_tokens ORDER BY id DESC LIMIT 1",
+}
+SEQ_SCAN = re.compile(r"Seq Scan on (\w+)")
+
+
+def load_service_queries() -> list[NamedQuery]:
+    for module in pkgutil.iter_modules(app.service.__path__):
+        importlib.import_module(f"app.service.{module.name}")
+    return list(queries)
+
+
+def parse_params(values: list[str]) -> dict[str, str]:
+    params = {}
+    for value in values:
+        name, _, param = value.partition("=")
+        params[name] = param
+    return params
+
+
+async def sample_params(
+    session: AsyncSession, names: set[str], overrides: dict[str, str]
+) -> dict[str, Any]:
+    params: dict[str, Any] = {}
+    for name in sorted(names):
+        if name in overrides:
+            params[name] = (
+                int(overrides[name])
+                if overrides[name].isdigit()
+                else overrides[name]
+            )
+        elif name in PARAM_SAMPLES:
+            result = await session.execute(text(PARAM_SAMPLES[name]))
+            params[name] = result.scalar()
+        else:
+            params[name] = None
+    return params
+
+
+async def explain(
+    session: AsyncSession, query: NamedQuery, params: dict[str, Any], analyze: bool
+) -> list[str]:
+    options = "ANALYZE, BUFFERS" if analyze else "COSTS"
+    result = await session.execute(
+        text(f"EXPLAIN ({options}) {query.statement.text}"), params
+    )
+    return [row[0] for row in result.fetchall()]
+
+
+async def run(only: str | None, overrides: dict[str, str], analyze: bool) -> None:
+    selected = [
+        query
+        for query in load_service_queries()
+        if only is None or query.name.startswith(only)
+    ]
+    seq_scans: dict[str, list[str]] = {}
+    for query in selected:
+        async with Database().session as session:
+            params = await sample_params(
+                session, set(query.statement._bindparams), overrides
+            )
+            plan = await explain(session, query, params, analyze)
+            # Never committed, so ANALYZE on a writing query such as
+            # auth.rotate_token leaves no trace.
+            await session.rollback()
+        print(f"=== {query.name} {params}")
+        print("\n".join(plan))
+        print()
+        tables = SEQ_SCAN.findall("\n".join(plan))
+        if tables:
+            seq_scans[query.name] = tables
+
+    print(f"{len(seq_scans)} of {len(selected)} queries sequential-scan:")
+    for name, tables in seq_scans.items():
+        print(f"  {name}: {', '.join(tables)}")
+    await Database().close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--analyze", action="store_true", help="EXPLAIN ANALYZE")
+    parser.add_argument("--only", help="query name prefix, e.g. chat.")
+    parser.add_argument(
+        "--param",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="override a sampled bind parameter",
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.only, parse_params(args.param), args.analyze))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+# -*- coding: utf-8 -*-
+"""Simulates concurrent mobile sessions to find where one worker saturates.
+
+    python -m app.tools.load_journeys
+    python -m app.tools.load_journeys --sessions 50,100,200,400 --duration 120
+    python -m app.tools.load_journeys --professional-share 0.2 --think-time 0.5
+
+Each session logs in, opens the home screen, finishes a daily training of its
+actual plan (or, for professionals, reviews clients and expiring plans), polls
+its chats, sends a message and scrolls the feed, waiting an exponential think
+time between screens. The app runs in this process on one event loop, exactly
+like one uvicorn worker, so the peak requests/s is the saturation throughput of
+a worker. The sessions write to the database, and trainings they finish are
+reset before every step: use a seeded, disposable one.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from datetime import datetime
+from http import HTTPStatus
+from typing import Any, NamedTuple
+
+from sqlalchemy import text
+
+from app.core.user_profile import UserProfile
+from app.dependency.database import Database
+from app.modules.asgi_client import ASGIClient, ASGIResponse, lifespan
+from app.modules.sql_instrumentation import pool_wait_stats
+from app.tools.seed_dataset import MESSAGES, SEED_PASSWORD
+from main import app
+
+ACCOUNTS = text("""
+    SELECT u.id AS user_id, u.email, min(pa.chat_id) AS chat_id
+    FROM users u
+    LEFT JOIN participants pa ON pa.user_id = u.id
+    WHERE u.user_profile = ANY(:profiles) AND u.is_active
+    GROUP BY u.id
+    ORDER BY u.id
+    LIMIT :limit
+""")
+# Trainings finished during the run go back to a fresh actual plan before each
+# step; otherwise they reach 100%, stop being actual and later steps measure
+# the error path.
+RESET_TRAININGS = text("""
+    UPDATE user_trainings
+    SET completed_days = 0, progress = 0, daily_training = 0,
+        is_completed = false, is_actual = true
+    WHERE last_update >= :since
+""")
+FEED_PAGES = 3
+CHAT_POLLS = 2
+
+
+class Account(NamedTuple):
+    user_id: int
+    email: str
+    chat_id: int | None
+    is_professional: bool
+
+
+class StepOver(Exception):
+    pass
+
+
+class StepStats:
+    def __init__(self) -> None:
+        self.latencies: list[float] = []
+        self.errors: dict[str, int] = {}
+        self.journeys = 0
+
+    def record(self, route: str, elapsed_ms: float, status: int) -> None:
+        self.latencies.append(elapsed_ms)
+        if status >= 400:  # noqa: PLR2004
+            self.errors[route] = self.errors.get(route, 0) + 1
+
+
+class MobileSession:
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        client: ASGIClient,
+        accounts: list[Account],
+        address: str,
+        rng: random.Random,
+        think_time: float,
+        stats: StepStats,
+        deadline: float,
+    ) -> None:
+        self._client = client
+        self._accounts = accounts
+        self._address = (address, 50000)
+        self._rng = rng
+        self._think_time = think_time
+        self._stats = stats
+        self._deadline = deadline
+        self._token: str | None = None
+
+    async def request(
+        self, method: str, route: str, path: str | None = None, **kwargs: Any
+    ) -> ASGIResponse:
+        if time.monotonic() >= self._deadline:
+            raise StepOver
+        start = time.perf_counter()
+        response = await self._client.request(
+            method, path or route, token=self._token, client=self._address, **kwargs
+        )
+        self._stats.record(
+            f"{method} {route}",
+            (time.perf_counter() - start) * 1000,
+            response.status,
+        )
+        return response
+
+    async def think(self) -> None:
+        if self._think_time:
+            await asyncio.sleep(self._rng.expovariate(1 / self._think_time))
+        if time.monotonic() >= self._deadline:
+            raise StepOver
+
+    async def run(self) -> None:
+        # Sessions open the app at different moments, not all at once.
+        await asyncio.sleep(self._rng.uniform(0, self._think_time))
+        try:
+            while True:
+                await self.journey(self._rng.choice(self._accounts))
+                self._stats.journeys += 1
+        except StepOver:
+            return
+
+    async def journey(self, account: Account) -> None:
+        self._token = None
+        response = await self.request(
+            "POST",
+            "/auth/login",
+            form={"username": account.email, "password": SEED_PASSWORD},
+        )
+        if response.status != 200:  # noqa: PLR2004
+            await self.think()
+            return
+        self._token = response.json()["access_token"]
+
+        # The home screen fires its requests together.
+        if account.is_professional:
+            await asyncio.gather(
+                self.request("GET", "/user/clients-for-professional"),
+                self.request("GET", "/workout-plans/expiring"),
+                self.request("GET", "/diets/expiring"),
+            )
+        else:
+            actual, *_ = await asyncio.gather(
+                self.request("GET", "/workout-plans/actual"),
+                self.request(
+                    "GET",
+                    "/diets/actual",
+                    f"/diets/actual?user_id={account.user_id}",
+                ),
+                self.request("GET", "/workout-plans/period"),
+                self.request("GET", "/diets/period"),
+            )
+            await self.think()
+            # Like the app, only offer to finish a day of an actual plan.
+            if actual.status == HTTPStatus.OK and actual.json().get("data"):
+                daily_training = self._rng.randrange(5)
+                await self.request(
+                    "PATCH",
+                    "/workout-plans/finish-daily-workout/{daily_training}",
+                    f"/workout-plans/finish-daily-workout/{daily_training}",
+                )
+        await self.think()
+
+        await self.request("GET", "/chat/all-by-user")
+        if account.chat_id is not None:
+            # The first poll opens the chat; later ones only ask for what
+            # arrived since the newest message on screen.
+            last_id = None
+            for _ in range(CHAT_POLLS):
+                query = f"?after={last_id}" if last_id is not None else ""
+                response = await self.request(
+                    "GET", "/chat/{chat_id}", f"/chat/{account.chat_id}{query}"
+                )
+                if response.status == HTTPStatus.OK:
+                    messages = response.json()["data"]["messages"]
+                    if messages:
+                        last_id = messages[-1]["chat_message"]
+                await self.think()
+            if last_id is not None:
+                await self.request(
+                    "POST",
+                    "/chat/{chat_id}/read",
+                    f"/chat/{account.chat_id}/read",
+                    json_body={"last_read_message_id": last_id},
+                )
+            await self.request(
+                "POST",
+                "/chat/",
+                json_body={
+                    "chat_id": account.chat_id,
+                    "content": self._rng.choice(MESSAGES),
+                },
+            )
+        await self.think()
+
+        for _ in range(FEED_PAGES):
+            await self.request("GET", "/user/user-publication-progress/all")
+            await self.think()
+
+
+async def load_accounts(limit: int) -> tuple[list[Account], list[Account]]:
+    groups = (
+        (False, [UserProfile.COMMON_USER.value]),
+        (
+            True,
+            [
+                UserProfile.PHYSICAL_EDUCATOR.value,
+                UserProfile.GUEST_NUTRITIONIST.value,
+            ],
+        ),
+    )
+    accounts: list[list[Account]] = []
+    async with Database().replica_session as db:
+        for is_professional, profiles in groups:
+            result = await db.execute(
+                ACCOUNTS, {"profiles": profiles, "limit": limit}
+            )
+            accounts.append([
+                Account(row.user_id, row.email, row.chat_id, is_professional)
+                for row in result
+            ])
+    return accounts[0], accounts[1]
+
+
+async def reset_trainings(since: datetime) -> int:
+    async with Database().session as db:
+        result = await db.execute(RESET_TRAININGS, {"since": since})
+        await db.commit()
+    return result.rowcount  # type: ignore[attr-defined,no-any-return]
+
+
+async def run_step(  # noqa: PLR0913, PLR0917
+    client: ASGIClient,
+    common: list[Account],
+    professionals: list[Account],
+    sessions: int,
+    duration: float,
+    think_time: float,
+    professional_share: float,
+    rng: random.Random,
+) -> dict[str, Any]:
+    stats = StepStats()
+    deadline = time.monotonic() + duration
+    waits_before = pool_wait_stats.stats()
+    pool_wait_stats.max_ms = 0.0
+    tasks = []
+    for index in range(sessions):
+        accounts = (
+            professionals
+            if professionals and rng.random() < professional_share
+            else common
+        )
+        session = MobileSession(
+            client,
+            accounts,
+            f"10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}",
+            random.Random(rng.random()),
+            think_time,
+            stats,
+            deadline,
+        )
+        tasks.append(session.run())
+    start = time.perf_counter()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    waits = pool_wait_stats.stats()
+    checkouts = waits["checkouts"] - waits_before["checkouts"]
+    wait_ms = waits["wait_total_ms"] - waits_before["wait_total_ms"]
+    cuts = statistics.quantiles(stats.latencies or [0.0], n=100, method="inclusive")
+    return {
+        "sessions": sessions,
+        "requests": len(stats.latencies),
+        "journeys": stats.journeys,
+        "errors": stats.errors,
+        "throughput_rps": round(len(stats.latencies) / elapsed, 1),
+        "p50_ms": round(cuts[49], 3),
+        "p95_ms": round(cuts[94], 3),
+        "p99_ms": round(cuts[98], 3),
+        "pool_checkouts": checkouts,
+        "pool_wait_mean_ms": round(wait_ms / (checkouts or 1), 3),
+        "pool_wait_max_ms": waits["wait_max_ms"],
+        "pool_timeouts": waits["timeouts"] - waits_before["timeouts"],
+    }
+
+
+async def run(
+    steps: list[int],
+    duration: float,
+    think_time: float,
+    professional_share: float,
+    seed: int,
+) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    results = []
+    # finish_daily_training stamps last_update with the app's local time.
+    started = datetime.now()
+    async with lifespan(app) as client:
+        common, professionals = await load_accounts(5000)
+        for sessions in steps:
+            await reset_trainings(started)
+            result = await run_step(
+                client,
+                common,
+                professionals,
+                sessions,
+                duration,
+                think_time,
+                professional_share,
+                rng,
+            )
+            results.append(result)
+            print(format_row(result), flush=True)
+    return results
+
+
+def format_row(result: dict[str, Any]) -> str:
+    return (
+        f"{result['sessions']:>8} {result['throughput_rps']:>8.1f} "
+        f"{result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} "
+        f"{result['p99_ms']:>8.1f} {result['pool_wait_mean_ms']:>10.2f} "
+        f"{result['pool_wait_max_ms']:>10.1f} {sum(result['errors'].values()):>6}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sessions",
+        default="10,25,50,100,200",
+        help="comma-separated concurrent sessions, one step each",
+    )
+    parser.add_argument("--duration", type=float, default=60.0, help="per step")
+    parser.add_argument(
+        "--think-time", type=float, default=2.0, help="mean seconds between screens"
+    )
+    parser.add_argument("--professional-share", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    print(
+        f"{'sessions':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+        f"{'pool wait':>10} {'max wait':>10} {'errors':>6}"
+    )
+    results = asyncio.run(
+        run(
+            [int(sessions) for sessions in args.sessions.split(",")],
+            args.duration,
+            args.think_time,
+            args.professional_share,
+            args.seed,
+        )
+    )
+    peak = max(results, key=lambda result: result["throughput_rps"])
+    print(
+        f"\nsaturation: {peak['throughput_rps']} req/s per worker "
+        f"at {peak['sessions']} sessions"
+    )
+    for result in results:
+        for route, errors in result["errors"].items():
+            print(f"  {result['sessions']} sessions: {errors} errors on {route}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
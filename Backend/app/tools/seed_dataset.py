@@ -0,0 +1,742 @@
+# -*- coding: utf-8 -*-
+"""Loads a deterministic synthetic dataset into Postgres with COPY.
+
+    python -m app.tools.seed_dataset --truncate
+    python -m app.tools.seed_dataset --truncate --users 500000 --seed 7
+
+Every table is generated from its own ``random.Random`` derived from the seed,
+so the same seed, volumes and anchor always produce the same rows. Every seeded
+account uses the password printed at the end.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Iterator, NamedTuple
+
+import asyncpg
+from dateutil.relativedelta import relativedelta
+
+from app.config.settings import settings
+from app.core.user_profile import UserPost, UserProfile
+from app.modules.argon2_tuning import Argon2Params
+from app.modules.common import asyncpg_dsn
+
+SEED_PASSWORD = "Seed@12345"
+# Fixed so reruns produce identical dates; pass ``--anchor today`` for fresh ones.
+DEFAULT_ANCHOR = datetime(2025, 1, 1)
+# Shares of rows with each property, roughly as seen in production.
+NUTRITIONIST_SHARE = 0.5
+PUBLIC_SHARE = 0.3
+DELETED_DIET_SHARE = 0.05
+PROGRESS_POST_SHARE = 0.7
+PRIVATE_POST_SHARE = 0.1
+HEALTH_GOAL_SHARE = 0.5
+TABLES = (
+    "users",
+    "user_relations",
+    "workout_plans",
+    "diets",
+    "user_trainings",
+    "user_diets",
+    "shopping_lists",
+    "chats",
+    "participants",
+    "chat_messages",
+    "user_progress_posts",
+    "user_points",
+    "health_goals",
+)
+FIRST_NAMES = (
+    "Ana",
+    "Bruno",
+    "Carla",
+    "Diego",
+    "Eduarda",
+    "Felipe",
+    "Gabriela",
+    "Hugo",
+    "Isabela",
+    "João",
+    "Larissa",
+    "Marcos",
+    "Natália",
+    "Otávio",
+    "Paula",
+    "Rafael",
+    "Sofia",
+    "Thiago",
+    "Vanessa",
+    "William",
+)
+LAST_NAMES = (
+    "Almeida",
+    "Barbosa",
+    "Cardoso",
+    "Costa",
+    "Ferreira",
+    "Gomes",
+    "Lima",
+    "Martins",
+    "Oliveira",
+    "Pereira",
+    "Ribeiro",
+    "Rocha",
+    "Santos",
+    "Silva",
+)
+EXERCISES = (
+    ("Supino reto", "Peito"),
+    ("Supino inclinado", "Peito"),
+    ("Crucifixo", "Peito"),
+    ("Puxada frontal", "Costas"),
+    ("Remada curvada", "Costas"),
+    ("Levantamento terra", "Costas"),
+    ("Agachamento livre", "Pernas"),
+    ("Leg press", "Pernas"),
+    ("Cadeira extensora", "Pernas"),
+    ("Stiff", "Posterior"),
+    ("Desenvolvimento", "Ombros"),
+    ("Elevação lateral", "Ombros"),
+    ("Rosca direta", "Bíceps"),
+    ("Tríceps corda", "Tríceps"),
+    ("Prancha", "Abdômen"),
+    ("Abdominal supra", "Abdômen"),
+)
+WORKOUT_TYPES = ("Musculação", "Funcional", "Crossfit", "Calistenia")
+MEALS = (
+    ("Café da manhã", "07:00"),
+    ("Lanche da manhã", "10:00"),
+    ("Almoço", "12:30"),
+    ("Lanche da tarde", "16:00"),
+    ("Jantar", "19:30"),
+    ("Ceia", "22:00"),
+)
+FOODS = (
+    ("Ovo", "unidade"),
+    ("Pão integral", "fatia"),
+    ("Aveia", "g"),
+    ("Banana", "unidade"),
+    ("Arroz integral", "g"),
+    ("Feijão", "g"),
+    ("Frango grelhado", "g"),
+    ("Patinho moído", "g"),
+    ("Batata doce", "g"),
+    ("Salada verde", "g"),
+    ("Iogurte natural", "ml"),
+    ("Whey protein", "g"),
+    ("Castanhas", "g"),
+    ("Maçã", "unidade"),
+)
+MESSAGES = (
+    "Bom dia! Como foi o treino de ontem?",
+    "Consegui fazer todas as séries.",
+    "Senti um pouco de dor no joelho no agachamento.",
+    "Vamos ajustar a carga na próxima semana.",
+    "Posso trocar o jantar por uma omelete?",
+    "Pode sim, mantendo a quantidade de proteína.",
+    "Enviei as fotos da evolução.",
+    "Ótimo progresso, continue assim!",
+    "Amanhã não vou conseguir treinar.",
+    "Tudo bem, compense no fim de semana.",
+)
+POSTS = (
+    "Primeiro mês de treino concluído!",
+    "Bati meu recorde no supino hoje.",
+    "Dica: beba água antes de cada refeição.",
+    "Menos 3 kg desde o início da dieta.",
+    "Treino de pernas feito, amanhã não ando.",
+    "Sugestão de lanche: iogurte com aveia e banana.",
+)
+
+
+class Volumes(NamedTuple):
+    users: int
+    professionals: int
+    plans_per_professional: int
+    diets_per_professional: int
+    history: int
+    messages_per_chat: int
+    posts_per_user: int
+
+
+class DatasetGenerator:
+    """Yields COPY records per table. Ids are assigned here, professionals
+    first, so cross-table references never need a lookup."""
+
+    def __init__(self, volumes: Volumes, seed: int, anchor: datetime) -> None:
+        self.volumes = volumes
+        self.seed = seed
+        self.anchor = anchor
+        self.educators = max(1, volumes.professionals // 2)
+        self.nutritionists = max(1, volumes.professionals - self.educators)
+        self.first_user_id = self.educators + self.nutritionists + 1
+        # Salted from the seed, so the users rows are as reproducible as the
+        # rest; the seeded accounts are test data, never real logins.
+        salt = hashlib.sha256(f"{seed}:password".encode()).digest()
+        self.password_hash = (
+            Argon2Params().password_hash().hash(SEED_PASSWORD, salt=salt)
+        )
+        self._boundaries: dict[int, list[datetime]] = {}
+
+    def _random(self, table: str) -> random.Random:
+        return random.Random(f"{self.seed}:{table}")
+
+    def _user_ids(self) -> range:
+        return range(self.first_user_id, self.first_user_id + self.volumes.users)
+
+    def _educator_plans(self, educator_id: int) -> range:
+        first = (educator_id - 1) * self.volumes.plans_per_professional + 1
+        return range(first, first + self.volumes.plans_per_professional)
+
+    def _nutritionist_diets(self, nutritionist_id: int) -> range:
+        index = nutritionist_id - self.educators - 1
+        first = index * self.volumes.diets_per_professional + 1
+        return range(first, first + self.volumes.diets_per_professional)
+
+    def relations(self) -> Iterator[tuple[int, int]]:
+        """(user_id, professional_id): every user has an educator and about
+        half also follow a nutritionist."""
+        rng = self._random("user_relations")
+        for user_id in self._user_ids():
+            yield user_id, rng.randint(1, self.educators)
+            if rng.random() < NUTRITIONIST_SHARE:
+                yield user_id, self.educators + rng.randint(1, self.nutritionists)
+
+    def users(self) -> Iterator[tuple[Any, ...]]:
+        rng = self._random("users")
+        total = self.first_user_id - 1 + self.volumes.users
+        for user_id in range(1, total + 1):
+            if user_id <= self.educators:
+                profile, prefix = UserProfile.PHYSICAL_EDUCATOR.value, "educador"
+            elif user_id < self.first_user_id:
+                profile, prefix = UserProfile.GUEST_NUTRITIONIST.value, "nutri"
+            else:
+                profile, prefix = UserProfile.COMMON_USER.value, "usuario"
+            yield (
+                user_id,
+                f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                f"{user_id:011d}",
+                True,
+                f"{prefix}{user_id}@seed.gym",
+                self.password_hash,
+                profile,
+                None,
+                self.anchor - timedelta(days=rng.randint(18 * 365, 60 * 365)),
+                self.anchor - timedelta(days=rng.randint(0, 365)),
+            )
+
+    def user_relations(self) -> Iterator[tuple[Any, ...]]:
+        for relation_id, (user_id, professional_id) in enumerate(
+            self.relations(), start=1
+        ):
+            yield relation_id, user_id, professional_id, self.anchor
+
+    def workout_plans(self) -> Iterator[tuple[Any, ...]]:
+        rng = self._random("workout_plans")
+        for educator_id in range(1, self.educators + 1):
+            for plan_id in self._educator_plans(educator_id):
+                days = rng.randint(3, 6)
+                plans = [
+                    {
+                        "title": f"Treino {chr(ord('A') + day)}",
+                        "exercises": [
+                            {
+                                "name": name,
+                                "image_url": None,
+                                "description": f"{name} com execução controlada",
+                                "muscle_group": muscle_group,
+                                "repetitions": f"{rng.randint(3, 5)}x"
+                                f"{rng.choice((8, 10, 12, 15))}",
+                                "rest_time": rng.choice((45, 60, 90, 120)),
+                            }
+                            for name, muscle_group in rng.sample(
+                                EXERCISES, rng.randint(4, 8)
+                            )
+                        ],
+                    }
+                    for day in range(days)
+                ]
+                created = self.anchor - timedelta(days=rng.randint(30, 720))
+                yield (
+                    plan_id,
+                    f"Plano {plan_id}",
+                    "Plano gerado para testes de carga",
+                    json.dumps(plans),
+                    educator_id,
+                    rng.random() < PUBLIC_SHARE,
+                    rng.choice((1, 2, 3, 6)),
+                    days,
+                    rng.choice(WORKOUT_TYPES),
+                    created,
+                    created,
+                    False,
+                )
+
+    def diets(self) -> Iterator[tuple[Any, ...]]:
+        rng = self._random("diets")
+        for nutritionist_id in range(
+            self.educators + 1, self.educators + self.nutritionists + 1
+        ):
+            for diet_id in self._nutritionist_diets(nutritionist_id):
+                menu = [
+                    {
+                        "title": title,
+                        "time_to_eat": time_to_eat,
+                        "options": [
+                            {
+                                "name": food,
+                                "quantity": rng.choice((1, 2, 50, 100, 150, 200)),
+                                "type": unit,
+                            }
+                            for food, unit in rng.sample(FOODS, rng.randint(2, 5))
+                        ],
+                    }
+                    for title, time_to_eat in MEALS[: rng.randint(4, len(MEALS))]
+                ]
+                created = self.anchor - timedelta(days=rng.randint(30, 720))
+                yield (
+                    diet_id,
+                    f"Dieta {diet_id}",
+                    "Dieta gerada para testes de carga",
+                    json.dumps(menu),
+                    nutritionist_id,
+                    rng.random() < PUBLIC_SHARE,
+                    rng.choice((1, 2, 3)),
+                    created,
+                    created,
+                    rng.random() < DELETED_DIET_SHARE,
+                )
+
+    def _history(
+        self, rng: random.Random, months_valid: int
+    ) -> Iterator[tuple[datetime, datetime, bool]]:
+        """(start, end, is_actual) for consecutive plans ending in the current
+        one."""
+        if months_valid not in self._boundaries:
+            # Month arithmetic is slow; it is done once per plan length and
+            # each user's history is the same calendar shifted a few days.
+            self._boundaries[months_valid] = [
+                self.anchor - relativedelta(months=months_valid * back)
+                for back in range(self.volumes.history, -1, -1)
+            ]
+        boundaries = self._boundaries[months_valid]
+        shift = timedelta(days=rng.randint(0, 27))
+        for index in range(self.volumes.history):
+            yield (
+                boundaries[index] + shift,
+                boundaries[index + 1] + shift,
+                index == self.volumes.history - 1,
+            )
+
+    def user_trainings(self) -> Iterator[tuple[Any, ...]]:
+        rng = self._random("user_trainings")
+        training_id = 0
+        for user_id, professional_id in self.relations():
+            if professional_id > self.educators:
+                continue
+            plans = self._educator_plans(professional_id)
+            for start, end, is_actual in self._history(rng, 2):
+                training_id += 1
+                completed_days = rng.randint(0, 40)
+                yield (
+                    training_id,
+                    user_id,
+                    rng.choice(plans),
+                    is_actual,
+                    not is_actual,
+                    start,
+                    rng.randint(0, 5),
+                    completed_days,
+                    100.0 if not is_actual else round(rng.uniform(0, 99), 1),
+                    f"{rng.randint(5, 21):02d}:00",
+                    end,
+                    start + timedelta(days=completed_days),
+                )
+
+    def _diet_histories(self) -> Iterator[tuple[int, list[int]]]:
+        """(user_id, diet ids oldest first) for users who follow a
+        nutritionist; the last diet is the current one."""
+        rng = self._random("diet_histories")
+        for user_id, professional_id in self.relations():
+            if professional_id <= self.educators:
+                continue
+            diets = self._nutritionist_diets(professional_id)
+            yield user_id, [rng.choice(diets) for _ in range(self.volumes.history)]
+
+    def user_diets(self) -> Iterator[tuple[Any, ...]]:
+        rng = self._random("user_diets")
+        user_diet_id = 0
+        for user_id, diet_ids in self._diet_histories():
+            for diet_id, (start, end, is_actual) in zip(
+                diet_ids, self._history(rng, 1)
+            ):
+                user_diet_id += 1
+                yield (
+                    user_diet_id,
+                    user_id,
+                    diet_id,
+                    is_actual,
+                    not is_actual,
+                    100.0 if not is_actual else round(rng.uniform(0, 99), 1),
+                    start,
+                    end,
+                    start,
+                )
+
+    def shopping_lists(self) -> Iterator[tuple[Any, ...]]:
+        rng = self._random("shopping_lists")
+        for list_id, (user_id, diet_ids) in enumerate(
+            self._diet_histories(), start=1
+        ):
+            options = [
+                {"name": food, "quantity": rng.randint(1, 10)}
+                for food, _ in rng.sample(FOODS, rng.randint(3, 8))
+            ]
+            updated = self.anchor - timedelta(days=rng.randint(0, 30))
+            yield (
+                list_id,
+                "Lista de compras",
+                json.dumps(options),
+                user_id,
+                diet_ids[-1],
+                updated,
+                updated,
+            )
+
+    def chats(self) -> Iterator[tuple[Any, ...]]:
+        rng = self._random("chats")
+        for chat_id, members in enumerate(self.relations(), start=1):
+            created = self.anchor - timedelta(days=rng.randint(1, 365))
+            yield chat_id, None, created, created, min(members), max(members)
+
+    def participants(self) -> Iterator[tuple[Any, ...]]:
+        participant_id = 0
+        for chat_id, (user_id, professional_id) in enumerate(
+            self.relations(), start=1
+        ):
+            for member_id in (user_id, professional_id):
+                participant_id += 1
+                yield participant_id, member_id, chat_id, self.anchor
+
+    def chat_messages(self) -> Iterator[tuple[Any, ...]]:
+        rng = self._random("chat_messages")
+        message_id = 0
+        for chat_id, members in enumerate(self.relations(), start=1):
+            sent = self.anchor - timedelta(days=rng.randint(1, 365))
+            # The hot loop of the generator: plain random() is several times
+            # cheaper than randint()/choice().
+            for _ in range(self.volumes.messages_per_chat):
+                message_id += 1
+                sent += timedelta(seconds=30 + 86_370 * rng.random())
+                yield (
+                    message_id,
+                    chat_id,
+                    members[int(rng.random() * 2)],
+                    MESSAGES[int(rng.random() * len(MESSAGES))],
+                    "[]",
+                    sent,
+                )
+
+    def user_progress_posts(self) -> Iterator[tuple[Any, ...]]:
+        rng = self._random("user_progress_posts")
+        post_id = 0
+        for user_id in self._user_ids():
+            for _ in range(self.volumes.posts_per_user):
+                post_id += 1
+                image_urls = [
+                    f"/static/images/seed/{post_id}_{index}.jpg"
+                    for index in range(rng.randint(0, 3))
+                ]
+                created = self.anchor - timedelta(minutes=rng.randint(0, 525_600))
+                yield (
+                    post_id,
+                    user_id,
+                    rng.choice(POSTS),
+                    json.dumps(image_urls),
+                    (
+                        UserPost.PROGRESS.value
+                        if rng.random() < PROGRESS_POST_SHARE
+                        else UserPost.TIPS_SUGGESTIONS.value
+                    ),
+                    rng.random() < PRIVATE_POST_SHARE,
+                    created,
+                    created,
+                )
+
+    def user_points(self) -> Iterator[tuple[Any, ...]]:
+        rng = self._random("user_points")
+        for points_id, user_id in enumerate(self._user_ids(), start=1):
+            yield points_id, user_id, rng.randint(0, 5000), self.anchor
+
+    def health_goals(self) -> Iterator[tuple[Any, ...]]:
+        rng = self._random("health_goals")
+        goal_id = 0
+        for user_id in self._user_ids():
+            if rng.random() >= HEALTH_GOAL_SHARE:
+                continue
+            goal_id += 1
+            start_weight = round(rng.uniform(55, 120), 1)
+            goal_weight = round(start_weight + rng.uniform(-20, 10), 1)
+            start = self.anchor - timedelta(days=rng.randint(0, 180))
+            yield (
+                goal_id,
+                user_id,
+                "Perder peso" if goal_weight < start_weight else "Ganhar massa",
+                start_weight,
+                goal_weight,
+                round(rng.uniform(goal_weight, start_weight), 1),
+                start,
+                start + timedelta(days=180),
+                False,
+                None,
+                start,
+                start,
+            )
+
+
+COLUMNS = {
+    "users": (
+        "id",
+        "name",
+        "cpf",
+        "is_active",
+        "email",
+        "password",
+        "user_profile",
+        "image_profile",
+        "birth_date",
+        "last_update",
+    ),
+    "user_relations": ("id", "user_id", "professional_id", "create_date"),
+    "workout_plans": (
+        "id",
+        "title",
+        "description",
+        "plans",
+        "user_id",
+        "is_public",
+        "months_valid",
+        "days_per_week",
+        "type",
+        "create_date",
+        "last_update",
+        "is_deleted",
+    ),
+    "diets": (
+        "id",
+        "title",
+        "description",
+        "menu",
+        "user_id",
+        "is_public",
+        "months_valid",
+        "create_date",
+        "last_update",
+        "is_deleted",
+    ),
+    "user_trainings": (
+        "id",
+        "user_id",
+        "workout_plan_id",
+        "is_actual",
+        "is_completed",
+        "start_date",
+        "daily_training",
+        "completed_days",
+        "progress",
+        "time_to_workout",
+        "end_date",
+        "last_update",
+    ),
+    "user_diets": (
+        "id",
+        "user_id",
+        "diet_id",
+        "is_actual",
+        "is_completed",
+        "progress",
+        "start_date",
+        "end_date",
+        "last_update",
+    ),
+    "shopping_lists": (
+        "id",
+        "title",
+        "options",
+        "user_id",
+        "diet_id",
+        "create_date",
+        "last_update",
+    ),
+    "chats": (
+        "id",
+        "title",
+        "create_date",
+        "last_update",
+        "user_low_id",
+        "user_high_id",
+    ),
+    "participants": ("id", "user_id", "chat_id", "join_date"),
+    "chat_messages": (
+        "id",
+        "chat_id",
+        "user_id",
+        "content",
+        "image_urls",
+        "send_date",
+    ),
+    "user_progress_posts": (
+        "id",
+        "user_id",
+        "content",
+        "image_urls",
+        "type_post",
+        "is_private",
+        "create_date",
+        "last_update",
+    ),
+    "user_points": ("id", "user_id", "points", "last_update"),
+    "health_goals": (
+        "id",
+        "user_id",
+        "goal_type",
+        "start_weight",
+        "goal_weight",
+        "end_weight",
+        "start_date",
+        "end_date",
+        "success",
+        "completed_at",
+        "last_update",
+        "create_date",
+    ),
+}
+
+
+# The inbox columns create_message maintains, derived once from the copied
+# history, which all counts as read.
+SYNC_CHAT_INBOX = (
+    """
+    UPDATE chats c
+    SET last_message_id = m.id,
+        last_message_at = m.send_date,
+        last_message_preview = left(m.content, 200),
+        last_sender_id = m.user_id
+    FROM (
+        SELECT DISTINCT ON (chat_id) id, chat_id, user_id, content, send_date
+        FROM chat_messages
+        ORDER BY chat_id, id DESC
+    ) m
+    WHERE m.chat_id = c.id
+    """,
+    """
+    UPDATE participants p
+    SET last_read_message_id = c.last_message_id
+    FROM chats c
+    WHERE c.id = p.chat_id AND c.last_message_id IS NOT NULL
+    """,
+)
+
+
+async def load(
+    generator: DatasetGenerator, dsn: str, truncate: bool
+) -> dict[str, tuple[int, float]]:
+    connection = await asyncpg.connect(dsn)
+    timings: dict[str, tuple[int, float]] = {}
+    try:
+        async with connection.transaction():
+            if truncate:
+                await connection.execute(
+                    f"TRUNCATE {', '.join(TABLES)}, refresh_tokens "
+                    "RESTART IDENTITY CASCADE"
+                )
+            elif await connection.fetchval("SELECT exists(SELECT 1 FROM users)"):
+                raise SystemExit("users is not empty; rerun with --truncate")
+            for table in TABLES:
+                start = time.perf_counter()
+                result = await connection.copy_records_to_table(
+                    table,
+                    records=getattr(generator, table)(),
+                    columns=COLUMNS[table],
+                )
+                rows = int(result.split()[-1])
+                timings[table] = (rows, time.perf_counter() - start)
+                await connection.execute(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"greatest((SELECT max(id) FROM {table}), 1))"
+                )
+            for statement in SYNC_CHAT_INBOX:
+                await connection.execute(statement)
+        # Fresh statistics, so EXPLAIN and benchmarks see production-like
+        # plans straight away.
+        await connection.execute(f"ANALYZE {', '.join(TABLES)}")
+    finally:
+        await connection.close()
+    return timings
+
+
+def parse_anchor(value: str) -> datetime:
+    if value == "today":
+        return datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    return datetime.fromisoformat(value)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--professionals", type=int, default=1_000)
+    parser.add_argument("--plans-per-professional", type=int, default=10)
+    parser.add_argument("--diets-per-professional", type=int, default=10)
+    parser.add_argument(
+        "--history", type=int, default=3, help="plans and diets per user"
+    )
+    parser.add_argument("--messages-per-chat", type=int, default=10)
+    parser.add_argument("--posts-per-user", type=int, default=2)
+    parser.add_argument(
+        "--anchor",
+        type=parse_anchor,
+        default=DEFAULT_ANCHOR,
+        help=(
+            "date the generated history ends at, ISO format or 'today' "
+            f"(default: {DEFAULT_ANCHOR.date()})"
+        ),
+    )
+    parser.add_argument(
+        "--truncate", action="store_true", help="empty the tables first"
+    )
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    args = parser.parse_args()
+
+    volumes = Volumes(
+        users=args.users,
+        professionals=args.professionals,
+        plans_per_professional=args.plans_per_professional,
+        diets_per_professional=args.diets_per_professional,
+        history=args.history,
+        messages_per_chat=args.messages_per_chat,
+        posts_per_user=args.posts_per_user,
+    )
+    generator = DatasetGenerator(volumes, args.seed, args.anchor)
+    start = time.perf_counter()
+    timings = asyncio.run(
+        load(generator, asyncpg_dsn(args.database_url), args.truncate)
+    )
+    elapsed = time.perf_counter() - start
+
+    print(f"{'table':<22} {'rows':>10} {'seconds':>8} {'rows/s':>10}")
+    for table, (rows, seconds) in timings.items():
+        print(f"{table:<22} {rows:>10} {seconds:>8.2f} {rows / seconds:>10.0f}")
+    total = sum(rows for rows, _ in timings.values())
+    print(f"{'total':<22} {total:>10} {elapsed:>8.2f} {total / elapsed:>10.0f}")
+    print(f"\npassword for every seeded account: {SEED_PASSWORD}")
+    print(f"e.g. usuario{generator.first_user_id}@seed.gym")
+
+
+if __name__ == "__main__":
+    main()
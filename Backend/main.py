@@ -3,6 +3,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config.lifespan import lifespan
+from app.modules.disconnect import CancelOnDisconnectMiddleware
+from app.modules.sql_instrumentation import QueryCountMiddleware
 from app.routers.router import define_routes
 
 
@@ -17,7 +19,10 @@ def get_application() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Query-Count", "X-Query-Time-Ms"],
     )
+    app_.add_middleware(QueryCountMiddleware)
+    app_.add_middleware(CancelOnDisconnectMiddleware)
 
     return app_
 
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""Production entry point: multi-worker uvicorn with graceful shutdown.
+
+    python -m serve
+    python -m serve --workers 8 --port 8000 --limit-concurrency 512
+
+Defaults come from the SERVER_* settings. On SIGTERM every worker stops
+accepting connections, waits up to SERVER_GRACEFUL_SHUTDOWN_SECONDS for the
+requests in flight and then runs the app lifespan shutdown, which disposes
+the database pools.
+"""
+
+import argparse
+import importlib.util
+import logging
+import os
+from typing import Literal
+
+import uvicorn
+
+from app.config.settings import settings
+
+logger = logging.getLogger("serve")
+
+CGROUP_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+
+
+def available_cpus() -> int:
+    """CPUs this process may use: the affinity mask, capped by the cgroup v2
+    quota so a pod limited to 2 CPUs on a 16-core node gets 2 workers."""
+    cpus = (
+        len(os.sched_getaffinity(0))
+        if hasattr(os, "sched_getaffinity")
+        else os.cpu_count() or 1
+    )
+    try:
+        with open(CGROUP_CPU_MAX, encoding="utf-8") as file:
+            quota, period = file.read().split()
+    except (OSError, ValueError):
+        return cpus
+    if quota == "max":
+        return cpus
+    return max(1, min(cpus, int(quota) // int(period)))
+
+
+def installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def validate_app_import() -> None:
+    """Imports the app once in the supervisor so import errors and bad
+    settings stop the launch before any worker starts. Nothing is shared:
+    workers are spawned and import the app again on their own."""
+    importlib.import_module("main")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.SERVER_WORKERS or available_cpus(),
+        help="default: one per available CPU",
+    )
+    parser.add_argument("--backlog", type=int, default=settings.SERVER_BACKLOG)
+    parser.add_argument(
+        "--keep-alive", type=int, default=settings.SERVER_KEEP_ALIVE_SECONDS
+    )
+    parser.add_argument(
+        "--limit-concurrency",
+        type=int,
+        default=settings.SERVER_LIMIT_CONCURRENCY,
+        help="connections per worker before answering 503",
+    )
+    parser.add_argument(
+        "--graceful-shutdown",
+        type=int,
+        default=settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+    )
+    parser.add_argument(
+        "--forwarded-allow-ips",
+        default=settings.FORWARDED_ALLOW_IPS,
+        help="proxies trusted to set X-Forwarded-For/-Proto",
+    )
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+    logging.basicConfig(level=args.log_level.upper())
+
+    validate_app_import()
+
+    loop: Literal["asyncio", "uvloop"] = (
+        "uvloop" if installed("uvloop") else "asyncio"
+    )
+    http: Literal["h11", "httptools"] = (
+        "httptools" if installed("httptools") else "h11"
+    )
+    engines = 2 if settings.DATABASE_REPLICA_URL else 1
+    logger.info(
+        "%d workers, %s loop, %s parser, up to %d database connections",
+        args.workers,
+        loop,
+        http,
+        args.workers * engines * (settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW),
+    )
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop=loop,
+        http=http,
+        backlog=args.backlog,
+        # Longer than the load balancer's idle timeout, so the balancer is
+        # the one closing idle connections and never reuses a closed one.
+        timeout_keep_alive=args.keep_alive,
+        limit_concurrency=args.limit_concurrency,
+        timeout_graceful_shutdown=args.graceful_shutdown,
+        server_header=False,
+        proxy_headers=True,
+        forwarded_allow_ips=args.forwarded_allow_ips,
+        log_level=args.log_level,
+    )
+
+
+if __name__ == "__main__":
+    main()
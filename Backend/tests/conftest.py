@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from app.service import chat
+from tests.fakes import FakeRelations
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+def chat_relations(monkeypatch: pytest.MonkeyPatch) -> FakeRelations:
+    """A fresh relationship cache for the chat service; sessions attached to
+    the returned ``FakeRelations`` answer its loads."""
+    relations = FakeRelations()
+    monkeypatch.setattr(chat, "relationship_cache", relations.cache)
+    return relations
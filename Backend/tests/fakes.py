@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+from collections import namedtuple
+from typing import Any, Callable, cast
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import TextClause
+
+from app.modules.query_registry import NamedQuery
+from app.service.relations import (
+    GET_CHAT_MEMBERS,
+    GET_USER_RELATIONS,
+    RelationshipCache,
+)
+
+Handler = Callable[[dict[str, Any]], list[Any]]
+
+
+def row(**values: Any) -> Any:
+    """A result row with attribute access and ``_asdict``, like SQLAlchemy's."""
+    return namedtuple("Row", values)(**values)
+
+
+class FakeResult:
+    def __init__(self, rows: list[Any]) -> None:
+        self._rows = rows
+
+    def fetchall(self) -> list[Any]:
+        return list(self._rows)
+
+    def fetchone(self) -> Any:
+        return self._rows[0] if self._rows else None
+
+    def one(self) -> Any:
+        assert len(self._rows) == 1
+        return self._rows[0]
+
+    def scalar(self) -> Any:
+        return self._rows[0][0] if self._rows else None
+
+    def scalar_one(self) -> Any:
+        return self.one()[0]
+
+    def scalar_one_or_none(self) -> Any:
+        return self.scalar()
+
+    def scalars(self) -> list[Any]:
+        return [item[0] for item in self._rows]
+
+
+class FakeSession:
+    """Answers registered queries from Python instead of Postgres; any other
+    statement goes to the ``otherwise`` handler, or returns no rows. Commits
+    and rollbacks go through an unbound ``Session``, so after-commit hooks run
+    as they would for real."""
+
+    def __init__(self) -> None:
+        self._handlers: dict[TextClause, Handler] = {}
+        self._otherwise: Handler | None = None
+        self.executed: list[tuple[Any, dict[str, Any]]] = []
+        self.added: list[Any] = []
+        self.commits = 0
+        self.sync_session = Session()
+
+    @property
+    def info(self) -> dict[Any, Any]:
+        return self.sync_session.info
+
+    def on(self, query: NamedQuery, handler: Handler) -> None:
+        self._handlers[query.statement] = handler
+
+    def otherwise(self, handler: Handler) -> None:
+        self._otherwise = handler
+
+    def calls(self, query: NamedQuery) -> list[dict[str, Any]]:
+        return [
+            params
+            for statement, params in self.executed
+            if statement is query.statement
+        ]
+
+    async def execute(
+        self, statement: Any, params: dict[str, Any] | None = None
+    ) -> FakeResult:
+        params = params or {}
+        self.executed.append((statement, params))
+        handler = self._handlers.get(statement, self._otherwise)
+        return FakeResult(handler(params) if handler else [])
+
+    def add(self, instance: Any) -> None:
+        self.added.append(instance)
+
+    async def flush(self) -> None:
+        pass
+
+    async def commit(self) -> None:
+        self.commits += 1
+        self.sync_session.commit()
+
+    async def rollback(self) -> None:
+        if not self.sync_session.in_transaction():
+            self.sync_session.begin()
+        self.sync_session.rollback()
+
+    async def __aenter__(self) -> "FakeSession":
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        pass
+
+
+def as_session(session: FakeSession) -> AsyncSession:
+    """The fake typed as the ``AsyncSession`` services take; it implements the
+    part of the interface they use."""
+    return cast(AsyncSession, session)
+
+
+class FakeDatabase:
+    """Stands in for ``Database()``; without a replica session every session
+    is the same fake, auth lookups included."""
+
+    def __init__(
+        self, session: FakeSession, replica_session: FakeSession | None = None
+    ) -> None:
+        self.session = session
+        self.auth_session = session
+        self.replica_session = replica_session or session
+
+
+class FakeRelations:
+    """Professional/client pairs and chat members behind the relationship
+    cache loaders, answered on every attached session; ``cache`` is a fresh
+    cache to read them through."""
+
+    def __init__(self) -> None:
+        self.cache = RelationshipCache(100, 60)
+        self.pairs: set[tuple[int, int]] = set()
+        self.chats: dict[int, set[int]] = {}
+        self._sessions: list[FakeSession] = []
+
+    def attach(self, session: FakeSession) -> FakeSession:
+        session.on(GET_USER_RELATIONS, self._relations)
+        session.on(GET_CHAT_MEMBERS, self._members)
+        self._sessions.append(session)
+        return session
+
+    def loads(self, query: NamedQuery) -> int:
+        return sum(len(session.calls(query)) for session in self._sessions)
+
+    def _relations(self, params: dict[str, Any]) -> list[Any]:
+        return [
+            row(user_id=user_id, professional_id=professional_id)
+            for user_id, professional_id in sorted(self.pairs)
+            if params["user_id"] in {user_id, professional_id}
+        ]
+
+    def _members(self, params: dict[str, Any]) -> list[Any]:
+        return [
+            row(user_id=user_id) for user_id in self.chats.get(params["chat_id"], ())
+        ]
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime, timedelta
+from typing import Any, Iterator
+
+import jwt
+import pytest
+from fastapi import HTTPException, status
+from fastapi.security import OAuth2PasswordRequestForm
+
+from app.config.settings import settings
+from app.dependency import auth as auth_dependency
+from app.dependency.auth import AuthManager
+from app.modules.security import password_manager, token_manager
+from app.modules.token_versions import TOKEN_VERSION_CHANNEL, token_versions
+from app.schemas.user import Principal, UserInfo
+from app.service.auth import AuthService
+from app.service.user import (
+    GET_PRINCIPAL,
+    GET_USER_BY_EMAIL,
+    NOTIFY_TOKEN_VERSION,
+    UserService,
+    principal_cache,
+)
+from tests.fakes import FakeDatabase, FakeSession, as_session, row
+
+pytestmark = pytest.mark.anyio
+
+USER = UserInfo(id=7, name="Ana", user_profile=1, email="ana@example.com")
+PASSWORD = "Senha@123"
+
+
+@pytest.fixture(autouse=True)
+def _empty_principal_cache() -> Iterator[None]:
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _empty_token_versions(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(token_versions, "_versions", {})
+
+
+@pytest.fixture
+def session(monkeypatch: pytest.MonkeyPatch) -> FakeSession:
+    session = FakeSession()
+    monkeypatch.setattr(auth_dependency, "Database", lambda: FakeDatabase(session))
+    return session
+
+
+@pytest.fixture
+def database_auth(
+    session: FakeSession, monkeypatch: pytest.MonkeyPatch
+) -> FakeSession:
+    monkeypatch.setattr(settings, "AUTH_STATELESS", False)
+    return session
+
+
+def principal_row(token_version: int) -> Any:
+    return row(**USER.model_dump(), token_version=token_version)
+
+
+def access_token(token_version: int = 0) -> str:
+    return token_manager.create_access_token(
+        Principal(user=USER, token_version=token_version)
+    )
+
+
+async def test_token_is_verified_from_its_claims(session: FakeSession) -> None:
+    assert await AuthManager.has_authorization(access_token()) == USER
+    assert session.executed == []
+
+
+async def test_token_issued_before_revocation_is_rejected(
+    session: FakeSession,
+) -> None:
+    # Disabling the user or changing its data bumps token_version.
+    token_versions.on_notify(f"{USER.id}:3")
+
+    with pytest.raises(HTTPException) as error:
+        await AuthManager.has_authorization(access_token(2))
+    assert error.value.status_code == status.HTTP_401_UNAUTHORIZED
+    assert session.executed == []
+
+
+async def test_token_newer_than_the_table_is_accepted(session: FakeSession) -> None:
+    # Issued after a bump whose NOTIFY has not reached this worker yet.
+    token_versions.bump(USER.id, 2)
+
+    assert await AuthManager.has_authorization(access_token(3)) == USER
+
+
+def test_token_versions_never_go_back() -> None:
+    token_versions.on_notify(f"{USER.id}:4")
+    # A reload that read the row before the bump.
+    token_versions.bump(USER.id, 3)
+
+    assert token_versions.current(USER.id) == 4
+    assert token_versions.current(USER.id + 1) == 0
+
+
+async def test_disabling_a_user_bumps_the_table_after_commit() -> None:
+    session = FakeSession()
+    session.otherwise(lambda params: [row(token_version=5)])
+
+    await UserService(as_session(session)).disable_user(USER.id)
+
+    assert session.calls(NOTIFY_TOKEN_VERSION) == [
+        {"channel": TOKEN_VERSION_CHANNEL, "payload": f"{USER.id}:5"}
+    ]
+    assert token_versions.current(USER.id) == 0
+    await session.commit()
+    assert token_versions.current(USER.id) == 5
+
+
+async def test_database_mode_accepts_the_current_version(
+    database_auth: FakeSession,
+) -> None:
+    database_auth.on(GET_PRINCIPAL, lambda params: [principal_row(2)])
+
+    assert await AuthManager.has_authorization(access_token(2)) == USER
+
+
+async def test_database_mode_rejects_revoked_tokens(
+    database_auth: FakeSession,
+) -> None:
+    database_auth.on(GET_PRINCIPAL, lambda params: [principal_row(3)])
+
+    with pytest.raises(HTTPException) as error:
+        await AuthManager.has_authorization(access_token(2))
+    assert error.value.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+async def test_database_mode_rejects_inactive_users(
+    database_auth: FakeSession,
+) -> None:
+    # GET_PRINCIPAL only returns active users.
+    database_auth.on(GET_PRINCIPAL, lambda params: [])
+
+    with pytest.raises(HTTPException) as error:
+        await AuthManager.has_authorization(access_token())
+    assert error.value.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+async def test_expired_token_is_rejected(session: FakeSession) -> None:
+    token = jwt.encode(
+        {
+            "sub": USER.model_dump_json(),
+            "ver": 0,
+            "exp": datetime.now().astimezone() - timedelta(seconds=1),
+        },
+        settings.SECRET_KEY,
+        algorithm=settings.ALGORITHM,
+    )
+
+    with pytest.raises(HTTPException) as error:
+        await AuthManager.has_authorization(token)
+    assert error.value.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+async def login_session(is_active: bool) -> FakeSession:
+    hashed = await password_manager.password_hash(PASSWORD)
+    session = FakeSession()
+    session.on(
+        GET_USER_BY_EMAIL,
+        lambda params: [
+            row(
+                **USER.model_dump(),
+                password=hashed,
+                is_active=is_active,
+                token_version=0,
+            )
+        ],
+    )
+    return session
+
+
+async def test_login_issues_tokens_to_active_users() -> None:
+    session = await login_session(is_active=True)
+    form = OAuth2PasswordRequestForm(username=USER.email, password=PASSWORD)
+
+    token = await AuthService(as_session(session)).login(form)
+
+    assert token.refresh_token
+    assert token_manager.subject_id(token.access_token) == USER.id
+
+
+async def test_login_rejects_inactive_users() -> None:
+    session = await login_session(is_active=False)
+    form = OAuth2PasswordRequestForm(username=USER.email, password=PASSWORD)
+
+    with pytest.raises(HTTPException) as error:
+        await AuthService(as_session(session)).login(form)
+    assert error.value.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+from typing import Any
+
+from app.tools.benchmark_endpoints import compare, summarize
+
+
+def result(p95_ms: float, queries: float = 3.0, errors: int = 0) -> dict[str, Any]:
+    return {"p95_ms": p95_ms, "queries_per_request": queries, "errors": errors}
+
+
+def run(**endpoints: dict[str, Any]) -> dict[str, Any]:
+    return {"endpoints": endpoints}
+
+
+def test_summary_percentiles() -> None:
+    latencies = [float(ms) for ms in range(1, 101)]
+
+    summary = summarize(latencies, [2] * 100, errors=1, elapsed=2.0)
+
+    assert summary["requests"] == 100
+    assert summary["p50_ms"] == 50.5
+    assert summary["p99_ms"] == 99.01
+    assert summary["throughput_rps"] == 50.0
+    assert summary["queries_per_request"] == 2
+
+
+def test_latency_within_threshold_passes() -> None:
+    baseline = run(feed=result(100))
+
+    assert compare(baseline, run(feed=result(109)), "p95_ms", 0.1) == []
+
+
+def test_latency_over_threshold_is_a_regression() -> None:
+    baseline = run(feed=result(100))
+
+    [regression] = compare(baseline, run(feed=result(125)), "p95_ms", 0.1)
+
+    assert regression == "feed: p95_ms 100 -> 125 (+25%)"
+
+
+def test_any_extra_query_is_a_regression() -> None:
+    baseline = run(feed=result(100, queries=3))
+
+    [regression] = compare(
+        baseline, run(feed=result(90, queries=3.5)), "p95_ms", 0.1
+    )
+
+    assert "queries per request" in regression
+
+
+def test_errors_fail_even_for_new_endpoints() -> None:
+    regressions = compare(run(), run(chat=result(10, errors=2)), "p95_ms", 0.1)
+
+    assert regressions == ["chat: 2 failed requests"]
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import time
+
+import pytest
+
+from app.modules.cache import TTLCache
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(time, "monotonic", clock)
+    return clock
+
+
+def test_least_recently_used_entry_is_evicted(clock: Clock) -> None:
+    entries: TTLCache[str, int] = TTLCache("test", 2, 60)
+    entries.set("a", 1)
+    entries.set("b", 2)
+    entries.get("a")
+
+    entries.set("c", 3)
+
+    assert entries.get("a") == 1
+    assert entries.get("b") is None
+    assert entries.get("c") == 3
+    assert entries.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl(clock: Clock) -> None:
+    entries: TTLCache[str, int] = TTLCache("test", 10, 60)
+    entries.set("a", 1)
+
+    clock.now += 59
+    assert entries.get("a") == 1
+    clock.now += 1
+    assert entries.get("a") is None
+    assert entries.stats()["size"] == 0
+
+
+def test_shrinking_evicts_oldest_entries(clock: Clock) -> None:
+    entries: TTLCache[int, int] = TTLCache("test", 10, 60)
+    for key in range(5):
+        entries.set(key, key)
+
+    entries.configure(2, 60)
+
+    assert [key for key in range(5) if entries.get(key) is not None] == [3, 4]
+
+
+def test_value_loaded_across_an_invalidation_is_not_stored(clock: Clock) -> None:
+    entries: TTLCache[str, int] = TTLCache("test", 10, 60)
+    version = entries.version
+    # The row changes and is invalidated while the loader is querying it.
+    entries.invalidate("a")
+
+    entries.set("a", 1, version)
+
+    assert entries.get("a") is None
+
+
+def test_value_loaded_without_invalidation_is_stored(clock: Clock) -> None:
+    entries: TTLCache[str, int] = TTLCache("test", 10, 60)
+    version = entries.version
+
+    entries.set("a", 1, version)
+
+    assert entries.get("a") == 1
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import json
+
+from app.modules.chat_events import (
+    MAX_NOTIFY_PAYLOAD,
+    SUBSCRIPTION_QUEUE_SIZE,
+    ChatHub,
+    notify_payload,
+)
+
+MESSAGE = {"id": 1, "chat_id": 3, "content": "oi", "image_urls": ["a.png"]}
+
+
+def test_small_message_is_sent_whole() -> None:
+    event = json.loads(notify_payload([7, 8], MESSAGE))
+
+    assert event == {"recipients": [7, 8], "message": MESSAGE}
+
+
+def test_large_message_is_sent_without_its_body() -> None:
+    message = {**MESSAGE, "content": "ã" * MAX_NOTIFY_PAYLOAD}
+
+    payload = notify_payload([7, 8], message)
+
+    # Postgres limits NOTIFY payloads in bytes, not characters.
+    assert len(payload.encode()) <= MAX_NOTIFY_PAYLOAD
+    event = json.loads(payload)
+    assert event["message"]["id"] == 1
+    assert event["message"]["truncated"] is True
+    assert event["message"]["content"] is None
+    assert event["message"]["image_urls"] is None
+
+
+def test_hub_delivers_only_to_recipients() -> None:
+    hub = ChatHub()
+    with hub.subscribe(7) as recipient, hub.subscribe(9) as other:
+        hub.publish([7, 8], MESSAGE)
+
+        assert recipient.queue.get_nowait() == MESSAGE
+        assert other.queue.empty()
+
+
+def test_slow_socket_is_flagged_instead_of_buffering() -> None:
+    hub = ChatHub()
+    with hub.subscribe(7) as subscription:
+        for _ in range(SUBSCRIPTION_QUEUE_SIZE + 1):
+            hub.publish([7], MESSAGE)
+
+        assert subscription.overflowed
+        assert subscription.queue.qsize() == SUBSCRIPTION_QUEUE_SIZE
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime
+from typing import Any
+
+import pytest
+from fastapi import HTTPException, status
+
+from app.schemas.chat import ChatMessagePage
+from app.service.chat import (
+    GET_CHAT_HEADER,
+    GET_MESSAGES_AFTER,
+    GET_MESSAGES_BEFORE,
+    MAX_PAGE_SIZE,
+    ChatService,
+)
+from tests.fakes import FakeRelations, FakeSession, as_session, row
+
+pytestmark = pytest.mark.anyio
+
+MESSAGE_IDS = range(1, 301)
+
+
+def message(message_id: int) -> Any:
+    return row(
+        chat_message=message_id,
+        user_id=3,
+        content=f"mensagem {message_id}",
+        image_urls=None,
+        send_date=datetime(2025, 1, 1),
+    )
+
+
+@pytest.fixture
+def session(chat_relations: FakeRelations) -> FakeSession:
+    """Chat 1 between client 7 and professional 3, with 300 messages; the
+    keyset queries are answered the way Postgres would."""
+    chat_relations.pairs = {(7, 3)}
+    chat_relations.chats = {1: {7, 3}, 2: {7, 4}}
+    session = chat_relations.attach(FakeSession())
+    session.on(
+        GET_CHAT_HEADER,
+        lambda params: [
+            row(
+                chat_id=params["chat_id"],
+                create_date=datetime(2025, 1, 1),
+                other_user_id=params["other_user_id"],
+                other_person_name="Bruno",
+            )
+        ],
+    )
+    session.on(
+        GET_MESSAGES_BEFORE,
+        lambda params: [
+            message(message_id)
+            for message_id in reversed(MESSAGE_IDS)
+            if message_id < params["before"]
+        ][: params["limit"]],
+    )
+    session.on(
+        GET_MESSAGES_AFTER,
+        lambda params: [
+            message(message_id)
+            for message_id in MESSAGE_IDS
+            if message_id > params["after"]
+        ][: params["limit"]],
+    )
+    return session
+
+
+async def page(
+    session: FakeSession,
+    before: int | None = None,
+    after: int | None = None,
+    limit: int = 50,
+    chat_id: int = 1,
+) -> ChatMessagePage:
+    return await ChatService(as_session(session)).get_messages(
+        7, chat_id, before, after, limit
+    )
+
+
+def ids(page: ChatMessagePage) -> list[int]:
+    return [message.chat_message for message in page.messages]
+
+
+async def test_first_page_is_the_latest_messages_in_order(
+    session: FakeSession,
+) -> None:
+    latest = await page(session)
+
+    assert ids(latest) == list(range(251, 301))
+    assert latest.has_more
+    assert latest.header.other_person_name == "Bruno"
+
+
+async def test_before_pages_back_without_gaps_or_repeats(
+    session: FakeSession,
+) -> None:
+    seen: list[int] = []
+    current = await page(session, limit=120)
+    seen = ids(current) + seen
+    while current.has_more:
+        current = await page(session, before=seen[0], limit=120)
+        seen = ids(current) + seen
+
+    assert seen == list(MESSAGE_IDS)
+
+
+async def test_after_fetches_only_newer_messages(session: FakeSession) -> None:
+    newer = await page(session, after=290)
+
+    assert ids(newer) == list(range(291, 301))
+    assert not newer.has_more
+
+
+async def test_after_pages_forward(session: FakeSession) -> None:
+    newer = await page(session, after=100, limit=10)
+
+    assert ids(newer) == list(range(101, 111))
+    assert newer.has_more
+
+
+async def test_limit_is_clamped(session: FakeSession) -> None:
+    assert len((await page(session, limit=10_000)).messages) == MAX_PAGE_SIZE
+    assert len((await page(session, limit=0)).messages) == 1
+
+
+async def test_before_and_after_together_are_rejected(session: FakeSession) -> None:
+    with pytest.raises(HTTPException) as error:
+        await page(session, before=10, after=5)
+
+    assert error.value.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.parametrize("chat_id", [2, 3])
+async def test_unrelated_or_unknown_chat_is_not_found(
+    session: FakeSession, chat_id: int
+) -> None:
+    # Chat 2's member is no longer related to user 7; chat 3 does not exist.
+    with pytest.raises(HTTPException) as error:
+        await page(session, chat_id=chat_id)
+
+    assert error.value.status_code == status.HTTP_404_NOT_FOUND
+    assert session.calls(GET_MESSAGES_BEFORE) == []
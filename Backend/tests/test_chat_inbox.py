@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+import json
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException, status
+
+from app.modules.chat_events import CHAT_CHANNEL
+from app.schemas.chat import SendMessage
+from app.schemas.user import UserInfo
+from app.service.chat import (
+    INSERT_MESSAGE,
+    MARK_READ,
+    NOTIFY_MESSAGE,
+    PREVIEW_LENGTH,
+    ChatService,
+)
+from tests.fakes import FakeRelations, FakeSession, as_session, row
+
+pytestmark = pytest.mark.anyio
+
+USER = UserInfo(id=7, name="Ana", user_profile=1, email="ana@example.com")
+
+
+@pytest.fixture
+def session(chat_relations: FakeRelations) -> FakeSession:
+    chat_relations.chats = {1: {7, 3}}
+    session = chat_relations.attach(FakeSession())
+    session.on(
+        INSERT_MESSAGE,
+        lambda params: [row(id=101, send_date=datetime(2025, 1, 1))],
+    )
+    return session
+
+
+async def test_message_updates_the_inbox_and_notifies_members(
+    session: FakeSession,
+) -> None:
+    await ChatService(as_session(session)).create_message(
+        USER, SendMessage(chat_id=1, content="Bom dia")
+    )
+
+    [insert] = session.calls(INSERT_MESSAGE)
+    assert insert["preview_length"] == PREVIEW_LENGTH
+    assert insert["image_urls"] is None
+    [notify] = session.calls(NOTIFY_MESSAGE)
+    assert notify["channel"] == CHAT_CHANNEL
+    event = json.loads(notify["payload"])
+    assert sorted(event["recipients"]) == [3, 7]
+    assert event["message"]["id"] == 101
+    assert event["message"]["sender_name"] == "Ana"
+
+
+@pytest.mark.parametrize(
+    ("chat_id", "status_code"),
+    [(2, status.HTTP_404_NOT_FOUND), (9, status.HTTP_403_FORBIDDEN)],
+)
+async def test_only_members_can_send(
+    session: FakeSession,
+    chat_relations: FakeRelations,
+    chat_id: int,
+    status_code: int,
+) -> None:
+    chat_relations.chats[9] = {3, 4}
+
+    with pytest.raises(HTTPException) as error:
+        await ChatService(as_session(session)).create_message(
+            USER, SendMessage(chat_id=chat_id, content="oi")
+        )
+
+    assert error.value.status_code == status_code
+    assert session.calls(INSERT_MESSAGE) == []
+
+
+async def test_mark_read_moves_the_cursor_of_the_reader() -> None:
+    session = FakeSession()
+
+    await ChatService(as_session(session)).mark_read(7, 1, 101)
+
+    assert session.calls(MARK_READ) == [
+        {"user_id": 7, "chat_id": 1, "message_id": 101}
+    ]
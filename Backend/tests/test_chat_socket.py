@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+from datetime import datetime, timedelta
+from typing import Any, cast
+
+import jwt
+import pytest
+import uvicorn
+import websockets
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+
+from app.config.settings import settings
+from app.dependency import auth
+from app.modules.chat_events import chat_hub
+from app.modules.security import token_manager
+from app.routers.chat import router_chat
+from app.routers.controller import chat
+from app.routers.controller.chat import WS_UNAUTHORIZED, ChatSocketController
+from app.schemas.user import Principal, UserInfo
+from app.service.chat import GET_MESSAGES_SINCE
+from app.service.user import GET_PRINCIPAL, principal_cache
+from tests.fakes import FakeDatabase, FakeRelations, FakeSession, row
+
+pytestmark = pytest.mark.anyio
+
+USER = UserInfo(id=7, name="Ana", user_profile=1, email="ana@example.com")
+
+
+class FakeWebSocket:
+    def __init__(self, stay_open: bool) -> None:
+        self.stay_open = stay_open
+        self.sent: list[dict[str, Any]] = []
+        self.close_code: int | None = None
+
+    async def accept(self) -> None:
+        pass
+
+    async def receive_text(self) -> str:
+        if self.stay_open:
+            await asyncio.Event().wait()
+        raise WebSocketDisconnect
+
+    async def send_json(self, data: dict[str, Any]) -> None:
+        self.sent.append(data)
+
+    async def close(self, code: int) -> None:
+        self.close_code = code
+
+
+def controller(websocket: FakeWebSocket) -> ChatSocketController:
+    return ChatSocketController(cast(WebSocket, websocket))
+
+
+def message(message_id: int, chat_id: int) -> Any:
+    return row(
+        id=message_id,
+        chat_id=chat_id,
+        user_id=3,
+        sender_name="Bruno",
+        content="oi",
+        image_urls=None,
+        send_date=datetime(2025, 1, 1),
+    )
+
+
+async def test_resume_skips_chats_the_user_may_no_longer_read(
+    monkeypatch: pytest.MonkeyPatch, chat_relations: FakeRelations
+) -> None:
+    monkeypatch.setattr(settings, "AUTH_STATELESS", True)
+    session = chat_relations.attach(FakeSession())
+    monkeypatch.setattr(chat, "Database", lambda: FakeDatabase(session))
+    session.on(
+        GET_MESSAGES_SINCE,
+        lambda params: [message(11, 1), message(12, 2), message(13, 5)],
+    )
+    chat_relations.pairs = {(7, 3)}
+    chat_relations.chats = {1: {7, 3}, 2: {7, 4}, 5: {8, 9}}
+    token = token_manager.create_access_token(Principal(user=USER, token_version=0))
+    websocket = FakeWebSocket(stay_open=False)
+
+    await controller(websocket).stream(token, last_seen_id=10)
+
+    # Chat 2 lost its professional relation; user 7 left chat 5.
+    assert [sent["data"]["id"] for sent in websocket.sent] == [11]
+
+
+async def test_socket_closes_when_the_token_is_revoked(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "AUTH_STATELESS", False)
+    monkeypatch.setattr(settings, "PRINCIPAL_CACHE_TTL_SECONDS", 0.01)
+    principal_cache.clear()
+    session = FakeSession()
+    monkeypatch.setattr(auth, "Database", lambda: FakeDatabase(session))
+    token_version = 0
+    session.on(
+        GET_PRINCIPAL,
+        lambda params: [row(**USER.model_dump(), token_version=token_version)],
+    )
+    token = token_manager.create_access_token(Principal(user=USER, token_version=0))
+    websocket = FakeWebSocket(stay_open=True)
+    stream = asyncio.ensure_future(controller(websocket).stream(token, None))
+    await asyncio.sleep(0.05)
+    assert not stream.done()
+
+    # What disabling the user does: bump the version, drop the cached one.
+    token_version = 1
+    principal_cache.invalidate(USER.id)
+    await asyncio.wait_for(stream, 1)
+
+    assert websocket.close_code == WS_UNAUTHORIZED
+
+
+async def test_socket_closes_when_the_token_expires(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "AUTH_STATELESS", True)
+    token = jwt.encode(
+        {
+            "sub": USER.model_dump_json(),
+            "ver": 0,
+            "exp": datetime.now().astimezone() + timedelta(seconds=1),
+        },
+        settings.SECRET_KEY,
+        algorithm=settings.ALGORITHM,
+    )
+    websocket = FakeWebSocket(stay_open=True)
+
+    await asyncio.wait_for(controller(websocket).stream(token, None), 3)
+
+    assert websocket.close_code == WS_UNAUTHORIZED
+
+
+async def test_socket_is_served_over_a_real_connection(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Uvicorn needs a WebSocket implementation installed to accept upgrades.
+    monkeypatch.setattr(settings, "AUTH_STATELESS", True)
+    app = FastAPI()
+    app.include_router(router_chat)
+    server = uvicorn.Server(
+        uvicorn.Config(
+            app, host="127.0.0.1", port=0, ws="websockets", lifespan="off"
+        )
+    )
+    serving = asyncio.ensure_future(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    token = token_manager.create_access_token(Principal(user=USER, token_version=0))
+    pushed = {"id": 11, "chat_id": 1, "content": "oi"}
+    try:
+        async with websockets.connect(
+            f"ws://127.0.0.1:{port}/chat/ws?token={token}"
+        ) as socket:
+            received = asyncio.ensure_future(socket.recv())
+            # The server subscribes right after accepting; publish until the
+            # subscription is there.
+            while not received.done():
+                chat_hub.publish([USER.id], pushed)
+                await asyncio.wait({received}, timeout=0.05)
+        assert json.loads(received.result()) == {"type": "message", "data": pushed}
+    finally:
+        server.should_exit = True
+        await serving
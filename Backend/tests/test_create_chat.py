@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+from typing import Any
+
+import pytest
+from fastapi import HTTPException, status
+
+from app.service.chat import GET_OR_CREATE_CHAT, ChatService
+from app.service.relations import GET_CHAT_MEMBERS
+from tests.fakes import FakeRelations, FakeSession, as_session, row
+
+pytestmark = pytest.mark.anyio
+
+
+class Chats:
+    """GET_OR_CREATE_CHAT over a dict: ``created`` is true only for the
+    statement that inserted the row, as ``xmax = 0`` is in Postgres."""
+
+    def __init__(self, relations: FakeRelations) -> None:
+        self.relations = relations
+        self.ids: dict[tuple[int, int], int] = {}
+
+    def __call__(self, params: dict[str, Any]) -> list[Any]:
+        key = (params["user_low_id"], params["user_high_id"])
+        created = key not in self.ids
+        if created:
+            self.ids[key] = len(self.ids) + 1
+            self.relations.chats[self.ids[key]] = set(key)
+        return [row(id=self.ids[key], created=created)]
+
+
+@pytest.fixture
+def chats(chat_relations: FakeRelations) -> Chats:
+    return Chats(chat_relations)
+
+
+def session(chats: Chats) -> FakeSession:
+    session = chats.relations.attach(FakeSession())
+    session.on(GET_OR_CREATE_CHAT, chats)
+    return session
+
+
+async def test_pair_is_stored_lowest_id_first(chats: Chats) -> None:
+    request = session(chats)
+
+    await ChatService(as_session(request)).create_chat(9, 4)
+
+    assert request.calls(GET_OR_CREATE_CHAT) == [
+        {"user_low_id": 4, "user_high_id": 9}
+    ]
+
+
+async def test_both_users_get_the_same_chat(chats: Chats) -> None:
+    first = await ChatService(as_session(session(chats))).create_chat(4, 9)
+    again = await ChatService(as_session(session(chats))).create_chat(4, 9)
+    other_side = await ChatService(as_session(session(chats))).create_chat(9, 4)
+
+    assert first.chat_id == again.chat_id == other_side.chat_id
+    assert len(chats.ids) == 1
+
+
+async def test_new_chat_members_are_visible_after_commit(chats: Chats) -> None:
+    request = session(chats)
+    # A lookup before the chat exists is not cached.
+    assert await chats.relations.cache.members(as_session(request), 1) == frozenset()
+
+    created = await ChatService(as_session(request)).create_chat(4, 9)
+    await request.commit()
+
+    members = await chats.relations.cache.members(
+        as_session(request), created.chat_id
+    )
+    assert members == {4, 9}
+
+
+async def test_existing_chat_keeps_the_cache(
+    chats: Chats, chat_relations: FakeRelations
+) -> None:
+    first = session(chats)
+    created = await ChatService(as_session(first)).create_chat(4, 9)
+    await chats.relations.cache.members(as_session(first), created.chat_id)
+
+    request = session(chats)
+    await ChatService(as_session(request)).create_chat(9, 4)
+    await request.commit()
+    await chats.relations.cache.members(as_session(request), created.chat_id)
+
+    assert chat_relations.loads(GET_CHAT_MEMBERS) == 1
+
+
+async def test_chat_with_oneself_is_rejected(chats: Chats) -> None:
+    request = session(chats)
+
+    with pytest.raises(HTTPException) as error:
+        await ChatService(as_session(request)).create_chat(4, 4)
+
+    assert error.value.status_code == status.HTTP_400_BAD_REQUEST
+    assert request.calls(GET_OR_CREATE_CHAT) == []
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from app.config.settings import settings
+from app.dependency.database import Database
+
+
+def test_engine_is_built_once_per_process() -> None:
+    assert Database() is Database()
+    assert Database().session is not Database().session
+
+
+def test_pool_follows_the_settings() -> None:
+    stats = Database().pool_stats()
+
+    assert stats.size == settings.DB_POOL_SIZE
+    assert stats.max_overflow == settings.DB_MAX_OVERFLOW
+    assert stats.checked_out == 0
+
+
+def test_auth_lookups_have_their_own_pool() -> None:
+    auth_pool = Database().auth_session.bind.sync_engine.pool
+    route_pool = Database().session.bind.sync_engine.pool
+
+    assert auth_pool is not route_pool
+    assert auth_pool.size() == settings.DB_AUTH_POOL_SIZE  # type: ignore[attr-defined]
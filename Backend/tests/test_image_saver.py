@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from fastapi import UploadFile
+
+from app.modules.security import password_manager
+from app.service.user import UserService
+from app.service.utils import ImageSaver, image_saver
+from tests.fakes import FakeSession, as_session
+
+pytestmark = pytest.mark.anyio
+
+
+def test_image_saver_touches_no_disk_until_an_upload(tmp_path: Path) -> None:
+    ImageSaver(str(tmp_path / "uploads"))
+
+    assert not (tmp_path / "uploads").exists()
+
+
+async def test_upload_creates_the_folder_and_keeps_the_name(tmp_path: Path) -> None:
+    saver = ImageSaver(str(tmp_path / "uploads"))
+    image = UploadFile(BytesIO(b"png-bytes"), filename="avatar.png")
+
+    url = await saver.save_image(image)
+
+    [saved] = (tmp_path / "uploads").iterdir()
+    assert saved.name.endswith("_avatar.png")
+    assert saved.read_bytes() == b"png-bytes"
+    assert url.endswith(saved.name)
+
+
+def test_services_built_per_request_reuse_the_shared_components() -> None:
+    first = UserService(as_session(FakeSession()))
+    second = UserService(as_session(FakeSession()))
+
+    assert first._image_saver is second._image_saver is image_saver
+    assert first._pwd_manager is second._pwd_manager is password_manager
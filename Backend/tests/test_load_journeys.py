@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+import json
+import random
+import time
+from typing import Any
+
+import pytest
+from starlette.types import Receive, Scope, Send
+
+from app.modules.asgi_client import ASGIClient
+from app.tools.load_journeys import Account, MobileSession, StepStats
+
+pytestmark = pytest.mark.anyio
+
+LAST_MESSAGE_ID = 42
+
+
+class FakeApp:
+    """Answers every route with 200, logging in with a fixed token."""
+
+    def __init__(self, login_status: int = 200, actual_plan: bool = True) -> None:
+        self.login_status = login_status
+        self.actual_plan = actual_plan
+        self.requests: list[tuple[str, str, bool]] = []
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await receive()
+        path = scope["path"]
+        if scope["query_string"]:
+            path += f"?{scope['query_string'].decode()}"
+        headers = dict(scope["headers"])
+        self.requests.append((scope["method"], path, b"authorization" in headers))
+        status = 200
+        body: dict[str, Any] = {
+            "data": {"messages": [{"chat_message": LAST_MESSAGE_ID}]}
+        }
+        if scope["path"] == "/auth/login":
+            status, body = self.login_status, {"access_token": "token"}
+        elif scope["path"] == "/workout-plans/actual" and not self.actual_plan:
+            body = {"data": None}
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": json.dumps(body).encode()})
+
+
+def session(app: FakeApp, stats: StepStats) -> MobileSession:
+    return MobileSession(
+        ASGIClient(app),
+        [],
+        "10.0.0.1",
+        random.Random(1),
+        0,
+        stats,
+        time.monotonic() + 60,
+    )
+
+
+async def test_user_journey_polls_only_new_chat_messages() -> None:
+    app, stats = FakeApp(), StepStats()
+    account = Account(
+        user_id=9, email="ana@example.com", chat_id=3, is_professional=False
+    )
+
+    await session(app, stats).journey(account)
+
+    paths = [path for _, path, _ in app.requests]
+    assert paths[0] == "/auth/login"
+    assert "/diets/actual?user_id=9" in paths
+    assert paths.count("/chat/3") == 1
+    assert f"/chat/3?after={LAST_MESSAGE_ID}" in paths
+    assert ("POST", "/chat/3/read", True) in app.requests
+    assert all(authorized for _, path, authorized in app.requests[1:])
+    assert len(stats.latencies) == len(app.requests)
+    assert stats.errors == {}
+
+
+@pytest.mark.parametrize("actual_plan", [True, False])
+async def test_daily_training_is_finished_only_on_an_actual_plan(
+    actual_plan: bool,
+) -> None:
+    app = FakeApp(actual_plan=actual_plan)
+    account = Account(
+        user_id=9, email="ana@example.com", chat_id=None, is_professional=False
+    )
+
+    await session(app, StepStats()).journey(account)
+
+    finished = [
+        path
+        for _, path, _ in app.requests
+        if path.startswith("/workout-plans/finish-daily-workout/")
+    ]
+    assert len(finished) == int(actual_plan)
+
+
+async def test_failed_login_ends_the_journey_and_counts_an_error() -> None:
+    app, stats = FakeApp(login_status=429), StepStats()
+    account = Account(
+        user_id=9, email="ana@example.com", chat_id=None, is_professional=False
+    )
+
+    await session(app, stats).journey(account)
+
+    assert [path for _, path, _ in app.requests] == ["/auth/login"]
+    assert stats.errors == {"POST /auth/login": 1}
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from app.modules.query_registry import QueryRegistry
+from tests.fakes import FakeSession, as_session, row
+
+pytestmark = pytest.mark.anyio
+
+
+def test_names_are_unique() -> None:
+    registry = QueryRegistry()
+    registry.register("users.by_id", "SELECT 1")
+
+    with pytest.raises(ValueError, match="already registered"):
+        registry.register("users.by_id", "SELECT 2")
+
+
+async def test_execute_reuses_the_statement_and_records_timings() -> None:
+    registry = QueryRegistry()
+    query = registry.register("users.by_id", "SELECT id FROM users WHERE id = :id")
+    session = FakeSession()
+    session.on(query, lambda params: [row(id=params["id"])])
+
+    first = await query.execute(as_session(session), id=1)
+    second = await query.execute(as_session(session), id=2)
+
+    assert first.scalar() == 1
+    assert second.scalar() == 2
+    assert [statement for statement, _ in session.executed] == [
+        query.statement,
+        query.statement,
+    ]
+    [stats] = registry.stats()
+    assert stats["name"] == "users.by_id"
+    assert stats["calls"] == 2
+    assert sum(stats["histogram"].values()) == 2
+
+
+def test_stats_put_the_most_expensive_query_first() -> None:
+    registry = QueryRegistry()
+    cheap = registry.register("cheap", "SELECT 1")
+    costly = registry.register("costly", "SELECT 2")
+    cheap.stats.record(1.0)
+    costly.stats.record(300.0)
+
+    assert [stats["name"] for stats in registry.stats()] == ["costly", "cheap"]
+    assert registry.stats()[0]["histogram"]["le_500ms"] == 1
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+import time
+
+import pytest
+
+from app.modules.forwarded import TrustedProxies
+from app.modules.rate_limit import TokenBucketLimiter
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(time, "monotonic", clock)
+    return clock
+
+
+def test_burst_is_allowed_then_rejected(clock: Clock) -> None:
+    limiter = TokenBucketLimiter(capacity=3, refill_per_second=1)
+
+    assert [limiter.acquire("ip") for _ in range(3)] == [0, 0, 0]
+    assert limiter.acquire("ip") == pytest.approx(1.0)
+    assert limiter.rejected == 1
+
+
+def test_tokens_refill_over_time(clock: Clock) -> None:
+    limiter = TokenBucketLimiter(capacity=2, refill_per_second=0.5)
+    limiter.acquire("ip")
+    limiter.acquire("ip")
+
+    clock.now += 1
+    assert limiter.acquire("ip") == pytest.approx(1.0)
+    clock.now += 1
+    assert limiter.acquire("ip") == 0
+
+
+def test_refill_never_exceeds_capacity(clock: Clock) -> None:
+    limiter = TokenBucketLimiter(capacity=2, refill_per_second=1)
+    limiter.acquire("ip")
+
+    clock.now += 3600
+
+    assert [limiter.acquire("ip") for _ in range(3)][-1] > 0
+
+
+def test_keys_have_separate_buckets(clock: Clock) -> None:
+    limiter = TokenBucketLimiter(capacity=1, refill_per_second=1)
+    limiter.acquire("a")
+
+    assert limiter.acquire("b") == 0
+    assert limiter.acquire("a") > 0
+
+
+def test_least_recent_key_is_dropped_past_max_keys(clock: Clock) -> None:
+    limiter = TokenBucketLimiter(capacity=1, refill_per_second=1, max_keys=2)
+    limiter.acquire("a")
+    limiter.acquire("b")
+    limiter.acquire("c")
+
+    # "a" was forgotten, so it starts again with a full bucket.
+    assert limiter.acquire("a") == 0
+
+
+def test_untrusted_peer_is_the_client() -> None:
+    proxies = TrustedProxies("10.0.0.0/8")
+
+    assert proxies.client_host("203.0.113.9", "198.51.100.1") == "203.0.113.9"
+
+
+def test_client_is_the_nearest_untrusted_hop() -> None:
+    proxies = TrustedProxies("10.0.0.0/8, 127.0.0.1")
+
+    # The leftmost hop is whatever the client claimed; it is not trusted.
+    assert (
+        proxies.client_host("10.0.0.2", "1.2.3.4, 198.51.100.7, 10.0.0.5")
+        == "198.51.100.7"
+    )
+
+
+def test_missing_header_falls_back_to_the_peer() -> None:
+    proxies = TrustedProxies("127.0.0.1")
+
+    assert proxies.client_host("127.0.0.1", "") == "127.0.0.1"
+
+
+def test_wildcard_trusts_every_peer() -> None:
+    proxies = TrustedProxies("*")
+
+    assert proxies.client_host("203.0.113.9", "198.51.100.1") == "198.51.100.1"
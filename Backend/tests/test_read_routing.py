@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+from typing import Any, AsyncGenerator, Iterator
+
+import pytest
+from starlette.requests import Request
+
+from app.config.settings import settings
+from app.dependency import database
+from app.dependency.database import SessionConnection, recent_writers
+from app.modules.security import token_manager
+from app.schemas.user import Principal, UserInfo
+from tests.fakes import FakeDatabase, FakeSession
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def primary(monkeypatch: pytest.MonkeyPatch) -> Iterator[FakeSession]:
+    primary, replica = FakeSession(), FakeSession()
+    monkeypatch.setattr(database, "Database", lambda: FakeDatabase(primary, replica))
+    monkeypatch.setattr(
+        settings, "DATABASE_REPLICA_URL", "postgresql+asyncpg://replica/test"
+    )
+    recent_writers.clear()
+    yield primary
+    recent_writers.clear()
+
+
+def request(method: str, user_id: int | None, token_version: int = 0) -> Request:
+    headers = []
+    if user_id is not None:
+        user = UserInfo(id=user_id, name="Ana", user_profile=1, email="a@b.com")
+        token = token_manager.create_access_token(
+            Principal(user=user, token_version=token_version)
+        )
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+    return Request({
+        "type": "http",
+        "method": method,
+        "path": "/",
+        "headers": headers,
+    })
+
+
+async def run(dependency: AsyncGenerator[Any, None]) -> Any:
+    """Drives a FastAPI yield dependency through a successful request."""
+    session = await dependency.__anext__()
+    with pytest.raises(StopAsyncIteration):
+        await dependency.__anext__()
+    return session
+
+
+async def test_reads_use_the_replica(primary: FakeSession) -> None:
+    session = await run(SessionConnection.read_session(request("GET", 1)))
+
+    assert session is not primary
+
+
+async def test_writer_reads_from_the_primary_after_commit(
+    primary: FakeSession,
+) -> None:
+    await run(SessionConnection.session(request("POST", 1)))
+
+    assert primary.commits == 1
+    # Another token of the same user, as after a refresh, sticks as well.
+    read = request("GET", 1, token_version=1)
+    assert await run(SessionConnection.read_session(read)) is primary
+    assert (
+        await run(SessionConnection.read_session(request("GET", 2))) is not primary
+    )
+
+
+async def test_anonymous_writes_are_not_tracked(primary: FakeSession) -> None:
+    await run(SessionConnection.session(request("POST", None)))
+
+    assert recent_writers.stats()["size"] == 0
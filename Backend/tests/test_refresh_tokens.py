@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+from dataclasses import dataclass
+
+import pytest
+from fastapi import HTTPException, status
+
+from app.modules.security import token_manager
+from app.schemas.user import Principal, UserInfo
+from app.service import auth
+from app.service.auth import AuthService
+from tests.fakes import FakeSession, as_session
+
+pytestmark = pytest.mark.anyio
+
+USER = UserInfo(id=7, name="Ana", user_profile=1, email="ana@example.com")
+
+
+@dataclass
+class StoredToken:
+    user_id: int
+    family_id: str
+    revoked: bool = False
+
+
+class MemoryRefreshTokens:
+    """RefreshTokenQuerys over a dict, with the same rotation semantics."""
+
+    tokens: dict[str, StoredToken] = {}
+
+    def __init__(self, session: FakeSession) -> None:
+        self._session = session
+
+    async def create_token(
+        self, user_id: int, token_hash: str, family_id: str
+    ) -> None:
+        self.tokens[token_hash] = StoredToken(user_id, family_id)
+
+    async def rotate_token(self, token_hash: str) -> tuple[Principal, str] | None:
+        token = self.tokens.get(token_hash)
+        if token is None or token.revoked:
+            return None
+        token.revoked = True
+        return Principal(user=USER, token_version=0), token.family_id
+
+    async def get_revoked_family(self, token_hash: str) -> str | None:
+        token = self.tokens.get(token_hash)
+        return token.family_id if token and token.revoked else None
+
+    async def revoke_family(self, family_id: str) -> None:
+        for token in self.tokens.values():
+            if token.family_id == family_id:
+                token.revoked = True
+
+    async def delete_expired_tokens(self, user_id: int) -> None:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def _memory_tokens(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(MemoryRefreshTokens, "tokens", {})
+    monkeypatch.setattr(auth, "RefreshTokenQuerys", MemoryRefreshTokens)
+
+
+async def login(session: FakeSession) -> str:
+    service = AuthService(as_session(session))
+    token = await service._issue_tokens(
+        Principal(user=USER, token_version=0), token_manager.create_token_family()
+    )
+    assert token.refresh_token
+    return token.refresh_token
+
+
+async def test_refresh_rotates_the_token_within_its_family() -> None:
+    session = FakeSession()
+    first = await login(session)
+
+    token = await AuthService(as_session(session)).refresh(first)
+
+    assert token.refresh_token
+    assert token.refresh_token != first
+    assert token_manager.subject_id(token.access_token) == USER.id
+    old = MemoryRefreshTokens.tokens[token_manager.hash_refresh_token(first)]
+    new = MemoryRefreshTokens.tokens[
+        token_manager.hash_refresh_token(token.refresh_token)
+    ]
+    assert old.revoked
+    assert not new.revoked
+    assert new.family_id == old.family_id
+
+
+async def test_reused_token_revokes_the_whole_family() -> None:
+    session = FakeSession()
+    first = await login(session)
+    second = await AuthService(as_session(session)).refresh(first)
+    assert second.refresh_token
+
+    with pytest.raises(HTTPException) as error:
+        await AuthService(as_session(session)).refresh(first)
+
+    assert error.value.status_code == status.HTTP_401_UNAUTHORIZED
+    # Committed before the 401, which rolls the request back.
+    assert session.commits == 1
+    with pytest.raises(HTTPException):
+        await AuthService(as_session(session)).refresh(second.refresh_token)
+
+
+async def test_reuse_leaves_other_logins_alone() -> None:
+    session = FakeSession()
+    stolen = await login(session)
+    other = await login(session)
+    await AuthService(as_session(session)).refresh(stolen)
+
+    with pytest.raises(HTTPException):
+        await AuthService(as_session(session)).refresh(stolen)
+
+    assert (await AuthService(as_session(session)).refresh(other)).refresh_token
+
+
+async def test_unknown_token_is_rejected_without_revoking() -> None:
+    session = FakeSession()
+
+    with pytest.raises(HTTPException) as error:
+        await AuthService(as_session(session)).refresh("not-a-token")
+
+    assert error.value.status_code == status.HTTP_401_UNAUTHORIZED
+    assert session.commits == 0
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+import time
+
+import pytest
+
+from app.config.settings import settings
+from app.dependency.database import REPLICA_SESSION
+from app.modules.common import after_commit
+from app.service.relations import (
+    GET_CHAT_MEMBERS,
+    GET_USER_RELATIONS,
+    RelationshipCache,
+)
+from tests.fakes import FakeRelations, FakeSession, as_session
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def loader() -> FakeSession:
+    data = FakeRelations()
+    data.pairs = {(7, 3), (8, 3), (7, 5)}
+    data.chats = {1: {7, 3}}
+    return data.attach(FakeSession())
+
+
+@pytest.fixture
+def cache(loader: FakeSession) -> RelationshipCache:
+    return RelationshipCache(100, 60)
+
+
+async def test_after_commit_runs_on_commit_only() -> None:
+    session = FakeSession()
+    calls: list[str] = []
+    after_commit(as_session(session), lambda: calls.append("first"))
+    after_commit(as_session(session), lambda: calls.append("second"))
+    assert calls == []
+
+    await session.commit()
+    await session.commit()
+
+    assert calls == ["first", "second"]
+
+
+async def test_after_commit_is_dropped_on_rollback() -> None:
+    session = FakeSession()
+    calls: list[str] = []
+    after_commit(as_session(session), lambda: calls.append("invalidate"))
+
+    await session.rollback()
+    await session.commit()
+
+    assert calls == []
+
+
+async def test_relations_split_clients_and_professionals(
+    cache: RelationshipCache, loader: FakeSession
+) -> None:
+    professional = await cache.relations(as_session(loader), 3)
+    client = await cache.relations(as_session(loader), 7)
+
+    assert professional.clients == {7, 8}
+    assert professional.professionals == frozenset()
+    assert client.professionals == {3, 5}
+    assert client.related == {3, 5}
+
+
+async def test_relations_are_loaded_once(
+    cache: RelationshipCache, loader: FakeSession
+) -> None:
+    await cache.relations(as_session(loader), 7)
+    await cache.relations(as_session(loader), 7)
+    await cache.members(as_session(loader), 1)
+    await cache.members(as_session(loader), 1)
+
+    assert len(loader.calls(GET_USER_RELATIONS)) == 1
+    assert len(loader.calls(GET_CHAT_MEMBERS)) == 1
+
+
+async def test_unknown_chats_are_not_cached(
+    cache: RelationshipCache, loader: FakeSession
+) -> None:
+    assert await cache.members(as_session(loader), 2) == frozenset()
+    assert await cache.members(as_session(loader), 2) == frozenset()
+
+    assert len(loader.calls(GET_CHAT_MEMBERS)) == 2
+
+
+async def test_relation_change_is_seen_once_committed(
+    cache: RelationshipCache, loader: FakeSession
+) -> None:
+    await cache.relations(as_session(loader), 7)
+    await cache.relations(as_session(loader), 3)
+    request = FakeSession()
+
+    cache.invalidate_relation(as_session(request), 7, 3)
+    # Until the change commits, other requests may still read the old rows.
+    await cache.relations(as_session(loader), 7)
+    assert len(loader.calls(GET_USER_RELATIONS)) == 2
+
+    await request.commit()
+    await cache.relations(as_session(loader), 7)
+    await cache.relations(as_session(loader), 3)
+    assert len(loader.calls(GET_USER_RELATIONS)) == 4
+
+
+async def test_rolled_back_change_keeps_the_cache(
+    cache: RelationshipCache, loader: FakeSession
+) -> None:
+    await cache.members(as_session(loader), 1)
+    request = FakeSession()
+
+    cache.invalidate_chat(as_session(request), 1)
+    await request.rollback()
+    await cache.members(as_session(loader), 1)
+
+    assert len(loader.calls(GET_CHAT_MEMBERS)) == 1
+
+
+async def test_replica_reads_expire_with_the_stickiness_window(
+    cache: RelationshipCache,
+    loader: FakeSession,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    loader.info[REPLICA_SESSION] = True
+
+    await cache.members(as_session(loader), 1)
+    now[0] += settings.REPLICA_STICKINESS_SECONDS
+    await cache.members(as_session(loader), 1)
+
+    assert len(loader.calls(GET_CHAT_MEMBERS)) == 2
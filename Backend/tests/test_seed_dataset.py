@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime
+from typing import Any
+
+import pytest
+
+from app.modules.argon2_tuning import Argon2Params
+from app.tools.seed_dataset import (
+    COLUMNS,
+    DEFAULT_ANCHOR,
+    SEED_PASSWORD,
+    TABLES,
+    DatasetGenerator,
+    Volumes,
+    parse_anchor,
+)
+
+VOLUMES = Volumes(
+    users=40,
+    professionals=4,
+    plans_per_professional=2,
+    diets_per_professional=2,
+    history=2,
+    messages_per_chat=3,
+    posts_per_user=1,
+)
+
+
+def dataset(seed: int, anchor: datetime = DEFAULT_ANCHOR) -> dict[str, list[Any]]:
+    generator = DatasetGenerator(VOLUMES, seed, anchor)
+    return {table: list(getattr(generator, table)()) for table in TABLES}
+
+
+@pytest.fixture(scope="module")
+def seeded() -> dict[str, list[Any]]:
+    return dataset(seed=7)
+
+
+def test_same_seed_and_anchor_give_the_same_rows(
+    seeded: dict[str, list[Any]],
+) -> None:
+    assert dataset(seed=7) == seeded
+
+
+def test_seeded_accounts_log_in_with_the_seed_password() -> None:
+    generator = DatasetGenerator(VOLUMES, 7, DEFAULT_ANCHOR)
+    hasher = Argon2Params().password_hash()
+
+    assert hasher.verify(SEED_PASSWORD, generator.password_hash)
+
+
+def test_other_seed_gives_other_rows(seeded: dict[str, list[Any]]) -> None:
+    assert dataset(seed=8)["user_relations"] != seeded["user_relations"]
+
+
+def test_rows_match_the_copy_columns(seeded: dict[str, list[Any]]) -> None:
+    for table, rows in seeded.items():
+        assert rows, table
+        assert {len(row) for row in rows} == {len(COLUMNS[table])}, table
+
+
+def test_anchor_is_fixed_unless_today_is_asked() -> None:
+    assert parse_anchor("2024-05-01") == datetime(2024, 5, 1)
+    assert parse_anchor("today").date() == datetime.now().date()
+    assert DEFAULT_ANCHOR == datetime(2025, 1, 1)
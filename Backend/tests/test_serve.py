@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+import os
+from pathlib import Path
+
+import pytest
+
+import serve
+
+
+@pytest.fixture
+def cpus(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: set(range(16)))
+
+
+@pytest.mark.usefixtures("cpus")
+@pytest.mark.parametrize(
+    ("cpu_max", "expected"),
+    [("200000 100000", 2), ("max 100000", 16), ("50000 100000", 1)],
+)
+def test_workers_follow_the_cgroup_quota(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, cpu_max: str, expected: int
+) -> None:
+    cgroup = tmp_path / "cpu.max"
+    cgroup.write_text(cpu_max, encoding="utf-8")
+    monkeypatch.setattr(serve, "CGROUP_CPU_MAX", str(cgroup))
+
+    assert serve.available_cpus() == expected
+
+
+@pytest.mark.usefixtures("cpus")
+def test_without_cgroup_the_affinity_mask_counts(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setattr(serve, "CGROUP_CPU_MAX", str(tmp_path / "missing"))
+
+    assert serve.available_cpus() == 16
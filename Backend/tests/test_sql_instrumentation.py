@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from sqlalchemy import create_engine, text
+from starlette.types import Message, Receive, Scope, Send
+
+from app.config.settings import settings
+from app.modules.sql_instrumentation import (
+    UNMATCHED_ROUTE,
+    QueryCountMiddleware,
+    instrument_engine,
+    query_budget,
+    redact,
+    route_name,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+def test_route_is_named_by_its_path_template() -> None:
+    scope = {"method": "GET", "route": SimpleNamespace(path="/chat/{chat_id}")}
+
+    assert route_name(scope) == "GET /chat/{chat_id}"
+
+
+def test_unmatched_requests_share_one_name() -> None:
+    assert route_name({"method": "GET", "path": "/wp-login.php"}) == (
+        f"GET {UNMATCHED_ROUTE}"
+    )
+    assert route_name({"method": "GET", "path": "/.env"}) == (
+        f"GET {UNMATCHED_ROUTE}"
+    )
+
+
+def test_route_budget_overrides_the_default(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "SQL_QUERY_BUDGET", 10)
+    monkeypatch.setattr(settings, "SQL_QUERY_BUDGETS", {"GET /feed": 25})
+
+    assert query_budget("GET /feed") == 25
+    assert query_budget("GET /other") == 10
+
+
+def test_redact_keeps_only_parameter_types() -> None:
+    assert redact({"email": "ana@example.com", "id": 7}) == {
+        "email": "str",
+        "id": "int",
+    }
+    assert redact(("secret", 1.5)) == ["str", "float"]
+
+
+async def test_middleware_reports_the_queries_of_the_request() -> None:
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    sent: list[Message] = []
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b""}
+
+    scope: dict[str, Any] = {"type": "http", "method": "GET", "path": "/"}
+    await QueryCountMiddleware(app)(scope, receive, send)
+
+    headers = dict(sent[0]["headers"])
+    assert headers[b"x-query-count"] == b"2"
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from starlette.requests import Request
+from starlette.types import Message, Receive, Scope, Send
+
+from app.config.settings import settings
+from app.dependency import database
+from app.dependency.database import SET_STATEMENT_TIMEOUT, SessionConnection
+from app.modules.disconnect import CancelOnDisconnectMiddleware
+from tests.fakes import FakeDatabase, FakeSession
+
+pytestmark = pytest.mark.anyio
+
+SCOPE = {"type": "http", "method": "GET", "path": "/slow", "headers": []}
+
+
+async def test_handler_is_cancelled_when_the_client_leaves() -> None:
+    cancelled = asyncio.Event()
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        await receive()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    messages: list[Message] = [
+        {"type": "http.request", "body": b""},
+        {"type": "http.disconnect"},
+    ]
+
+    async def receive() -> Message:
+        if len(messages) == 1:
+            await asyncio.sleep(0.01)
+        return messages.pop(0)
+
+    async def send(message: Message) -> None:
+        pass
+
+    await CancelOnDisconnectMiddleware(app)(SCOPE, receive, send)
+
+    assert cancelled.is_set()
+
+
+async def test_completed_response_is_not_cancelled() -> None:
+    sent: list[Message] = []
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        await receive()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    requests: list[Message] = [{"type": "http.request", "body": b""}]
+
+    async def receive() -> Message:
+        if not requests:
+            # The client stays connected.
+            await asyncio.Event().wait()
+        return requests.pop(0)
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    await CancelOnDisconnectMiddleware(app)(SCOPE, receive, send)
+
+    assert sent[-1]["body"] == b"ok"
+
+
+async def test_body_is_read_only_as_fast_as_the_app_consumes_it() -> None:
+    reads = 0
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        # Rejects the upload without reading it.
+        await asyncio.sleep(0.05)
+        await send({"type": "http.response.start", "status": 401, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def receive() -> Message:
+        nonlocal reads
+        reads += 1
+        return {"type": "http.request", "body": b"x" * 65536, "more_body": True}
+
+    async def send(message: Message) -> None:
+        pass
+
+    await CancelOnDisconnectMiddleware(app)(SCOPE, receive, send)
+
+    # One chunk waiting in the hand-off, one waiting to be handed off.
+    assert reads == 2
+
+
+@pytest.fixture
+def session(monkeypatch: pytest.MonkeyPatch) -> FakeSession:
+    session = FakeSession()
+    monkeypatch.setattr(database, "Database", lambda: FakeDatabase(session))
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUTS", {"GET /slow": 250})
+    return session
+
+
+async def test_route_timeout_is_set_for_the_transaction(
+    session: FakeSession,
+) -> None:
+    request = Request({**SCOPE, "route": SimpleNamespace(path="/slow")})
+
+    await SessionConnection.session(request).__anext__()
+
+    assert session.executed == [(SET_STATEMENT_TIMEOUT, {"timeout": "250ms"})]
+
+
+async def test_routes_without_a_budget_use_the_engine_timeout(
+    session: FakeSession,
+) -> None:
+    request = Request({**SCOPE, "route": SimpleNamespace(path="/fast")})
+
+    await SessionConnection.session(request).__anext__()
+
+    assert session.executed == []
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+import pytest
+from starlette.requests import Request
+
+from app.dependency import database
+from app.dependency.database import SessionConnection
+from app.modules.common import after_commit
+from tests.fakes import FakeDatabase, FakeSession
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def session(monkeypatch: pytest.MonkeyPatch) -> FakeSession:
+    session = FakeSession()
+    monkeypatch.setattr(database, "Database", lambda: FakeDatabase(session))
+    return session
+
+
+def request(method: str) -> Request:
+    return Request({"type": "http", "method": method, "path": "/", "headers": []})
+
+
+@pytest.mark.parametrize(("method", "commits"), [("POST", 1), ("GET", 0)])
+async def test_writes_commit_once_per_request(
+    session: FakeSession, method: str, commits: int
+) -> None:
+    dependency = SessionConnection.session(request(method))
+    await dependency.__anext__()
+    with pytest.raises(StopAsyncIteration):
+        await dependency.__anext__()
+
+    assert session.commits == commits
+
+
+async def test_failed_request_rolls_back_its_writes(session: FakeSession) -> None:
+    invalidated: list[bool] = []
+    dependency = SessionConnection.session(request("POST"))
+    yielded = await dependency.__anext__()
+    after_commit(yielded, lambda: invalidated.append(True))
+
+    with pytest.raises(RuntimeError):
+        await dependency.athrow(RuntimeError("service failed"))
+
+    assert session.commits == 0
+    await session.commit()
+    assert invalidated == []